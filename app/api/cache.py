@@ -0,0 +1,255 @@
+from typing import Awaitable, Callable, NamedTuple, Optional, Tuple, Union
+from collections import OrderedDict
+from urllib.parse import urlencode
+import hashlib
+import inspect
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from fastapi import Request, Response
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.config import settings
+from app.db.data_version import read_data_version
+
+logger = logging.getLogger(__name__)
+
+# Ответы этих ресурсов зависят только от событий, аналитики, трендов и
+# источников, поэтому меняются вместе с версией данных. Логи сбора пишутся
+# при каждом запуске и не кэшируются
+CACHED_PATHS = (
+    f"{settings.API_V1_STR}/events/events",
+    f"{settings.API_V1_STR}/events/analytics/",
+    f"{settings.API_V1_STR}/events/sources",
+)
+
+
+class CachedResponse(NamedTuple):
+    """
+    Сохраненный ответ: версия данных, на которой он получен, ETag и тело
+    """
+    version: int
+    etag: str
+    media_type: str
+    body: bytes
+
+
+def cache_key(request: Request) -> str:
+    """
+    Ключ кэша: путь и параметры запроса в каноническом порядке
+
+    Args:
+        request: HTTP-запрос
+
+    Returns:
+        Строка вида '/api/events/events?a=1&b=2'
+    """
+    return f"{request.url.path}?{urlencode(sorted(request.query_params.multi_items()))}"
+
+
+def make_etag(version: int, body: bytes) -> str:
+    """
+    Сильный ETag ответа: меняется вместе с версией данных или телом ответа
+
+    Args:
+        version: Версия данных
+        body: Тело ответа
+
+    Returns:
+        ETag в кавычках
+    """
+    return f'"{version}-{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Проверка заголовка If-None-Match (слабое сравнение, RFC 9110)
+
+    Args:
+        if_none_match: Значение заголовка или None
+        etag: ETag текущего ответа
+
+    Returns:
+        True, если клиенту можно ответить 304 Not Modified
+    """
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+class MemoryResponseCache:
+    """
+    LRU-кэш ответов в памяти процесса (общий для всех потоков)
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CachedResponse) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def close(self) -> None:
+        pass
+
+
+class SqliteResponseCache:
+    """
+    Кэш ответов в файле SQLite, общий для всех процессов API на одной машине.
+    При переполнении вытесняются записи, которые дольше всех не читались
+    """
+
+    def __init__(self, path: str, max_entries: int):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                version INTEGER NOT NULL,
+                etag TEXT NOT NULL,
+                media_type TEXT NOT NULL,
+                body BLOB NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+
+    def _connection(self) -> sqlite3.Connection:
+        # У каждого потока свое соединение
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT version, etag, media_type, body FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        return CachedResponse(row[0], row[1], row[2], bytes(row[3]))
+
+    def set(self, key: str, entry: CachedResponse) -> None:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, version, etag, media_type, body, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, entry.version, entry.etag, entry.media_type, entry.body, time.time()),
+            )
+            conn.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def create_response_cache():
+    """
+    Создание кэша ответов по настройкам
+
+    Returns:
+        Кэш с бэкендом из API_CACHE_BACKEND
+    """
+    backend_name = settings.API_CACHE_BACKEND
+    if backend_name == "memory":
+        return MemoryResponseCache(settings.API_CACHE_MAX_ENTRIES)
+    if backend_name == "sqlite":
+        return SqliteResponseCache(settings.API_CACHE_DB_PATH, settings.API_CACHE_MAX_ENTRIES)
+    raise ValueError(f"Unknown response cache backend: {backend_name}")
+
+
+class ResponseCacheMiddleware(BaseHTTPMiddleware):
+    """
+    Кэш GET-ответов ресурсов для чтения с сильными ETag и 304 Not Modified
+
+    Запись кэша действительна, пока не изменилась версия данных
+    (data_versions), которую увеличивают сбор и обработка событий. Клиенты
+    получают Cache-Control: no-cache и подтверждают копию через If-None-Match.
+    version_provider может быть и корутиной (read_data_version_async) -
+    тогда версия читается без пула потоков.
+    """
+
+    def __init__(
+        self,
+        app,
+        cache=None,
+        version_provider: Callable[[], Union[int, Awaitable[int]]] = read_data_version,
+        paths: Tuple[str, ...] = CACHED_PATHS,
+    ):
+        super().__init__(app)
+        self.cache = cache if cache is not None else create_response_cache()
+        self.version_provider = version_provider
+        self.paths = paths
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        if request.method != "GET" or not request.url.path.startswith(self.paths):
+            return await call_next(request)
+
+        try:
+            if inspect.iscoroutinefunction(self.version_provider):
+                version = await self.version_provider()
+            else:
+                version = await run_in_threadpool(self.version_provider)
+        except Exception as e:
+            # Без версии данных нельзя проверить свежесть записи - отвечаем без кэша
+            logger.error(f"Error reading data version, response cache bypassed: {str(e)}")
+            return await call_next(request)
+
+        key = cache_key(request)
+        entry = await run_in_threadpool(self.cache.get, key)
+        status = "HIT"
+
+        if entry is None or entry.version != version:
+            status = "MISS"
+            response = await call_next(request)
+            if response.status_code != 200:
+                return response
+            body = b"".join([chunk async for chunk in response.body_iterator])
+            media_type = response.headers.get("content-type", "application/json")
+            entry = CachedResponse(version, make_etag(version, body), media_type, body)
+            await run_in_threadpool(self.cache.set, key, entry)
+
+        headers = {"ETag": entry.etag, "Cache-Control": "no-cache", "X-Cache": status}
+        if etag_matches(request.headers.get("if-none-match"), entry.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, media_type=entry.media_type, headers=headers)
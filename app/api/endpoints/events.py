@@ -1,9 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from datetime import date, datetime, timedelta
+from datetime import date, datetime
 
-from app.db.session import get_db
+from app.api.pagination import estimate_count
+from app.api.queries import (
+    categories_query,
+    count_query,
+    event_list_query,
+    event_list_response,
+    event_query,
+    scraping_logs_query,
+    timeseries_query,
+    timeseries_response,
+    trend_events_query,
+    trends_query,
+)
+from app.db.session import get_read_db
 from app.models import models
 from app.schemas import schemas
 
@@ -11,171 +25,147 @@ router = APIRouter()
 
 @router.get("/events", response_model=schemas.EventList)
 def get_events(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     category: Optional[str] = None,
     is_virtual: Optional[bool] = None,
     location: Optional[str] = None,
+    near: Optional[str] = None,
+    radius_km: float = Query(10, gt=0, le=500),
+    bbox: Optional[str] = None,
     search: Optional[str] = None,
+    updated_since: Optional[datetime] = None,
+    sort: str = Query("start", pattern="^(start|relevance)$"),
+    cursor: Optional[str] = None,
     page: int = Query(1, ge=1),
-    page_size: int = Query(20, ge=1, le=100)
+    page_size: int = Query(20, ge=1, le=100),
+    include_total: bool = True,
+    estimate_total: bool = False
 ):
     """
     Получение списка событий с возможностью фильтрации
+
+    updated_since возвращает только события, содержимое которых изменилось
+    после указанного времени (updated_at меняется вместе с content_hash).
+
+    Постраничный вывод по курсору: в ответе возвращается next_cursor, который
+    передается в следующий запрос вместо page. Курсор указывает на позицию
+    (start_datetime_utc, event_id), поэтому любая страница стоит столько же,
+    сколько первая. include_total=false отключает подсчет total,
+    estimate_total=true заменяет точный подсчет оценкой планировщика.
+
+    search ищет по названию, организатору, тегам и описанию с учетом
+    префиксов слов и опечаток в названии; sort=relevance упорядочивает
+    найденное по релевантности (только постранично, без курсора).
+
+    near=lat,lon и radius_km (по умолчанию 10) оставляют события в радиусе
+    от точки, bbox=min_lon,min_lat,max_lon,max_lat - в прямоугольнике карты.
+    События без координат в эти выборки не попадают.
     """
-    # Базовый запрос
-    query = db.query(models.Event).join(
-        models.Source, models.Event.source_id == models.Source.source_id
-    ).outerjoin(
-        models.EventAnalytics, models.Event.event_id == models.EventAnalytics.event_id
+    query = event_list_query(
+        start_date=start_date, end_date=end_date, category=category, is_virtual=is_virtual,
+        location=location, near=near, radius_km=radius_km, bbox=bbox, search=search,
+        updated_since=updated_since, sort=sort, cursor=cursor, page=page, page_size=page_size,
     )
-    
-    # Применяем фильтры
-    if start_date:
-        start_datetime = datetime.combine(start_date, datetime.min.time())
-        query = query.filter(models.Event.start_datetime_utc >= start_datetime)
-    
-    if end_date:
-        end_datetime = datetime.combine(end_date, datetime.max.time())
-        query = query.filter(models.Event.start_datetime_utc <= end_datetime)
-    
-    if category:
-        query = query.filter(models.EventAnalytics.category == category)
-    
-    if is_virtual is not None:
-        query = query.filter(models.Event.is_virtual == is_virtual)
-    
-    if location:
-        query = query.filter(models.Event.location_text.ilike(f"%{location}%"))
-    
-    if search:
-        query = query.filter(
-            (models.Event.name.ilike(f"%{search}%")) | 
-            (models.Event.description.ilike(f"%{search}%"))
-        )
-    
-    # Сортировка по дате начала
-    query = query.order_by(models.Event.start_datetime_utc)
-    
-    # Подсчет общего количества
-    total = query.count()
-    
-    # Пагинация
-    query = query.offset((page - 1) * page_size).limit(page_size)
-    
-    # Получение результатов
-    events = query.all()
-    
-    return {
-        "total": total,
-        "page": page,
-        "page_size": page_size,
-        "events": events
-    }
+
+    # Подсчет общего количества (до курсора - это число всех подходящих событий)
+    total = None
+    if include_total and estimate_total:
+        total = estimate_count(db, query.filtered)
+    elif include_total:
+        total = db.execute(count_query(query.filtered)).scalar()
+
+    events = db.execute(query.page).scalars().all()
+    return event_list_response(events, total, sort, cursor, page, page_size)
 
 @router.get("/events/{event_id}", response_model=schemas.Event)
-def get_event(event_id: int, db: Session = Depends(get_db)):
+def get_event(event_id: int, db: Session = Depends(get_read_db)):
     """
     Получение информации о конкретном событии
     """
-    event = db.query(models.Event).filter(models.Event.event_id == event_id).first()
+    event = db.execute(event_query(event_id)).scalars().first()
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     return event
 
 @router.get("/analytics/categories", response_model=schemas.CategoryList)
 def get_categories(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     start_date: Optional[date] = None,
     end_date: Optional[date] = None
 ):
     """
     Получение списка категорий событий с количеством событий в каждой категории
+
+    Счетчики берутся из сводки event_rollups (дни в UTC), поэтому запрос
+    читает корзины за период, а не все события.
     """
-    # Базовый запрос
-    query = db.query(
-        models.EventAnalytics.category,
-        db.func.count(models.EventAnalytics.event_id).label("count")
-    ).join(
-        models.Event, models.EventAnalytics.event_id == models.Event.event_id
-    ).group_by(
-        models.EventAnalytics.category
-    )
-    
-    # Применяем фильтры по дате
-    if start_date:
-        start_datetime = datetime.combine(start_date, datetime.min.time())
-        query = query.filter(models.Event.start_datetime_utc >= start_datetime)
-    
-    if end_date:
-        end_datetime = datetime.combine(end_date, datetime.max.time())
-        query = query.filter(models.Event.start_datetime_utc <= end_datetime)
-    
-    # Получение результатов
-    categories = query.all()
+    categories = db.execute(categories_query(start_date, end_date)).all()
     
     return {
-        "categories": [{"name": category, "count": count} for category, count in categories if category]
+        "categories": [{"name": category, "count": count} for category, count in categories]
     }
 
+@router.get("/analytics/timeseries", response_model=schemas.TimeSeries)
+def get_event_timeseries(
+    db: Session = Depends(get_read_db),
+    interval: str = Query("day", pattern="^(day|week)$"),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    category: Optional[str] = None,
+    source_id: Optional[int] = None,
+    is_virtual: Optional[bool] = None,
+    by_category: bool = False
+):
+    """
+    Число событий по дням или неделям (по дате начала в UTC)
+
+    Недели начинаются с понедельника. by_category=true разбивает каждый
+    период по категориям. Периоды без событий в ответ не попадают.
+    """
+    rows = db.execute(timeseries_query(
+        interval, start_date, end_date, category, source_id, is_virtual, by_category
+    )).all()
+    return timeseries_response(interval, rows, by_category)
+
 @router.get("/analytics/trends", response_model=schemas.TrendList)
 def get_trends(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     start_date: Optional[date] = None,
     end_date: Optional[date] = None
 ):
     """
     Получение списка трендов
     """
-    # Базовый запрос
-    query = db.query(models.Trend)
-    
-    # Применяем фильтры по дате
-    if start_date:
-        query = query.filter(models.Trend.start_date >= start_date)
-    
-    if end_date:
-        query = query.filter(models.Trend.end_date <= end_date)
-    
-    # Сортировка по score (от большего к меньшему)
-    query = query.order_by(models.Trend.score.desc())
-    
-    # Получение результатов
-    trends = query.all()
+    trends = db.execute(trends_query(start_date, end_date)).scalars().all()
     
     return {"trends": trends}
 
 @router.get("/analytics/trends/{trend_id}/events", response_model=List[schemas.Event])
-def get_trend_events(trend_id: int, db: Session = Depends(get_db)):
+def get_trend_events(trend_id: int, db: Session = Depends(get_read_db)):
     """
     Получение событий, связанных с трендом
     """
-    trend = db.query(models.Trend).filter(models.Trend.trend_id == trend_id).first()
+    trend = db.get(models.Trend, trend_id)
     if not trend:
         raise HTTPException(status_code=404, detail="Trend not found")
     
-    events = db.query(models.Event).join(
-        models.TrendEvent, models.Event.event_id == models.TrendEvent.event_id
-    ).filter(
-        models.TrendEvent.trend_id == trend_id
-    ).order_by(
-        models.TrendEvent.relevance_score.desc()
-    ).all()
+    events = db.execute(trend_events_query(trend_id)).scalars().all()
     
     return events
 
 @router.get("/sources", response_model=List[schemas.Source])
-def get_sources(db: Session = Depends(get_db)):
+def get_sources(db: Session = Depends(get_read_db)):
     """
     Получение списка источников данных
     """
-    sources = db.query(models.Source).all()
+    sources = db.execute(select(models.Source)).scalars().all()
     return sources
 
 @router.get("/scraping/logs", response_model=schemas.ScrapingLogList)
 def get_scraping_logs(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     source_id: Optional[int] = None,
     status: Optional[str] = None,
     page: int = Query(1, ge=1),
@@ -184,23 +174,6 @@ def get_scraping_logs(
     """
     Получение логов сбора данных
     """
-    # Базовый запрос
-    query = db.query(models.ScrapingLog)
-    
-    # Применяем фильтры
-    if source_id:
-        query = query.filter(models.ScrapingLog.source_id == source_id)
-    
-    if status:
-        query = query.filter(models.ScrapingLog.status == status)
-    
-    # Сортировка по дате создания (от новых к старым)
-    query = query.order_by(models.ScrapingLog.created_at.desc())
-    
-    # Пагинация
-    query = query.offset((page - 1) * page_size).limit(page_size)
-    
-    # Получение результатов
-    logs = query.all()
+    logs = db.execute(scraping_logs_query(source_id, status, page, page_size)).scalars().all()
     
     return {"logs": logs}
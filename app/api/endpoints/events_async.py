@@ -0,0 +1,160 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from datetime import date, datetime
+
+from app.api.pagination import estimate_count_async
+from app.api.queries import (
+    categories_query,
+    count_query,
+    event_list_query,
+    event_list_response,
+    event_query,
+    scraping_logs_query,
+    timeseries_query,
+    timeseries_response,
+    trend_events_query,
+    trends_query,
+)
+from app.db.session import get_async_read_db
+from app.models import models
+from app.schemas import schemas
+
+# Асинхронные варианты обработчиков app/api/endpoints/events.py (API_DB_ASYNC).
+# Запросы те же (app/api/queries.py), но ожидание БД не занимает поток из
+# пула Starlette. Связи событий загружаются жадно: ленивая загрузка в
+# асинхронной сессии невозможна
+router = APIRouter()
+
+@router.get("/events", response_model=schemas.EventList)
+async def get_events(
+    db: AsyncSession = Depends(get_async_read_db),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    category: Optional[str] = None,
+    is_virtual: Optional[bool] = None,
+    location: Optional[str] = None,
+    near: Optional[str] = None,
+    radius_km: float = Query(10, gt=0, le=500),
+    bbox: Optional[str] = None,
+    search: Optional[str] = None,
+    updated_since: Optional[datetime] = None,
+    sort: str = Query("start", pattern="^(start|relevance)$"),
+    cursor: Optional[str] = None,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    include_total: bool = True,
+    estimate_total: bool = False
+):
+    """
+    Получение списка событий с возможностью фильтрации (см. events.get_events)
+    """
+    query = event_list_query(
+        start_date=start_date, end_date=end_date, category=category, is_virtual=is_virtual,
+        location=location, near=near, radius_km=radius_km, bbox=bbox, search=search,
+        updated_since=updated_since, sort=sort, cursor=cursor, page=page, page_size=page_size,
+    )
+
+    # Подсчет общего количества (до курсора - это число всех подходящих событий)
+    total = None
+    if include_total and estimate_total:
+        total = await estimate_count_async(db, query.filtered)
+    elif include_total:
+        total = (await db.execute(count_query(query.filtered))).scalar()
+
+    events = (await db.execute(query.page)).scalars().all()
+    return event_list_response(events, total, sort, cursor, page, page_size)
+
+@router.get("/events/{event_id}", response_model=schemas.Event)
+async def get_event(event_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    """
+    Получение информации о конкретном событии
+    """
+    event = (await db.execute(event_query(event_id))).scalars().first()
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+    return event
+
+@router.get("/analytics/categories", response_model=schemas.CategoryList)
+async def get_categories(
+    db: AsyncSession = Depends(get_async_read_db),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+):
+    """
+    Получение списка категорий событий с количеством событий в каждой категории
+    """
+    categories = (await db.execute(categories_query(start_date, end_date))).all()
+
+    return {
+        "categories": [{"name": category, "count": count} for category, count in categories]
+    }
+
+@router.get("/analytics/timeseries", response_model=schemas.TimeSeries)
+async def get_event_timeseries(
+    db: AsyncSession = Depends(get_async_read_db),
+    interval: str = Query("day", pattern="^(day|week)$"),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    category: Optional[str] = None,
+    source_id: Optional[int] = None,
+    is_virtual: Optional[bool] = None,
+    by_category: bool = False
+):
+    """
+    Число событий по дням или неделям (по дате начала в UTC)
+    """
+    rows = (await db.execute(timeseries_query(
+        interval, start_date, end_date, category, source_id, is_virtual, by_category
+    ))).all()
+    return timeseries_response(interval, rows, by_category)
+
+@router.get("/analytics/trends", response_model=schemas.TrendList)
+async def get_trends(
+    db: AsyncSession = Depends(get_async_read_db),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+):
+    """
+    Получение списка трендов
+    """
+    trends = (await db.execute(trends_query(start_date, end_date))).scalars().all()
+
+    return {"trends": trends}
+
+@router.get("/analytics/trends/{trend_id}/events", response_model=List[schemas.Event])
+async def get_trend_events(trend_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    """
+    Получение событий, связанных с трендом
+    """
+    trend = await db.get(models.Trend, trend_id)
+    if not trend:
+        raise HTTPException(status_code=404, detail="Trend not found")
+
+    events = (await db.execute(trend_events_query(trend_id))).scalars().all()
+
+    return events
+
+@router.get("/sources", response_model=List[schemas.Source])
+async def get_sources(db: AsyncSession = Depends(get_async_read_db)):
+    """
+    Получение списка источников данных
+    """
+    sources = (await db.execute(select(models.Source))).scalars().all()
+    return sources
+
+@router.get("/scraping/logs", response_model=schemas.ScrapingLogList)
+async def get_scraping_logs(
+    db: AsyncSession = Depends(get_async_read_db),
+    source_id: Optional[int] = None,
+    status: Optional[str] = None,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100)
+):
+    """
+    Получение логов сбора данных
+    """
+    logs = (await db.execute(scraping_logs_query(source_id, status, page, page_size))).scalars().all()
+
+    return {"logs": logs}
@@ -0,0 +1,81 @@
+from typing import Tuple
+from datetime import datetime
+import base64
+import json
+
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+
+def encode_cursor(start_datetime: datetime, event_id: int) -> str:
+    """
+    Курсор на позицию в списке событий, упорядоченном по (start_datetime_utc, event_id)
+
+    Args:
+        start_datetime: Дата начала последнего выданного события
+        event_id: ID последнего выданного события
+
+    Returns:
+        Непрозрачная строка курсора
+    """
+    payload = json.dumps([start_datetime.isoformat(), event_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Разбор курсора, выданного encode_cursor
+
+    Args:
+        cursor: Строка курсора
+
+    Returns:
+        Пара (дата начала, ID события)
+
+    Raises:
+        ValueError: Курсор поврежден
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        start_datetime, event_id = json.loads(payload)
+        return datetime.fromisoformat(start_datetime), int(event_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def estimate_count(db: Session, query: Select) -> int:
+    """
+    Оценка количества строк запроса по плану PostgreSQL без выполнения запроса
+
+    Args:
+        db: Сессия БД
+        query: Запрос
+
+    Returns:
+        Оценка планировщика (Plan Rows)
+    """
+    connection = db.connection()
+    compiled = query.compile(dialect=connection.dialect)
+    params = compiled.params
+    if compiled.positiontup is not None:
+        # Драйверы с позиционными параметрами (asyncpg: $1, $2, ...)
+        params = tuple(params[name] for name in compiled.positiontup)
+    plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", params).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def estimate_count_async(db: AsyncSession, query: Select) -> int:
+    """
+    Асинхронный вариант estimate_count
+
+    Args:
+        db: Асинхронная сессия БД
+        query: Запрос
+
+    Returns:
+        Оценка планировщика (Plan Rows)
+    """
+    return await db.run_sync(estimate_count, query)
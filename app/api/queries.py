@@ -0,0 +1,328 @@
+from typing import Dict, List, NamedTuple, Optional, Sequence
+from datetime import date, datetime
+
+from fastapi import HTTPException, status
+from sqlalchemy import Date, Select, cast, func, select, tuple_
+from sqlalchemy.orm import contains_eager, joinedload, selectinload
+
+from app.api.pagination import decode_cursor, encode_cursor
+from app.db.geo import bbox_condition, near_condition, parse_bbox, parse_point
+from app.db.search import search_condition, search_rank
+from app.models import models
+
+# Запросы ресурсов /events, общие для синхронных (app/api/endpoints/events.py)
+# и асинхронных (app/api/endpoints/events_async.py) обработчиков
+
+
+class EventListQuery(NamedTuple):
+    """
+    Запросы списка событий: все подходящие события (для total) и страница
+    """
+    filtered: Select
+    page: Select
+
+
+def event_list_query(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    category: Optional[str] = None,
+    is_virtual: Optional[bool] = None,
+    location: Optional[str] = None,
+    near: Optional[str] = None,
+    radius_km: float = 10,
+    bbox: Optional[str] = None,
+    search: Optional[str] = None,
+    updated_since: Optional[datetime] = None,
+    sort: str = "start",
+    cursor: Optional[str] = None,
+    page: int = 1,
+    page_size: int = 20,
+) -> EventListQuery:
+    """
+    Запросы списка событий с фильтрами и постраничным выводом
+
+    Параметры совпадают с параметрами GET /events.
+
+    Returns:
+        EventListQuery
+
+    Raises:
+        HTTPException: 400 - некорректные sort, near, bbox или cursor
+    """
+    if sort == "relevance" and (not search or cursor):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="sort=relevance requires search and does not support cursor",
+        )
+
+    # Базовый запрос
+    query = select(models.Event).join(
+        models.Source, models.Event.source_id == models.Source.source_id
+    ).outerjoin(
+        models.EventAnalytics, models.Event.event_id == models.EventAnalytics.event_id
+    )
+
+    # Применяем фильтры
+    if start_date:
+        start_datetime = datetime.combine(start_date, datetime.min.time())
+        query = query.where(models.Event.start_datetime_utc >= start_datetime)
+
+    if end_date:
+        end_datetime = datetime.combine(end_date, datetime.max.time())
+        query = query.where(models.Event.start_datetime_utc <= end_datetime)
+
+    if category:
+        query = query.where(models.EventAnalytics.category == category)
+
+    if is_virtual is not None:
+        query = query.where(models.Event.is_virtual == is_virtual)
+
+    if location:
+        query = query.where(models.Event.location_text.ilike(f"%{location}%"))
+
+    if updated_since:
+        query = query.where(models.Event.updated_at >= updated_since)
+
+    if near:
+        try:
+            center_lat, center_lon = parse_point(near)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid near, expected lat,lon")
+        query = query.where(near_condition(
+            models.Event.location_lat, models.Event.location_lon, center_lat, center_lon, radius_km
+        ))
+
+    if bbox:
+        try:
+            box = parse_bbox(bbox)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid bbox, expected min_lon,min_lat,max_lon,max_lat",
+            )
+        query = query.where(bbox_condition(models.Event.location_lat, models.Event.location_lon, box))
+
+    if search:
+        query = query.where(search_condition(models.Event.search_vector, models.Event.name, search))
+
+    # total - это число всех подходящих событий, до курсора
+    filtered = query
+
+    # Сортировка по релевантности или по дате начала; event_id делает
+    # порядок однозначным для курсора
+    if sort == "relevance":
+        query = query.order_by(search_rank(models.Event.search_vector, models.Event.name, search).desc())
+    query = query.order_by(models.Event.start_datetime_utc, models.Event.event_id)
+
+    # Пагинация: по курсору (keyset) или по номеру страницы
+    if cursor:
+        try:
+            cursor_start, cursor_id = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+        query = query.where(
+            tuple_(models.Event.start_datetime_utc, models.Event.event_id) > tuple_(cursor_start, cursor_id)
+        )
+    else:
+        query = query.offset((page - 1) * page_size)
+
+    # source и analytics уже присоединены для фильтров - заполняем их из
+    # того же запроса, чтобы сериализация не загружала их по одному
+    query = query.options(contains_eager(models.Event.source), contains_eager(models.Event.analytics))
+
+    # Лишняя строка показывает, есть ли следующая страница
+    return EventListQuery(filtered, query.limit(page_size + 1))
+
+
+def count_query(query: Select) -> Select:
+    """
+    Точный подсчет строк запроса
+
+    Args:
+        query: Запрос
+
+    Returns:
+        SELECT count(*) FROM (query)
+    """
+    return select(func.count()).select_from(query.order_by(None).subquery())
+
+
+def event_list_response(
+    events: Sequence[models.Event],
+    total: Optional[int],
+    sort: str,
+    cursor: Optional[str],
+    page: int,
+    page_size: int,
+) -> Dict:
+    """
+    Ответ GET /events по выбранной странице (page_size + 1 событий)
+
+    Returns:
+        Словарь для schemas.EventList
+    """
+    events = list(events)
+    next_cursor = None
+    if len(events) > page_size:
+        events = events[:page_size]
+        if sort == "start":
+            next_cursor = encode_cursor(events[-1].start_datetime_utc, events[-1].event_id)
+
+    return {
+        "total": total,
+        "page": None if cursor else page,
+        "page_size": page_size,
+        "next_cursor": next_cursor,
+        "events": events
+    }
+
+
+def event_query(event_id: int) -> Select:
+    """
+    Событие вместе с источником и анализом
+    """
+    return select(models.Event).options(
+        joinedload(models.Event.source), joinedload(models.Event.analytics)
+    ).where(models.Event.event_id == event_id)
+
+
+def categories_query(start_date: Optional[date] = None, end_date: Optional[date] = None) -> Select:
+    """
+    Число событий в каждой категории из сводки event_rollups (дни в UTC)
+    """
+    query = select(
+        models.EventRollup.category,
+        func.sum(models.EventRollup.event_count).label("count")
+    ).where(
+        models.EventRollup.category != ""
+    ).group_by(
+        models.EventRollup.category
+    ).having(
+        func.sum(models.EventRollup.event_count) > 0
+    )
+
+    # Применяем фильтры по дате
+    if start_date:
+        query = query.where(models.EventRollup.day >= start_date)
+
+    if end_date:
+        query = query.where(models.EventRollup.day <= end_date)
+
+    return query
+
+
+def timeseries_query(
+    interval: str = "day",
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    category: Optional[str] = None,
+    source_id: Optional[int] = None,
+    is_virtual: Optional[bool] = None,
+    by_category: bool = False,
+) -> Select:
+    """
+    Число событий по дням или неделям из сводки event_rollups
+    """
+    period = models.EventRollup.day
+    if interval == "week":
+        period = cast(func.date_trunc("week", models.EventRollup.day), Date)
+    period = period.label("period")
+
+    columns = [period]
+    if by_category:
+        columns.append(models.EventRollup.category)
+    query = select(
+        *columns, func.sum(models.EventRollup.event_count).label("count")
+    ).group_by(
+        *columns
+    ).having(
+        func.sum(models.EventRollup.event_count) > 0
+    ).order_by(
+        *columns
+    )
+
+    # Применяем фильтры
+    if start_date:
+        query = query.where(models.EventRollup.day >= start_date)
+
+    if end_date:
+        query = query.where(models.EventRollup.day <= end_date)
+
+    if category:
+        query = query.where(models.EventRollup.category == category)
+
+    if source_id:
+        query = query.where(models.EventRollup.source_id == source_id)
+
+    if is_virtual is not None:
+        query = query.where(models.EventRollup.is_virtual == is_virtual)
+
+    return query
+
+
+def timeseries_response(interval: str, rows: Sequence, by_category: bool) -> Dict:
+    """
+    Ответ GET /analytics/timeseries
+
+    Returns:
+        Словарь для schemas.TimeSeries
+    """
+    points: List[Dict] = [
+        {"period": row.period, "category": (row.category or None) if by_category else None, "count": row.count}
+        for row in rows
+    ]
+    return {"interval": interval, "points": points}
+
+
+def trends_query(start_date: Optional[date] = None, end_date: Optional[date] = None) -> Select:
+    """
+    Тренды за период, от большего score к меньшему
+    """
+    query = select(models.Trend)
+
+    # Применяем фильтры по дате
+    if start_date:
+        query = query.where(models.Trend.start_date >= start_date)
+
+    if end_date:
+        query = query.where(models.Trend.end_date <= end_date)
+
+    # Сортировка по score (от большего к меньшему)
+    return query.order_by(models.Trend.score.desc())
+
+
+def trend_events_query(trend_id: int) -> Select:
+    """
+    События тренда по убыванию релевантности
+    """
+    return select(models.Event).join(
+        models.TrendEvent, models.Event.event_id == models.TrendEvent.event_id
+    ).options(
+        selectinload(models.Event.source), selectinload(models.Event.analytics)
+    ).where(
+        models.TrendEvent.trend_id == trend_id
+    ).order_by(
+        models.TrendEvent.relevance_score.desc()
+    )
+
+
+def scraping_logs_query(
+    source_id: Optional[int] = None,
+    status: Optional[str] = None,
+    page: int = 1,
+    page_size: int = 20,
+) -> Select:
+    """
+    Логи сбора данных от новых к старым
+    """
+    query = select(models.ScrapingLog)
+
+    # Применяем фильтры
+    if source_id:
+        query = query.where(models.ScrapingLog.source_id == source_id)
+
+    if status:
+        query = query.where(models.ScrapingLog.status == status)
+
+    # Сортировка по дате создания (от новых к старым) и пагинация
+    return query.order_by(models.ScrapingLog.created_at.desc()).offset((page - 1) * page_size).limit(page_size)
@@ -0,0 +1,27 @@
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.db.session import pin_read_replica, replica_router, unpin_read_replica
+
+# Методы, запросы которых только читают данные
+READ_METHODS = ("GET", "HEAD")
+
+
+class ReadReplicaMiddleware(BaseHTTPMiddleware):
+    """
+    Закрепление реплики для чтения за каждым GET-запросом
+
+    Реплика выбирается до кэша ответов, поэтому версия данных и ответ
+    читаются из одной реплики. Обработчики получают ее сессию через
+    get_read_db / get_async_read_db; запросы на запись идут в основную базу.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        if request.method not in READ_METHODS:
+            return await call_next(request)
+
+        token = pin_read_replica(await replica_router.choose_async())
+        try:
+            return await call_next(request)
+        finally:
+            unpin_read_replica(token)
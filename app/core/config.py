@@ -10,6 +10,12 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "your-secret-key-for-jwt"  # В продакшене должен быть заменен на безопасный ключ
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8  # 8 дней
     
+    # Кэш ответов API для чтения (ETag/304), сбрасывается при изменении версии данных
+    API_CACHE_ENABLED: bool = True
+    API_CACHE_BACKEND: str = "memory"  # 'memory' (LRU в процессе) или 'sqlite' (общий для процессов API файл)
+    API_CACHE_MAX_ENTRIES: int = 1000  # Максимум сохраненных ответов
+    API_CACHE_DB_PATH: str = ".http_cache/api_responses.sqlite3"  # Файл кэша для бэкенда 'sqlite'
+
     # CORS настройки
     BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = []
 
@@ -39,12 +45,81 @@ class Settings(BaseSettings):
             host=values.get("POSTGRES_SERVER"),
             path=f"{values.get('POSTGRES_DB') or ''}",
         )
+
+    API_DB_ASYNC: bool = False  # Обработчики /events на асинхронном движке (asyncpg) вместо потоков с синхронными сессиями
+
+    # Пул соединений (для основной базы и каждой реплики, в каждом процессе)
+    DB_POOL_SIZE: int = 5  # Постоянные соединения пула
+    DB_MAX_OVERFLOW: int = 10  # Дополнительные соединения сверх DB_POOL_SIZE при пиковой нагрузке
+    DB_POOL_TIMEOUT: float = 30.0  # Ожидание свободного соединения в секундах
+    DB_POOL_RECYCLE_SECONDS: int = -1  # Пересоздавать соединения старше этого возраста (-1 - не пересоздавать)
+    DB_POOL_PRE_PING: bool = False  # Проверять соединение перед выдачей из пула (переживает перезапуск базы или реплики)
+
+    # Реплики для чтения: GET-запросы API к событиям
+    DB_READ_REPLICA_URIS: Union[List[str], str] = []  # Строки подключения к репликам (через запятую)
+    DB_REPLICA_MAX_LAG_SECONDS: float = 10.0  # Реплика с большим отставанием не используется, чтение идет в основную базу
+    DB_REPLICA_CHECK_SECONDS: float = 5.0  # Как часто проверять отставание реплик
+
+    @field_validator("DB_READ_REPLICA_URIS", mode="before")
+    def split_replica_uris(cls, v: Union[str, List[str]]) -> List[str]:
+        if isinstance(v, str):
+            return [i.strip() for i in v.split(",") if i.strip()]
+        return v
     
     # Настройки для Gemini API
     GEMINI_API_KEY: Optional[str] = None
     
     # Настройки для скрейпинга
     SCRAPING_INTERVAL_MINUTES: int = 60  # Интервал запуска скрейпинга в минутах
+    SCRAPING_SCHEDULER_ENABLED: bool = False  # Запускать планировщик вместе с API (только при одном процессе API)
+    SCRAPING_MIN_INTERVAL_MINUTES: int = 15  # Минимальный интервал для часто меняющихся источников
+    SCRAPING_MAX_INTERVAL_MINUTES: int = 24 * 60  # Максимальный интервал для редко меняющихся источников
+    SCRAPING_SCHEDULER_JITTER: float = 0.1  # Случайное смещение запуска (доля интервала)
+    SCRAPING_SCHEDULER_TARGET_CHANGES: float = 5.0  # Желаемое число новых/измененных событий за запуск
+    SCRAPING_SCHEDULER_HISTORY_RUNS: int = 10  # Число последних запусков для оценки скорости изменений
+    SCRAPING_CONCURRENCY: int = 8  # Число потоков для загрузки страниц событий (1 - последовательный режим)
+    SCRAPING_PER_HOST_CONCURRENCY: int = 4  # Максимум одновременных запросов к одному хосту
+    SCRAPING_HTTP_POOL_SIZE: int = 10  # Размер пула соединений на один хост
+    SCRAPING_HTTP_CONNECT_TIMEOUT: float = 5.0  # Таймаут установки соединения в секундах
+    SCRAPING_HTTP_READ_TIMEOUT: float = 30.0  # Таймаут чтения ответа в секундах
+    SCRAPING_HTTP_MAX_RETRIES: int = 3  # Число повторных попыток при 429/5xx и сетевых ошибках
+    SCRAPING_HTTP_BACKOFF_FACTOR: float = 0.5  # Множитель экспоненциальной задержки между попытками
+    SCRAPING_FRONTIER_ENABLED: bool = False  # Загружать страницы событий воркерами через очередь обхода в Postgres
+    SCRAPING_FRONTIER_BATCH_SIZE: int = 50  # Число задач, которые воркер берет из очереди за раз
+    SCRAPING_FRONTIER_LEASE_SECONDS: int = 300  # Время аренды задачи, после которого она возвращается в очередь
+    SCRAPING_FRONTIER_MAX_ATTEMPTS: int = 5  # Число попыток загрузки страницы до статуса 'failed'
+    SCRAPING_FRONTIER_RETRY_DELAY_SECONDS: int = 60  # Задержка повтора после ошибки (умножается на номер попытки)
+    SCRAPING_FRONTIER_POLL_SECONDS: float = 5.0  # Пауза воркера, если очередь пуста
+    SCRAPING_RATE_LIMIT_ENABLED: bool = True  # Ограничение частоты запросов к каждому хосту (token bucket)
+    SCRAPING_RATE_LIMIT_BACKEND: str = "sqlite"  # Где хранить состояние: 'sqlite' (общее для процессов) или 'memory'
+    SCRAPING_RATE_LIMIT_DB_PATH: str = ".http_cache/rate_limits.sqlite3"  # Файл состояния для бэкенда 'sqlite'
+    SCRAPING_RATE_LIMIT_PER_SECOND: float = 2.0  # Запросов в секунду к хосту, если у источника не задано иное
+    SCRAPING_RATE_LIMIT_BURST: int = 5  # Запросов подряд без ожидания
+    SCRAPING_RATE_LIMIT_MIN_PER_SECOND: float = 0.05  # Нижняя граница скорости после замедления
+    SCRAPING_RATE_LIMIT_BACKOFF_FACTOR: float = 0.5  # Во сколько раз снижается скорость после 429/503
+    SCRAPING_RATE_LIMIT_RECOVERY_STEP: float = 0.05  # Доля настроенной скорости, возвращаемая за успешный ответ
+    SCRAPING_INCREMENTAL: bool = True  # Загружать страницы только новых, измененных или устаревших событий
+    SCRAPING_STALE_AFTER_HOURS: int = 24  # Через сколько часов сохраненное событие загружается заново
+    SCRAPING_MAX_LISTING_PAGES: int = 20  # Максимум страниц списка событий за один обход источника
+    SCRAPING_KNOWN_RUN_LIMIT: int = 50  # После стольких известных событий подряд обход списка прекращается (0 - не прекращать)
+    SCRAPING_LOCAL_TIMEZONE: str = "America/Los_Angeles"  # Часовой пояс дат на страницах, где он не указан
+    SCRAPING_DATE_CACHE_SIZE: int = 4096  # Размер LRU-кэша разобранных строк дат
+    SCRAPING_HTML_PARSER: str = "lxml"  # Парсер HTML: 'lxml' (быстрый) или 'html.parser'
+    SCRAPING_PARTIAL_PARSING: bool = True  # Разбирать только нужные экстракторам элементы страницы
+    SCRAPING_STRUCTURED_DATA: bool = True  # Брать события из JSON-LD/__NEXT_DATA__/микроразметки без разбора DOM
+    SCRAPING_DB_BATCH_SIZE: int = 100  # Размер пакета при сохранении событий в БД
+    SCRAPING_GEOCODING_ENABLED: bool = True  # Заполнять координаты событий по месту проведения
+    SCRAPING_GEOCODER: str = "gazetteer"  # Геокодер: 'gazetteer' (офлайн-справочник) или 'stub' (заглушка HTTP-геокодера)
+    SCRAPING_GEOCODER_GAZETTEER_PATH: Optional[str] = None  # CSV-справочник address,lat,lon (None - встроенный)
+    SCRAPING_HTTP_CACHE_ENABLED: bool = True  # Условные запросы и дисковый кэш ответов
+    SCRAPING_HTTP_CACHE_DIR: str = ".http_cache"  # Каталог дискового кэша
+    SCRAPING_HTTP_CACHE_MAX_MB: int = 200  # Максимальный размер кэша, старые записи вытесняются (LRU)
+    SCRAPING_HTTP_CACHE_TTL_SECONDS: int = 15 * 60  # Время, в течение которого ответ используется без запроса
+    SCRAPING_HTTP_CACHE_SOURCE_TTLS: Dict[str, int] = {  # TTL по типу источника
+        "meetup": 30 * 60,
+        "eventbrite": 30 * 60,
+        "techcrunch": 6 * 60 * 60,
+    }
     
     model_config = SettingsConfigDict(case_sensitive=True, env_file=".env")
 
@@ -0,0 +1,71 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.db.session import AsyncSessionLocal, SessionLocal, async_read_engine, read_engine
+from app.models.models import DataVersion
+
+# Единственная область данных: события вместе с аналитикой, трендами и источниками
+EVENTS_DATA = "events"
+
+
+def get_data_version(db: Session, name: str = EVENTS_DATA) -> int:
+    """
+    Текущая версия данных
+
+    Args:
+        db: Сессия БД
+        name: Область данных
+
+    Returns:
+        Номер версии (0, если данные еще не менялись)
+    """
+    version = db.execute(select(DataVersion.version).where(DataVersion.name == name)).scalar()
+    return version or 0
+
+
+def bump_data_version(db: Session, name: str = EVENTS_DATA) -> None:
+    """
+    Увеличение версии данных в текущей транзакции сессии
+
+    Args:
+        db: Сессия БД
+        name: Область данных
+    """
+    stmt = insert(DataVersion).values(name=name, version=1, updated_at=datetime.now(timezone.utc))
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[DataVersion.name],
+        set_={"version": DataVersion.version + 1, "updated_at": stmt.excluded.updated_at},
+    ))
+
+
+def read_data_version() -> int:
+    """
+    Текущая версия данных в отдельной сессии (для middleware кэша ответов)
+
+    Читается из той же реплики, что и ответ на запрос.
+
+    Returns:
+        Номер версии
+    """
+    db = SessionLocal(bind=read_engine())
+    try:
+        return get_data_version(db)
+    finally:
+        db.close()
+
+
+async def read_data_version_async() -> int:
+    """
+    Асинхронный вариант read_data_version (при API_DB_ASYNC)
+
+    Returns:
+        Номер версии
+    """
+    async with AsyncSessionLocal(bind=await async_read_engine()) as db:
+        version = (await db.execute(
+            select(DataVersion.version).where(DataVersion.name == EVENTS_DATA)
+        )).scalar()
+        return version or 0
@@ -0,0 +1,151 @@
+from typing import Tuple
+import math
+
+from sqlalchemy import and_, func
+from sqlalchemy.sql.elements import ColumnElement
+
+# Средний радиус Земли и длина градуса широты, км
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+# Прямоугольник (west, south, east, north) в градусах
+BBox = Tuple[float, float, float, float]
+
+
+def parse_point(value: str) -> Tuple[float, float]:
+    """
+    Разбор точки из параметра near
+
+    Args:
+        value: Строка вида 'lat,lon'
+
+    Returns:
+        Пара (широта, долгота)
+
+    Raises:
+        ValueError: Строка не является точкой с допустимыми координатами
+    """
+    try:
+        lat, lon = (float(part) for part in value.split(","))
+    except ValueError as e:
+        raise ValueError(f"Invalid point: {value!r}") from e
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise ValueError(f"Invalid point: {value!r}")
+    return lat, lon
+
+
+def parse_bbox(value: str) -> BBox:
+    """
+    Разбор прямоугольника из параметра bbox
+
+    Args:
+        value: Строка вида 'west,south,east,north' (min_lon,min_lat,max_lon,max_lat)
+
+    Returns:
+        Прямоугольник (west, south, east, north)
+
+    Raises:
+        ValueError: Строка не является прямоугольником с допустимыми координатами
+    """
+    try:
+        west, south, east, north = (float(part) for part in value.split(","))
+    except ValueError as e:
+        raise ValueError(f"Invalid bbox: {value!r}") from e
+    if not (-180 <= west <= east <= 180 and -90 <= south <= north <= 90):
+        raise ValueError(f"Invalid bbox: {value!r}")
+    return west, south, east, north
+
+
+def radius_bbox(lat: float, lon: float, radius_km: float) -> BBox:
+    """
+    Прямоугольник, описанный вокруг круга заданного радиуса
+
+    Args:
+        lat: Широта центра
+        lon: Долгота центра
+        radius_km: Радиус, км
+
+    Returns:
+        Прямоугольник (west, south, east, north), обрезанный по границам координат
+    """
+    dlat = radius_km / KM_PER_DEGREE
+    south, north = max(lat - dlat, -90.0), min(lat + dlat, 90.0)
+    # У полюсов круг захватывает все долготы
+    cos_lat = math.cos(math.radians(max(abs(south), abs(north))))
+    if cos_lat <= radius_km / (KM_PER_DEGREE * 180):
+        return -180.0, south, 180.0, north
+    dlon = radius_km / (KM_PER_DEGREE * cos_lat)
+    return max(lon - dlon, -180.0), south, min(lon + dlon, 180.0), north
+
+
+def location_point(lat: ColumnElement, lon: ColumnElement) -> ColumnElement:
+    """
+    Точка события для пространственного индекса (x - долгота, y - широта)
+
+    Args:
+        lat: Колонка широты
+        lon: Колонка долготы
+
+    Returns:
+        Выражение point(lon, lat)
+    """
+    return func.point(lon, lat)
+
+
+def bbox_condition(lat: ColumnElement, lon: ColumnElement, bbox: BBox) -> ColumnElement:
+    """
+    Условие попадания точки в прямоугольник; использует GiST-индекс по location_point
+
+    Args:
+        lat: Колонка широты
+        lon: Колонка долготы
+        bbox: Прямоугольник (west, south, east, north)
+
+    Returns:
+        Выражение SQLAlchemy
+    """
+    west, south, east, north = bbox
+    box = func.box(func.point(west, south), func.point(east, north))
+    return location_point(lat, lon).op("<@")(box)
+
+
+def distance_km(lat: ColumnElement, lon: ColumnElement, center_lat: float, center_lon: float) -> ColumnElement:
+    """
+    Расстояние по дуге большого круга (формула гаверсинусов), км
+
+    Args:
+        lat: Колонка широты
+        lon: Колонка долготы
+        center_lat: Широта точки отсчета
+        center_lon: Долгота точки отсчета
+
+    Returns:
+        Выражение SQLAlchemy
+    """
+    sin_dlat = func.sin(func.radians(lat - center_lat) * 0.5)
+    sin_dlon = func.sin(func.radians(lon - center_lon) * 0.5)
+    a = sin_dlat * sin_dlat + math.cos(math.radians(center_lat)) * func.cos(func.radians(lat)) * sin_dlon * sin_dlon
+    return 2 * EARTH_RADIUS_KM * func.asin(func.least(func.sqrt(a), 1.0))
+
+
+def near_condition(
+    lat: ColumnElement, lon: ColumnElement, center_lat: float, center_lon: float, radius_km: float
+) -> ColumnElement:
+    """
+    Условие "не дальше radius_km от точки": индексируемый описанный
+    прямоугольник плюс точная проверка расстояния
+
+    Args:
+        lat: Колонка широты
+        lon: Колонка долготы
+        center_lat: Широта центра
+        center_lon: Долгота центра
+        radius_km: Радиус, км
+
+    Returns:
+        Выражение SQLAlchemy
+    """
+    return and_(
+        bbox_condition(lat, lon, radius_bbox(center_lat, center_lon, radius_km)),
+        distance_km(lat, lon, center_lat, center_lon) <= radius_km,
+    )
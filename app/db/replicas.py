@@ -0,0 +1,138 @@
+from typing import Callable, List, Optional, Sequence
+import asyncio
+import itertools
+import logging
+import threading
+import time
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+logger = logging.getLogger(__name__)
+
+# Номер "реплики", означающий основную базу
+PRIMARY = -1
+
+# Отставание реплики в секундах. Если реплика получила и применила весь WAL,
+# отставания нет, даже когда основная база давно не менялась. NULL - реплика
+# еще ничего не применила, отставание неизвестно. Основная база (например,
+# реплика после failover) не отстает
+LAG_QUERY = text("""
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+END
+""")
+
+
+class ReplicaRouter:
+    """
+    Выбор реплики для чтения с учетом отставания
+
+    Отставание реплик проверяется не чаще раза в check_interval секунд.
+    Запросы распределяются по кругу между репликами, отставание которых не
+    больше max_lag секунд; если таких нет, читается основная база.
+    """
+
+    def __init__(
+        self,
+        replicas: Sequence[Engine],
+        max_lag: float,
+        check_interval: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            replicas: Синхронные движки реплик (по ним же проверяется отставание)
+            max_lag: Допустимое отставание, с
+            check_interval: Период проверки отставания, с
+            clock: Источник времени (для тестов)
+        """
+        self.replicas = list(replicas)
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._checked_at: Optional[float] = None
+        self._available: List[int] = []
+        self._counter = itertools.count()
+
+    def replica_lag(self, index: int) -> Optional[float]:
+        """
+        Отставание реплики
+
+        Args:
+            index: Номер реплики
+
+        Returns:
+            Отставание в секундах или None, если реплика недоступна или отставание неизвестно
+        """
+        engine = self.replicas[index]
+        try:
+            with engine.connect() as conn:
+                lag = conn.execute(LAG_QUERY).scalar()
+        except SQLAlchemyError as e:
+            logger.warning(f"Read replica {engine.url.render_as_string()} is unavailable: {str(e)}")
+            return None
+        return None if lag is None else float(lag)
+
+    def needs_check(self) -> bool:
+        """
+        Пора ли проверить отставание реплик
+        """
+        return bool(self.replicas) and (
+            self._checked_at is None or self._clock() - self._checked_at >= self.check_interval
+        )
+
+    def check(self) -> None:
+        """
+        Проверка отставания реплик. Пока один поток проверяет, остальные
+        используют результат предыдущей проверки
+        """
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            available = []
+            for index, engine in enumerate(self.replicas):
+                lag = self.replica_lag(index)
+                if lag is not None and lag <= self.max_lag:
+                    available.append(index)
+                elif lag is not None:
+                    logger.warning(
+                        f"Read replica {engine.url.render_as_string()} lags {lag:.1f}s, reading from the primary"
+                    )
+            self._available = available
+            self._checked_at = self._clock()
+        finally:
+            self._lock.release()
+
+    def choose(self) -> int:
+        """
+        Выбор реплики для очередного чтения
+
+        Returns:
+            Номер реплики или PRIMARY
+        """
+        if self.needs_check():
+            self.check()
+        return self._next_available()
+
+    async def choose_async(self) -> int:
+        """
+        Выбор реплики без блокировки цикла событий: проверка отставания
+        выполняется в отдельном потоке
+
+        Returns:
+            Номер реплики или PRIMARY
+        """
+        if self.needs_check():
+            await asyncio.to_thread(self.check)
+        return self._next_available()
+
+    def _next_available(self) -> int:
+        available = self._available
+        if not available:
+            return PRIMARY
+        return available[next(self._counter) % len(available)]
@@ -0,0 +1,197 @@
+from sqlalchemy import DDL, Table, event, text
+from sqlalchemy.orm import Session
+
+# Корзина сводки: день начала события (UTC), категория анализа, источник и
+# формат. События без анализа попадают в категорию '', без источника - в 0
+BUCKET = """
+SELECT (e.start_datetime_utc AT TIME ZONE 'UTC')::date AS day,
+    coalesce(a.category, '') AS category,
+    coalesce(e.source_id, 0) AS source_id,
+    coalesce(e.is_virtual, false) AS is_virtual,
+    {sign} AS delta
+FROM {events} AS e LEFT JOIN {analytics} AS a ON a.event_id = e.event_id
+{where}"""
+
+
+def bucket_rows(events: str, analytics: str, sign: int, where: str = "") -> str:
+    """
+    Вклад событий в корзины сводки
+
+    Args:
+        events: Таблица или подзапрос с колонками events
+        analytics: Таблица или подзапрос с колонками event_id, category
+        sign: 1 - событие добавляется в корзину, -1 - убирается
+        where: Условие на события (e)
+
+    Returns:
+        SELECT с колонками корзины и delta
+    """
+    return BUCKET.format(events=events, analytics=analytics, sign=sign, where=where).strip()
+
+
+def apply_deltas(*parts: str) -> str:
+    """
+    Добавление изменений к счетчикам сводки одним запросом
+
+    Изменения одного пакета суммируются по корзинам, нулевые отбрасываются.
+    Корзины обновляются в порядке ключа, поэтому параллельные пакеты не
+    блокируют друг друга взаимно.
+
+    Args:
+        parts: Результаты bucket_rows
+
+    Returns:
+        INSERT ... ON CONFLICT DO UPDATE
+    """
+    deltas = "\n    UNION ALL\n    ".join(parts)
+    return f"""INSERT INTO event_rollups AS r (day, category, source_id, is_virtual, event_count)
+    SELECT day, category, source_id, is_virtual, sum(delta) FROM (
+    {deltas}
+    ) AS d
+    GROUP BY day, category, source_id, is_virtual
+    HAVING sum(delta) <> 0
+    ORDER BY day, category, source_id, is_virtual
+    ON CONFLICT (day, category, source_id, is_virtual)
+    DO UPDATE SET event_count = r.event_count + excluded.event_count;"""
+
+
+def _analytics_of(event_ids: str, exclude_new: bool = False, include_old: bool = False) -> str:
+    # Анализ событий пакета до изменения: текущие строки без новых плюс старые
+    rows = f"SELECT event_id, category FROM event_analytics WHERE event_id IN ({event_ids})"
+    if exclude_new:
+        rows += " AND analytics_id NOT IN (SELECT analytics_id FROM new_rows)"
+    if include_old:
+        rows += " UNION ALL SELECT event_id, category FROM old_rows"
+    return f"({rows})"
+
+
+def _moved_events(side: str) -> str:
+    # События пакета, у которых изменились колонки корзины: upsert без
+    # изменений переписывает все строки, но сводку они не меняют
+    return f"""(SELECT {side}.* FROM old_rows AS o JOIN new_rows AS n ON n.event_id = o.event_id
+    WHERE (o.start_datetime_utc, o.source_id, o.is_virtual)
+        IS DISTINCT FROM (n.start_datetime_utc, n.source_id, n.is_virtual))"""
+
+
+def _recategorized_ids(side: str) -> str:
+    # События, анализ которых сменил категорию или событие
+    return f"""SELECT {side}.event_id FROM old_rows AS o JOIN new_rows AS n ON n.analytics_id = o.analytics_id
+    WHERE (o.event_id, o.category) IS DISTINCT FROM (n.event_id, n.category)"""
+
+
+_NEW_IDS = "SELECT event_id FROM new_rows"
+_OLD_IDS = "SELECT event_id FROM old_rows"
+_CHANGED_IDS = f"{_recategorized_ids('o')} UNION {_recategorized_ids('n')}"
+
+# Сводка пересчитывается по пакетам: триггеры уровня оператора получают все
+# строки INSERT/UPDATE (в том числе upsert) в таблицах переходов. Удаление
+# события учитывается построчно до каскадного удаления его анализа
+ROLLUP_FUNCTIONS = f"""
+CREATE OR REPLACE FUNCTION events_rollup_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        {apply_deltas(bucket_rows("new_rows", "event_analytics", 1))}
+    ELSE
+        {apply_deltas(
+            bucket_rows(_moved_events("o"), "event_analytics", -1),
+            bucket_rows(_moved_events("n"), "event_analytics", 1),
+        )}
+    END IF;
+    RETURN NULL;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION events_rollup_delete_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    {apply_deltas(bucket_rows(
+        "(SELECT OLD.event_id, OLD.start_datetime_utc, OLD.source_id, OLD.is_virtual)",
+        "event_analytics", -1,
+    ))}
+    RETURN OLD;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION event_analytics_rollup_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        {apply_deltas(
+            bucket_rows("events", _analytics_of(_NEW_IDS, exclude_new=True), -1, f"WHERE e.event_id IN ({_NEW_IDS})"),
+            bucket_rows("events", _analytics_of(_NEW_IDS), 1, f"WHERE e.event_id IN ({_NEW_IDS})"),
+        )}
+    ELSIF TG_OP = 'UPDATE' THEN
+        {apply_deltas(
+            bucket_rows(
+                "events", _analytics_of(_CHANGED_IDS, exclude_new=True, include_old=True), -1,
+                f"WHERE e.event_id IN ({_CHANGED_IDS})",
+            ),
+            bucket_rows("events", _analytics_of(_CHANGED_IDS), 1, f"WHERE e.event_id IN ({_CHANGED_IDS})"),
+        )}
+    ELSE
+        {apply_deltas(
+            bucket_rows("events", _analytics_of(_OLD_IDS, include_old=True), -1, f"WHERE e.event_id IN ({_OLD_IDS})"),
+            bucket_rows("events", _analytics_of(_OLD_IDS), 1, f"WHERE e.event_id IN ({_OLD_IDS})"),
+        )}
+    END IF;
+    RETURN NULL;
+END
+$$;
+"""
+
+# Таблицы переходов разрешены только у триггеров на одно действие
+ROLLUP_TRIGGERS = """
+CREATE TRIGGER events_rollup_insert
+    AFTER INSERT ON events REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION events_rollup_trigger();
+
+CREATE TRIGGER events_rollup_update
+    AFTER UPDATE ON events REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION events_rollup_trigger();
+
+CREATE TRIGGER events_rollup_delete
+    BEFORE DELETE ON events
+    FOR EACH ROW EXECUTE FUNCTION events_rollup_delete_trigger();
+
+CREATE TRIGGER event_analytics_rollup_insert
+    AFTER INSERT ON event_analytics REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION event_analytics_rollup_trigger();
+
+CREATE TRIGGER event_analytics_rollup_update
+    AFTER UPDATE ON event_analytics REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION event_analytics_rollup_trigger();
+
+CREATE TRIGGER event_analytics_rollup_delete
+    AFTER DELETE ON event_analytics REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION event_analytics_rollup_trigger();
+"""
+
+# Полный пересчет сводки (после загрузки данных с отключенными триггерами)
+REBUILD_ROLLUPS = f"""
+DELETE FROM event_rollups;
+{apply_deltas(bucket_rows("events", "event_analytics", 1))}
+"""
+
+
+def install_rollup_ddl(event_analytics: Table) -> None:
+    """
+    Создание функций и триггеров сводки вместе с таблицами
+
+    Нужно для баз, которые создаются через Base.metadata.create_all;
+    существующие базы получают то же самое миграциями 0012 и 0014.
+
+    Args:
+        event_analytics: Таблица event_analytics (создается после events)
+    """
+    postgresql = dict(dialect="postgresql")
+    event.listen(event_analytics, "after_create", DDL(ROLLUP_FUNCTIONS).execute_if(**postgresql))
+    event.listen(event_analytics, "after_create", DDL(ROLLUP_TRIGGERS).execute_if(**postgresql))
+
+
+def rebuild_event_rollups(db: Session) -> None:
+    """
+    Пересчет сводки по всем событиям в текущей транзакции сессии
+
+    Args:
+        db: Сессия БД
+    """
+    db.execute(text(REBUILD_ROLLUPS))
+
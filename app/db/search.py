@@ -0,0 +1,149 @@
+from typing import List, Optional
+import re
+
+from sqlalchemy import DDL, Table, event, func, literal, or_
+from sqlalchemy.sql.elements import ColumnElement
+
+# Конфигурация полнотекстового поиска PostgreSQL
+TS_CONFIG = "english"
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+# Вектор события: название (A) важнее организатора и тегов анализа (B),
+# которые важнее описания (C). Теги лежат в event_analytics, поэтому
+# вектор поддерживается триггерами, а не генерируемой колонкой
+SEARCH_VECTOR_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION event_search_vector(
+    p_event_id integer, p_name text, p_organizer text, p_description text
+) RETURNS tsvector LANGUAGE sql STABLE AS $$
+    SELECT
+        setweight(to_tsvector('{TS_CONFIG}', coalesce(p_name, '')), 'A')
+        || setweight(to_tsvector('{TS_CONFIG}', coalesce(p_organizer, '')), 'B')
+        || setweight(to_tsvector('{TS_CONFIG}', coalesce((
+            SELECT array_to_string(tags, ' ') FROM event_analytics
+            WHERE event_id = p_event_id AND tags IS NOT NULL
+            LIMIT 1
+        ), '')), 'B')
+        || setweight(to_tsvector('{TS_CONFIG}', coalesce(p_description, '')), 'C')
+$$;
+
+CREATE OR REPLACE FUNCTION events_search_vector_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.search_vector := event_search_vector(NEW.event_id, NEW.name, NEW.organizer, NEW.description);
+    RETURN NEW;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION event_analytics_search_vector_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    target_id integer := CASE WHEN TG_OP = 'DELETE' THEN OLD.event_id ELSE NEW.event_id END;
+BEGIN
+    UPDATE events
+    SET search_vector = event_search_vector(event_id, name, organizer, description)
+    WHERE event_id = target_id;
+    RETURN NULL;
+END
+$$;
+"""
+
+# Upsert событий перечисляет в SET все колонки, поэтому UPDATE OF срабатывает
+# и без изменений; вектор пересчитывается, только если значения отличаются
+SEARCH_VECTOR_TRIGGERS = """
+CREATE TRIGGER events_search_vector_insert
+    BEFORE INSERT ON events
+    FOR EACH ROW EXECUTE FUNCTION events_search_vector_trigger();
+
+CREATE TRIGGER events_search_vector_update
+    BEFORE UPDATE OF name, organizer, description ON events
+    FOR EACH ROW
+    WHEN (
+        OLD.name IS DISTINCT FROM NEW.name
+        OR OLD.organizer IS DISTINCT FROM NEW.organizer
+        OR OLD.description IS DISTINCT FROM NEW.description
+    )
+    EXECUTE FUNCTION events_search_vector_trigger();
+
+CREATE TRIGGER event_analytics_search_vector_change
+    AFTER INSERT OR DELETE ON event_analytics
+    FOR EACH ROW EXECUTE FUNCTION event_analytics_search_vector_trigger();
+
+CREATE TRIGGER event_analytics_search_vector_update
+    AFTER UPDATE OF tags ON event_analytics
+    FOR EACH ROW
+    WHEN (OLD.tags IS DISTINCT FROM NEW.tags)
+    EXECUTE FUNCTION event_analytics_search_vector_trigger();
+"""
+
+
+def install_search_ddl(events: Table, event_analytics: Table) -> None:
+    """
+    Создание расширения pg_trgm, функций и триггеров поиска вместе с таблицами
+
+    Нужно для баз, которые создаются через Base.metadata.create_all;
+    существующие базы получают то же самое миграциями 0007 и 0013.
+
+    Args:
+        events: Таблица events
+        event_analytics: Таблица event_analytics
+    """
+    postgresql = dict(dialect="postgresql")
+    event.listen(events, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(**postgresql))
+    event.listen(event_analytics, "after_create", DDL(SEARCH_VECTOR_FUNCTION).execute_if(**postgresql))
+    event.listen(event_analytics, "after_create", DDL(SEARCH_VECTOR_TRIGGERS).execute_if(**postgresql))
+
+
+def prefix_tsquery(search: str) -> Optional[str]:
+    """
+    Запрос to_tsquery, в котором каждое слово ищется по префиксу
+
+    Из строки берутся только слова, поэтому операторы tsquery в поиске
+    пользователя не влияют на разбор запроса.
+
+    Args:
+        search: Строка поиска
+
+    Returns:
+        Запрос вида 'word1:* & word2:*' или None, если слов нет
+    """
+    words: List[str] = _WORD_RE.findall(search.lower())
+    if not words:
+        return None
+    return " & ".join(f"{word}:*" for word in words)
+
+
+def search_condition(search_vector: ColumnElement, name: ColumnElement, search: str) -> ColumnElement:
+    """
+    Условие поиска: полнотекстовое совпадение по префиксам или похожее
+    название (pg_trgm, терпимо к опечаткам)
+
+    Args:
+        search_vector: Колонка tsvector
+        name: Колонка названия
+        search: Строка поиска
+
+    Returns:
+        Выражение SQLAlchemy
+    """
+    conditions = [name.op("%")(search)]
+    query = prefix_tsquery(search)
+    if query:
+        conditions.append(search_vector.op("@@")(func.to_tsquery(TS_CONFIG, query)))
+    return or_(*conditions)
+
+
+def search_rank(search_vector: ColumnElement, name: ColumnElement, search: str) -> ColumnElement:
+    """
+    Релевантность события запросу: ранг полнотекстового поиска плюс
+    похожесть названия
+
+    Args:
+        search_vector: Колонка tsvector
+        name: Колонка названия
+        search: Строка поиска
+
+    Returns:
+        Выражение SQLAlchemy
+    """
+    query = prefix_tsquery(search)
+    text_rank = func.ts_rank_cd(search_vector, func.to_tsquery(TS_CONFIG, query)) if query else literal(0.0)
+    return text_rank + func.similarity(name, search)
@@ -1,14 +1,135 @@
+from contextvars import ContextVar, Token
+from typing import Any, Dict, Optional, Type
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import Pool, QueuePool
 
 from app.core.config import settings
+from app.db.replicas import PRIMARY, ReplicaRouter
+
+
+def async_database_uri(uri: str) -> str:
+    """
+    Строка подключения к той же базе через драйвер asyncpg
+
+    Args:
+        uri: Строка подключения SQLAlchemy (postgresql:// или postgresql+psycopg2://)
+
+    Returns:
+        Строка подключения postgresql+asyncpg://
+    """
+    return make_url(uri).set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+
+
+def engine_options(uri: str, poolclass: Optional[Type[Pool]] = None) -> Dict[str, Any]:
+    """
+    Параметры пула соединений из настроек (DB_POOL_*)
+
+    Размер пула, переполнение и ожидание соединения передаются только
+    пулам-очередям: SingletonThreadPool (sqlite в памяти), StaticPool и
+    NullPool этих аргументов не принимают.
+
+    Args:
+        uri: Строка подключения, для которой создается движок
+        poolclass: Класс пула, если он задается явно
+
+    Returns:
+        Аргументы create_engine / create_async_engine
+    """
+    options: Dict[str, Any] = {
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if poolclass is None:
+        url = make_url(uri)
+        pool = url.get_dialect().get_pool_class(url)
+    else:
+        pool = options["poolclass"] = poolclass
+    if issubclass(pool, QueuePool):
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+        )
+    return options
 
-engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+
+def _create_engine(uri: str) -> Engine:
+    return create_engine(uri, **engine_options(uri))
+
+
+def _create_async_engine(uri: str) -> AsyncEngine:
+    async_uri = async_database_uri(uri)
+    return create_async_engine(async_uri, **engine_options(async_uri))
+
+
+# Основная база: все записи (скраперы, обработка данных, ЛЛМ) и чтение без реплик
+engine = _create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Реплики для чтения (DB_READ_REPLICA_URIS); по синхронным движкам проверяется их отставание
+replica_engines = [_create_engine(uri) for uri in settings.DB_READ_REPLICA_URIS]
+replica_router = ReplicaRouter(
+    replica_engines, settings.DB_REPLICA_MAX_LAG_SECONDS, settings.DB_REPLICA_CHECK_SECONDS
+)
+
+# Асинхронные движки нужны только при API_DB_ASYNC; без них asyncpg не импортируется
+async_engine = _create_async_engine(str(settings.SQLALCHEMY_DATABASE_URI)) if settings.API_DB_ASYNC else None
+async_replica_engines = [
+    _create_async_engine(uri) for uri in settings.DB_READ_REPLICA_URIS
+] if settings.API_DB_ASYNC else []
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
+# Реплика, закрепленная за текущим запросом (см. pin_read_replica)
+_pinned_replica: ContextVar[Optional[int]] = ContextVar("pinned_read_replica", default=None)
+
+
+def pin_read_replica(index: int) -> Token:
+    """
+    Закрепление реплики за текущим запросом
+
+    Все чтения запроса (версия данных для кэша ответов и сам ответ) идут в
+    одну реплику, поэтому ответ не старее версии, под которой он кэшируется.
+
+    Args:
+        index: Номер реплики или PRIMARY
+
+    Returns:
+        Токен для unpin_read_replica
+    """
+    return _pinned_replica.set(index)
+
+
+def unpin_read_replica(token: Token) -> None:
+    _pinned_replica.reset(token)
+
+
+def read_engine() -> Engine:
+    """
+    Движок для чтения: закрепленная за запросом или свободная от отставания реплика, иначе основная база
+    """
+    index = _pinned_replica.get()
+    if index is None:
+        index = replica_router.choose()
+    return engine if index == PRIMARY else replica_engines[index]
+
+
+async def async_read_engine() -> AsyncEngine:
+    """
+    Асинхронный вариант read_engine
+    """
+    index = _pinned_replica.get()
+    if index is None:
+        index = await replica_router.choose_async()
+    return async_engine if index == PRIMARY else async_replica_engines[index]
+
+
 # Dependency
 def get_db():
     db = SessionLocal()
@@ -16,3 +137,19 @@ def get_db():
         yield db
     finally:
         db.close()
+
+def get_read_db():
+    # Только для чтения: сессия может быть открыта на реплике
+    db = SessionLocal(bind=read_engine())
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_async_read_db():
+    async with AsyncSessionLocal(bind=await async_read_engine()) as db:
+        yield db
@@ -2,9 +2,13 @@ from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
 
-from app.api.endpoints import events, llm
+from app.api.cache import ResponseCacheMiddleware
+from app.api.read_routing import ReadReplicaMiddleware
+from app.api.endpoints import events, events_async, llm
 from app.core.config import settings
+from app.db.data_version import read_data_version, read_data_version_async
 from app.db.session import engine, Base, get_db
+from app.services.scheduler import start_scheduler, stop_scheduler
 
 # Создаем таблицы в базе данных
 Base.metadata.create_all(bind=engine)
@@ -25,10 +29,33 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_headers=["*"],
     )
 
+# Кэш ответов для чтения с ETag/304 (API_CACHE_ENABLED)
+if settings.API_CACHE_ENABLED:
+    app.add_middleware(
+        ResponseCacheMiddleware,
+        version_provider=read_data_version_async if settings.API_DB_ASYNC else read_data_version,
+    )
+
+# Чтение GET-запросов из реплик (DB_READ_REPLICA_URIS); добавлено после кэша,
+# чтобы выбрать реплику до чтения версии данных
+if settings.DB_READ_REPLICA_URIS:
+    app.add_middleware(ReadReplicaMiddleware)
+
 # Подключаем роутеры
-app.include_router(events.router, prefix=f"{settings.API_V1_STR}/events", tags=["events"])
+# Синхронные обработчики в пуле потоков или асинхронные на asyncpg (API_DB_ASYNC)
+events_router = events_async.router if settings.API_DB_ASYNC else events.router
+app.include_router(events_router, prefix=f"{settings.API_V1_STR}/events", tags=["events"])
 app.include_router(llm.router, prefix=f"{settings.API_V1_STR}/llm", tags=["llm"])
 
+@app.on_event("startup")
+def on_startup():
+    # Периодический запуск скраперов (SCRAPING_SCHEDULER_ENABLED)
+    start_scheduler()
+
+@app.on_event("shutdown")
+def on_shutdown():
+    stop_scheduler()
+
 @app.get("/")
 def read_root():
     return {"message": "Welcome to Silicon Valley Event Pulse API"}
@@ -1,10 +1,13 @@
 from datetime import datetime
 from typing import List, Optional
 
-from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Integer, String, Text
-from sqlalchemy.dialects.postgresql import ARRAY
-from sqlalchemy.orm import relationship
+from sqlalchemy import BigInteger, Boolean, Column, Date, DateTime, Float, ForeignKey, Index, Integer, String, Text, func
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 
+from app.db.geo import location_point
+from app.db.rollups import install_rollup_ddl
+from app.db.search import install_search_ddl
 from app.db.session import Base
 
 
@@ -18,6 +21,8 @@ class Source(Base):
     status = Column(String(50), nullable=False, default="active")  # 'active', 'inactive', 'error'
     last_checked = Column(DateTime(timezone=True), nullable=True)
     relevance_score = Column(Float, default=0.0)
+    rate_limit_per_second = Column(Float, nullable=True)  # Лимит запросов в секунду (None - SCRAPING_RATE_LIMIT_PER_SECOND)
+    rate_limit_burst = Column(Integer, nullable=True)  # Запросов подряд без ожидания (None - SCRAPING_RATE_LIMIT_BURST)
     created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
     updated_at = Column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -40,8 +45,12 @@ class Event(Base):
     location_lon = Column(Float, nullable=True)
     is_virtual = Column(Boolean, default=False)
     virtual_url = Column(String(512), nullable=True)
-    original_url = Column(String(512), nullable=False)
+    original_url = Column(String(512), nullable=False, unique=True, index=True)
     organizer = Column(String(255), nullable=True)
+    listing_fingerprint = Column(String(64), nullable=True)  # Отпечаток карточки в списке источника
+    last_scraped_at = Column(DateTime(timezone=True), nullable=True)  # Время последней загрузки страницы события
+    content_hash = Column(String(64), nullable=True)  # Отпечаток содержимого; меняется только при реальных изменениях события
+    search_vector = deferred(Column(TSVECTOR, nullable=True))  # Поисковый вектор; заполняется триггерами (app/db/search.py)
     created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
     updated_at = Column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -50,6 +59,29 @@ class Event(Base):
     analytics = relationship("EventAnalytics", back_populates="event", uselist=False)
     trends = relationship("TrendEvent", back_populates="event")
 
+    __table_args__ = (
+        # Постраничный вывод по курсору (start_datetime_utc, event_id)
+        Index("ix_events_start_datetime_event_id", "start_datetime_utc", "event_id"),
+        # Тот же порядок только для онлайн-событий (фильтр is_virtual=true)
+        Index(
+            "ix_events_virtual_start_datetime_event_id", "start_datetime_utc", "event_id",
+            postgresql_where=is_virtual,
+        ),
+        # Выборка изменившихся событий (updated_since)
+        Index("ix_events_updated_at", "updated_at"),
+        # Поиск по радиусу и прямоугольнику карты (GiST по точке, app/db/geo.py)
+        Index(
+            "ix_events_location_point", location_point(location_lat, location_lon), postgresql_using="gist",
+        ).ddl_if(dialect="postgresql"),
+        # Полнотекстовый поиск и нечеткий поиск по названию и месту (pg_trgm)
+        Index("ix_events_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_events_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index(
+            "ix_events_location_text_trgm", "location_text",
+            postgresql_using="gin", postgresql_ops={"location_text": "gin_trgm_ops"},
+        ),
+    )
+
 
 class EventAnalytics(Base):
     __tablename__ = "event_analytics"
@@ -68,6 +100,12 @@ class EventAnalytics(Base):
     # Relationships
     event = relationship("Event", back_populates="analytics")
 
+    __table_args__ = (
+        # Присоединение анализа к событиям и фильтр/группировка по категории
+        Index("ix_event_analytics_event_id", "event_id"),
+        Index("ix_event_analytics_category_event_id", "category", "event_id"),
+    )
+
 
 class Trend(Base):
     __tablename__ = "trends"
@@ -97,6 +135,12 @@ class TrendEvent(Base):
     trend = relationship("Trend", back_populates="events")
     event = relationship("Event", back_populates="trends")
 
+    __table_args__ = (
+        # События тренда по убыванию релевантности и тренды события
+        Index("ix_trend_events_trend_id_relevance_score", "trend_id", relevance_score.desc()),
+        Index("ix_trend_events_event_id", "event_id"),
+    )
+
 
 class LLMSetting(Base):
     __tablename__ = "llm_settings"
@@ -117,7 +161,7 @@ class ScrapingLog(Base):
 
     log_id = Column(Integer, primary_key=True, index=True)
     source_id = Column(Integer, ForeignKey("sources.source_id"))
-    status = Column(String(50), nullable=False)  # 'success', 'error', 'warning'
+    status = Column(String(50), nullable=False)  # 'success', 'error', 'warning', 'worker'
     message = Column(Text, nullable=True)
     events_found = Column(Integer, default=0)
     events_added = Column(Integer, default=0)
@@ -127,3 +171,84 @@ class ScrapingLog(Base):
 
     # Relationships
     source = relationship("Source", back_populates="scraping_logs")
+
+    __table_args__ = (
+        # Последние логи источника (API и планировщик) и всех источников
+        Index("ix_scraping_logs_source_id_created_at", "source_id", "created_at"),
+        Index("ix_scraping_logs_created_at", "created_at"),
+    )
+
+
+class CrawlTask(Base):
+    """
+    Задача очереди обхода (crawl frontier): страница события, которую нужно загрузить
+    """
+    __tablename__ = "crawl_frontier"
+
+    task_id = Column(Integer, primary_key=True, index=True)
+    source_id = Column(Integer, ForeignKey("sources.source_id"), nullable=False)
+    url = Column(String(512), nullable=False, unique=True)
+    priority = Column(Integer, nullable=False, default=0)  # Чем больше, тем раньше загружается
+    status = Column(String(20), nullable=False, default="pending")  # 'pending', 'leased', 'done', 'failed'
+    attempts = Column(Integer, nullable=False, default=0)
+    listing_fingerprint = Column(String(64), nullable=True)  # Отпечаток карточки на момент постановки в очередь
+    lease_owner = Column(String(255), nullable=True)  # Идентификатор воркера, взявшего задачу
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)  # После этого времени задача возвращается в очередь
+    available_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())  # Не раньше этого времени (повтор после ошибки)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
+    updated_at = Column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        # Выборка следующих задач: ожидающие по приоритету и просроченные аренды
+        Index("ix_crawl_frontier_pending", priority.desc(), "task_id", postgresql_where=status == "pending"),
+        Index("ix_crawl_frontier_lease_expires_at", "lease_expires_at", postgresql_where=status == "leased"),
+    )
+
+
+class GeocodeCache(Base):
+    """
+    Кэш геокодирования: нормализованный адрес и найденные координаты.
+    Адреса, которые не удалось найти, хранятся с пустыми координатами,
+    чтобы не запрашивать их повторно
+    """
+    __tablename__ = "geocode_cache"
+
+    address_key = Column(String(512), primary_key=True)  # Результат normalize_address
+    location_lat = Column(Float, nullable=True)
+    location_lon = Column(Float, nullable=True)
+    provider = Column(String(50), nullable=False)  # Геокодер, который дал ответ: 'gazetteer', 'stub', ...
+    hits = Column(Integer, nullable=False, default=0)  # Сколько раз адрес был взят из кэша
+    last_hit_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
+
+
+class DataVersion(Base):
+    """
+    Счетчик версии данных. Увеличивается, когда сбор или обработка меняют
+    события; по нему сбрасывается кэш ответов API (app/api/cache.py)
+    """
+    __tablename__ = "data_versions"
+
+    name = Column(String(50), primary_key=True)  # Область данных: 'events'
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class EventRollup(Base):
+    """
+    Сводка числа событий по дням, категориям, источникам и формату.
+    Поддерживается триггерами на events и event_analytics (app/db/rollups.py),
+    поэтому агрегаты аналитики читают корзины, а не все события
+    """
+    __tablename__ = "event_rollups"
+
+    day = Column(Date, primary_key=True)  # День начала события в UTC
+    category = Column(String(100), primary_key=True)  # Категория анализа; '' - событие без анализа
+    source_id = Column(Integer, primary_key=True)  # 0 - событие без источника
+    is_virtual = Column(Boolean, primary_key=True)
+    event_count = Column(Integer, nullable=False, default=0)
+
+
+install_search_ddl(Event.__table__, EventAnalytics.__table__)
+install_rollup_ddl(EventAnalytics.__table__)
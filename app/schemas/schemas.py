@@ -8,6 +8,8 @@ class SourceBase(BaseModel):
     url: str
     type: str
     status: str = "active"
+    rate_limit_per_second: Optional[float] = None
+    rate_limit_burst: Optional[int] = None
 
 
 class SourceCreate(SourceBase):
@@ -65,6 +67,7 @@ class EventAnalytics(EventAnalyticsBase):
 class Event(EventBase):
     event_id: int
     source_id: int
+    content_hash: Optional[str] = None
     created_at: datetime
     updated_at: datetime
     analytics: Optional[EventAnalytics] = None
@@ -75,9 +78,10 @@ class Event(EventBase):
 
 
 class EventList(BaseModel):
-    total: int
-    page: int
+    total: Optional[int] = None
+    page: Optional[int] = None
     page_size: int
+    next_cursor: Optional[str] = None
     events: List[Event]
 
 
@@ -116,6 +120,17 @@ class CategoryList(BaseModel):
     categories: List[CategoryCount]
 
 
+class TimeSeriesPoint(BaseModel):
+    period: date
+    category: Optional[str] = None
+    count: int
+
+
+class TimeSeries(BaseModel):
+    interval: str
+    points: List[TimeSeriesPoint]
+
+
 class LLMSettingBase(BaseModel):
     provider: str
     model_name: str
@@ -2,8 +2,10 @@ from typing import Dict, List, Optional
 from datetime import datetime
 import logging
 
+from app.db.data_version import bump_data_version
 from app.db.session import SessionLocal
 from app.models.models import Event, EventAnalytics
+from app.services.scraping.persistence import event_content_hash
 
 logger = logging.getLogger(__name__)
 
@@ -92,8 +94,11 @@ class DataProcessor:
             from datetime import timedelta
             end_datetime_utc = start_datetime_utc + timedelta(hours=2)
             
-            # Обновляем событие в базе данных
+            # Обновляем событие в базе данных; отпечаток пересчитывается, иначе
+            # следующий запуск скрапера не заметит, что содержимое отличается
             event.end_datetime_utc = end_datetime_utc
+            event.content_hash = event_content_hash(event)
+            bump_data_version(self.db)
             self.db.commit()
         
         # Формируем нормализованные данные
@@ -205,6 +210,8 @@ class DataProcessor:
                 # Удаляем дубликат
                 self.db.delete(duplicate)
             
+            primary_event.content_hash = event_content_hash(primary_event)
+            bump_data_version(self.db)
             self.db.commit()
             logger.info(f"Successfully merged duplicates into event {primary_event_id}")
             
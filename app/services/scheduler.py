@@ -0,0 +1,277 @@
+from typing import Dict, List, Optional, Sequence
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+import logging
+import random
+import threading
+import zlib
+
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.schedulers.blocking import BlockingScheduler
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.models import ScrapingLog, Source
+from app.services.scraping.registry import available_scrapers, get_scraper_class
+
+logger = logging.getLogger(__name__)
+
+
+def adaptive_interval(
+    logs: Sequence[ScrapingLog],
+    base_minutes: float,
+    min_minutes: float,
+    max_minutes: float,
+    target_changes: float,
+) -> float:
+    """
+    Расчет интервала опроса источника по истории запусков
+
+    Скорость изменений (добавленные и обновленные события в час) считается
+    по успешным запускам из истории. Интервал подбирается так, чтобы за один
+    запуск в среднем находилось `target_changes` изменений: часто
+    меняющиеся источники опрашиваются чаще, редко меняющиеся - реже.
+
+    Args:
+        logs: Записи ScrapingLog источника, от новых к старым
+        base_minutes: Интервал по умолчанию (при недостатке истории)
+        min_minutes: Минимальный интервал
+        max_minutes: Максимальный интервал
+        target_changes: Желаемое число изменений за один запуск
+
+    Returns:
+        Интервал в минутах
+    """
+    successful = [log for log in logs if log.status == "success" and log.created_at]
+    if len(successful) < 2:
+        return base_minutes
+
+    newest, oldest = successful[0].created_at, successful[-1].created_at
+    hours = (newest - oldest).total_seconds() / 3600
+    if hours <= 0:
+        return base_minutes
+
+    # Изменения самого старого запуска накоплены до начала окна наблюдения
+    changes = sum((log.events_added or 0) + (log.events_updated or 0) for log in successful[:-1])
+    if changes == 0:
+        return max_minutes
+
+    changes_per_hour = changes / hours
+    interval = target_changes / changes_per_hour * 60
+    return min(max(interval, min_minutes), max_minutes)
+
+
+def _lock_key(source_type: str) -> int:
+    # Ключ advisory-блокировки Postgres: 32-битное число, стабильное между процессами
+    return zlib.crc32(f"scraping:{source_type}".encode())
+
+
+class ScrapingScheduler:
+    """
+    Планировщик запуска скраперов
+
+    Каждый источник запускается по своему расписанию: после завершения
+    запуска следующий назначается через интервал, рассчитанный по истории
+    ScrapingLog, со случайным смещением (jitter). Запуски одного источника
+    не пересекаются ни в одном процессе, ни между процессами (advisory-блокировка
+    Postgres), поэтому планировщик можно запускать в нескольких воркерах.
+    """
+
+    def __init__(self, scheduler=None):
+        self.scheduler = scheduler or BackgroundScheduler(timezone=timezone.utc)
+        self.base_minutes = settings.SCRAPING_INTERVAL_MINUTES
+        self.min_minutes = min(settings.SCRAPING_MIN_INTERVAL_MINUTES, self.base_minutes)
+        self.max_minutes = max(settings.SCRAPING_MAX_INTERVAL_MINUTES, self.base_minutes)
+        self.jitter = settings.SCRAPING_SCHEDULER_JITTER
+        self.target_changes = settings.SCRAPING_SCHEDULER_TARGET_CHANGES
+        self.history_runs = settings.SCRAPING_SCHEDULER_HISTORY_RUNS
+        self._running: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """
+        Запуск планировщика и назначение первого запуска всех источников
+        """
+        for source_type in available_scrapers():
+            # Первые запуски разносятся во времени, чтобы не нагружать все сайты разом
+            self.schedule(source_type, random.uniform(0, self.base_minutes * self.jitter))
+        logger.info(f"Scraping scheduler started for {len(available_scrapers())} sources")
+        self.scheduler.start()
+
+    def shutdown(self) -> None:
+        """
+        Остановка планировщика без ожидания текущих запусков
+        """
+        if self.scheduler.running:
+            self.scheduler.shutdown(wait=False)
+
+    def schedule(self, source_type: str, delay_minutes: float) -> None:
+        """
+        Назначение следующего запуска источника
+
+        Args:
+            source_type: Тип источника
+            delay_minutes: Через сколько минут запустить
+        """
+        run_date = datetime.now(timezone.utc) + timedelta(minutes=delay_minutes)
+        self.scheduler.add_job(
+            self.run_source,
+            trigger="date",
+            run_date=run_date,
+            args=[source_type],
+            id=f"scraping:{source_type}",
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True,
+            misfire_grace_time=None,
+        )
+        logger.info(f"Next {source_type} scraping run at {run_date.isoformat()}")
+
+    def next_interval(self, db: Session, source_type: str) -> float:
+        """
+        Интервал до следующего запуска источника с учетом jitter
+
+        Args:
+            db: Сессия базы данных
+            source_type: Тип источника
+
+        Returns:
+            Интервал в минутах
+        """
+        source = db.query(Source).filter(Source.type == source_type).first()
+        if source is None:
+            return self.base_minutes
+        if source.status == "inactive":
+            return self.max_minutes
+
+        logs: List[ScrapingLog] = (
+            db.query(ScrapingLog)
+            .filter(ScrapingLog.source_id == source.source_id, ScrapingLog.status != "worker")
+            .order_by(ScrapingLog.created_at.desc())
+            .limit(self.history_runs)
+            .all()
+        )
+        interval = adaptive_interval(
+            logs, self.base_minutes, self.min_minutes, self.max_minutes, self.target_changes
+        )
+        return interval * (1 + random.uniform(-self.jitter, self.jitter))
+
+    @contextmanager
+    def _source_lock(self, db: Session, source_type: str):
+        """
+        Блокировка, исключающая параллельные запуски одного источника
+
+        Args:
+            db: Сессия базы данных, в которой держится advisory-блокировка
+            source_type: Тип источника
+
+        Returns:
+            True, если блокировка получена
+        """
+        with self._lock:
+            local_lock = self._running.setdefault(source_type, threading.Lock())
+        if not local_lock.acquire(blocking=False):
+            yield False
+            return
+
+        use_advisory = db.get_bind().dialect.name == "postgresql"
+        try:
+            if use_advisory:
+                acquired = db.execute(
+                    text("SELECT pg_try_advisory_lock(:key)"), {"key": _lock_key(source_type)}
+                ).scalar()
+                if not acquired:
+                    yield False
+                    return
+                # Блокировка уровня сессии переживает коммит; без него сессия
+                # оставалась бы "idle in transaction" на весь запуск скрапера
+                db.commit()
+            try:
+                yield True
+            finally:
+                if use_advisory:
+                    db.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _lock_key(source_type)})
+                    db.commit()
+        finally:
+            local_lock.release()
+
+    def run_source(self, source_type: str) -> Optional[ScrapingLog]:
+        """
+        Запуск скрапера источника и назначение следующего запуска
+
+        Args:
+            source_type: Тип источника
+
+        Returns:
+            Запись ScrapingLog или None, если запуск пропущен
+        """
+        db = SessionLocal()
+        scraping_log = None
+        try:
+            with self._source_lock(db, source_type) as acquired:
+                if not acquired:
+                    logger.info(f"Skipping {source_type} scraping: previous run is still in progress")
+                else:
+                    source = db.query(Source).filter(Source.type == source_type).first()
+                    inactive = source is not None and source.status == "inactive"
+                    # Транзакция закрывается до запуска: он может идти минутами
+                    db.commit()
+                    if inactive:
+                        logger.info(f"Skipping inactive source {source_type}")
+                    else:
+                        scraper = get_scraper_class(source_type)()
+                        try:
+                            # С очередью обхода планировщик только обходит списки,
+                            # страницы событий загружают воркеры
+                            if settings.SCRAPING_FRONTIER_ENABLED:
+                                scraping_log = scraper.enqueue()
+                            else:
+                                scraping_log = scraper.run()
+                        finally:
+                            scraper.db.close()
+            db.rollback()
+            interval = self.next_interval(db, source_type)
+        except Exception as e:
+            logger.error(f"Error in scheduled {source_type} scraping: {str(e)}")
+            interval = self.base_minutes
+        finally:
+            db.close()
+
+        self.schedule(source_type, interval)
+        return scraping_log
+
+
+_scheduler: Optional[ScrapingScheduler] = None
+
+
+def start_scheduler() -> Optional[ScrapingScheduler]:
+    """
+    Запуск фонового планировщика, если он включен в настройках
+
+    Returns:
+        Экземпляр ScrapingScheduler или None
+    """
+    global _scheduler
+    if not settings.SCRAPING_SCHEDULER_ENABLED or _scheduler is not None:
+        return _scheduler
+    _scheduler = ScrapingScheduler()
+    _scheduler.start()
+    return _scheduler
+
+
+def stop_scheduler() -> None:
+    """
+    Остановка фонового планировщика
+    """
+    global _scheduler
+    if _scheduler is not None:
+        _scheduler.shutdown()
+        _scheduler = None
+
+
+if __name__ == "__main__":
+    # Отдельный процесс планировщика: python -m app.services.scheduler
+    logging.basicConfig(level=logging.INFO)
+    ScrapingScheduler(BlockingScheduler(timezone=timezone.utc)).start()
@@ -0,0 +1,648 @@
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from urllib.parse import urljoin
+import hashlib
+import json
+import logging
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from app.core.config import settings
+from app.db.data_version import bump_data_version
+from app.db.session import SessionLocal
+from app.models.models import Event, Source, ScrapingLog
+from app.services.scraping.concurrency import fetch_concurrently
+from app.services.scraping.dates import date_parsing_stats
+from app.services.scraping.frontier import CrawlFrontier
+from app.services.scraping.http_client import get_http_client
+from app.services.scraping.parsing import parse_html
+from app.services.scraping.geocoding import create_geocoding_stage, log_geocoding_stats
+from app.services.scraping.persistence import EventBatchWriter
+from app.services.scraping.structured_data import extract_structured_event, is_complete
+
+logger = logging.getLogger(__name__)
+
+# Поля Event, которые заполняет конвейер
+EVENT_FIELDS = (
+    "name",
+    "description",
+    "start_datetime_utc",
+    "end_datetime_utc",
+    "location_text",
+    "location_lat",
+    "location_lon",
+    "is_virtual",
+    "virtual_url",
+    "original_url",
+    "organizer",
+    "listing_fingerprint",
+)
+
+# Сколько карточек сверяется с БД одним запросом в инкрементальном режиме
+KNOWN_CARDS_CHUNK_SIZE = 100
+
+# На сколько дней вперед собираются события, если источник не получил days_ahead
+DEFAULT_DAYS_AHEAD = 30
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+
+class BaseScraper:
+    """
+    Базовый класс скрапера
+
+    Источник описывает только, где взять страницы со списком событий и
+    как извлечь данные из карточки и страницы события. Остальное делает
+    конвейер: загрузка списка -> разбор карточек -> параллельная загрузка
+    страниц событий -> нормализация -> пакетное сохранение. События
+    проходят по конвейеру по одному и не накапливаются в памяти.
+    """
+
+    # Тип источника (значение Source.type) и данные для создания записи Source
+    source_type: str = ""
+    source_name: str = ""
+    source_url: str = ""
+    base_url: str = ""
+
+    headers: Dict[str, str] = DEFAULT_HEADERS
+
+    # Приоритет страниц источника в очереди обхода (чем больше, тем раньше)
+    crawl_priority: int = 0
+
+    # Элементы страниц, которые нужны экстракторам (None - разбирать страницу целиком)
+    listing_parse_only: Optional[SoupStrainer] = None
+    detail_parse_only: Optional[SoupStrainer] = None
+
+    def __init__(self):
+        self.http = get_http_client()
+        self.db = SessionLocal()
+        self._unchanged_urls = set()
+        self._empty_urls = set()
+        self._skipped_urls = set()
+        self._card_fingerprints: Dict[str, str] = {}
+        self._pending_cache: Dict[str, Callable[[], bool]] = {}
+
+    def __del__(self):
+        # __init__ мог не выполниться (например, экземпляр создан через __new__)
+        if getattr(self, "db", None) is not None:
+            self.db.close()
+
+    # --- Экстракторы, которые реализует источник ---
+
+    def listing_requests(self, **params) -> Iterable[Tuple[str, Optional[Dict[str, Any]]]]:
+        """
+        Страницы со списком событий
+
+        Страницы перечисляются по порядку, генератором: следующая
+        запрашивается, только если на предыдущей нашлись нужные карточки
+        (см. iter_cards). Номера страниц дает listing_pages().
+
+        Args:
+            **params: Параметры поиска, переданные в run()/search_events()
+
+        Returns:
+            Пары (URL, параметры запроса)
+        """
+        raise NotImplementedError
+
+    def extract_cards(self, soup: BeautifulSoup) -> Iterable[Any]:
+        """
+        Извлечение карточек событий со страницы списка
+
+        Args:
+            soup: Разобранная страница списка
+
+        Returns:
+            Карточки событий
+        """
+        raise NotImplementedError
+
+    def extract_card_url(self, card: Any) -> Optional[str]:
+        """
+        Извлечение ссылки на событие из карточки
+
+        Args:
+            card: Карточка события
+
+        Returns:
+            URL события (может быть относительным) или None
+        """
+        raise NotImplementedError
+
+    def extract_card_date(self, card: Any) -> Optional[datetime]:
+        """
+        Извлечение даты начала события из карточки
+
+        По дате карточки обход списка останавливается на событиях позже
+        days_ahead. По умолчанию дата неизвестна и обход идет до конца списка.
+
+        Args:
+            card: Карточка события
+
+        Returns:
+            Дата начала в UTC или None
+        """
+        return None
+
+    def extract_card_fields(self, card: Any) -> Dict[str, Any]:
+        """
+        Извлечение дешевых полей карточки для определения изменений
+
+        По умолчанию используется весь видимый текст карточки (название,
+        дата, место). Источник может переопределить метод, если в карточке
+        есть меняющиеся без изменения события данные (счетчики и т.п.).
+
+        Args:
+            card: Карточка события
+
+        Returns:
+            Словарь полей карточки
+        """
+        return {"text": card.get_text(" ", strip=True)}
+
+    def extract_event(self, soup: BeautifulSoup, event_url: str) -> Optional[Dict]:
+        """
+        Извлечение данных о событии со страницы события
+
+        Args:
+            soup: Разобранная страница события
+            event_url: URL события
+
+        Returns:
+            Словарь с информацией о событии или None
+        """
+        raise NotImplementedError
+
+    # --- Конвейер ---
+
+    def listing_pages(self) -> range:
+        """
+        Номера страниц списка (с 1), которые может запросить источник
+
+        Returns:
+            Диапазон номеров страниц, не больше SCRAPING_MAX_LISTING_PAGES
+        """
+        return range(1, settings.SCRAPING_MAX_LISTING_PAGES + 1)
+
+    def get_source(self) -> Source:
+        """
+        Получение записи источника, при отсутствии она создается
+
+        Returns:
+            Запись Source
+        """
+        source = self.db.query(Source).filter(Source.type == self.source_type).first()
+        if not source:
+            source = Source(
+                name=self.source_name,
+                url=self.source_url,
+                type=self.source_type,
+                status="active"
+            )
+            self.db.add(source)
+            self.db.commit()
+            self.db.refresh(source)
+        return source
+
+    def configure_rate_limit(self, source: Source) -> None:
+        """
+        Применение лимитов частоты запросов, заданных в записи источника
+
+        Args:
+            source: Запись Source
+        """
+        rate_limiter = getattr(self.http, "rate_limiter", None)
+        if rate_limiter is None:
+            return
+        if source.rate_limit_per_second is None and source.rate_limit_burst is None:
+            return
+        for url in {self.base_url, source.url}:
+            if url:
+                rate_limiter.configure(url, rate=source.rate_limit_per_second, burst=source.rate_limit_burst)
+
+    def iter_cards(self, **params) -> Iterator[Tuple[str, str]]:
+        """
+        Постраничная загрузка списка и извлечение карточек событий
+
+        Страницы загружаются лениво: следующая страница запрашивается только
+        после того, как потребитель разобрал карточки предыдущей. Обход
+        заканчивается на странице без новых карточек, на странице, все
+        карточки которой начинаются позже чем через days_ahead дней, или
+        на отсутствующей (404) странице после первой.
+
+        Args:
+            **params: Параметры поиска
+
+        Returns:
+            Итератор пар (абсолютный URL события, отпечаток карточки) без повторов URL
+        """
+        seen = set()
+        horizon = datetime.now(timezone.utc) + timedelta(days=params.get("days_ahead", DEFAULT_DAYS_AHEAD))
+
+        for page, (listing_url, query_params) in enumerate(self.listing_requests(**params)):
+            response = self.http.get(listing_url, params=query_params, headers=self.headers, source=self.source_type)
+            if page and response.status_code == 404:
+                return
+            response.raise_for_status()
+
+            soup = parse_html(response.text, self.listing_parse_only)
+            new_cards = in_horizon = 0
+
+            for card in self.extract_cards(soup):
+                try:
+                    event_url = self.extract_card_url(card)
+                    if not event_url:
+                        continue
+
+                    event_url = urljoin(self.base_url, event_url)
+                    if event_url in seen:
+                        continue
+                    seen.add(event_url)
+                    new_cards += 1
+
+                    card_date = self.extract_card_date(card)
+                    if card_date is not None and card_date > horizon:
+                        continue
+                    in_horizon += 1
+                    yield event_url, card_fingerprint(self.extract_card_fields(card))
+
+                except Exception as e:
+                    logger.error(f"Error processing event card: {str(e)}")
+
+            # Списки отсортированы по дате: дальше только повторы или события за горизонтом
+            if not new_cards or not in_horizon:
+                logger.info(f"Listing of {self.source_name} ends at page {page + 1}")
+                return
+
+    def iter_event_urls(self, **params) -> Iterator[str]:
+        """
+        URL событий, страницы которых нужно загрузить
+
+        В инкрементальном режиме пропускаются уже сохраненные события,
+        у которых не изменилась карточка и копия в БД еще не устарела.
+
+        Args:
+            **params: Параметры поиска
+
+        Returns:
+            Итератор абсолютных URL событий
+        """
+        cards = self.iter_cards(**params)
+        if settings.SCRAPING_INCREMENTAL:
+            cards = self._skip_known_cards(cards)
+
+        for event_url, fingerprint in cards:
+            self._card_fingerprints[event_url] = fingerprint
+            yield event_url
+
+    def _skip_known_cards(self, cards: Iterator[Tuple[str, str]]) -> Iterator[Tuple[str, str]]:
+        """
+        Отбор карточек, для которых нужна загрузка страницы события
+
+        Args:
+            cards: Пары (URL события, отпечаток карточки)
+
+        Returns:
+            Итератор карточек новых, измененных или устаревших событий
+        """
+        stale_before = datetime.now(timezone.utc) - timedelta(hours=settings.SCRAPING_STALE_AFTER_HOURS)
+        known_run = 0
+        # Не забегаем по списку дальше, чем нужно для остановки по серии известных событий
+        chunk_size = min(KNOWN_CARDS_CHUNK_SIZE, settings.SCRAPING_KNOWN_RUN_LIMIT or KNOWN_CARDS_CHUNK_SIZE)
+
+        while True:
+            chunk = list(islice(cards, chunk_size))
+            if not chunk:
+                return
+
+            known = {
+                original_url: (fingerprint, last_scraped_at)
+                for original_url, fingerprint, last_scraped_at in self.db.query(
+                    Event.original_url, Event.listing_fingerprint, Event.last_scraped_at
+                ).filter(
+                    Event.original_url.in_([event_url for event_url, _ in chunk])
+                )
+            }
+
+            for event_url, fingerprint in chunk:
+                stored_fingerprint, last_scraped_at = known.get(event_url, (None, None))
+                if last_scraped_at is not None and last_scraped_at.tzinfo is None:
+                    last_scraped_at = last_scraped_at.replace(tzinfo=timezone.utc)
+
+                if (
+                    stored_fingerprint == fingerprint
+                    and last_scraped_at is not None
+                    and last_scraped_at >= stale_before
+                ):
+                    self._skipped_urls.add(event_url)
+                    known_run += 1
+                    # Длинная серия уже известных событий - остальная часть
+                    # каталога собрана раньше, следующие страницы не загружаем
+                    if settings.SCRAPING_KNOWN_RUN_LIMIT and known_run >= settings.SCRAPING_KNOWN_RUN_LIMIT:
+                        logger.info(f"Stopping {self.source_name} listing after {known_run} known events in a row")
+                        return
+                    continue
+
+                known_run = 0
+                yield event_url, fingerprint
+
+    def fetch_event(self, event_url: str) -> Optional[Dict]:
+        """
+        Загрузка и разбор страницы события
+
+        Args:
+            event_url: URL события
+
+        Returns:
+            Словарь с информацией о событии или None в случае ошибки, если
+            страница не изменилась с прошлого запуска (URL попадает в
+            `_unchanged_urls`) или на ней нет события для сохранения
+            (URL попадает в `_empty_urls`)
+        """
+        try:
+            # Тело страницы попадает в кэш только после сохранения события (cache_saved_pages)
+            response = self.http.get(event_url, headers=self.headers, source=self.source_type, defer_store=True)
+            response.raise_for_status()
+
+            # Страница не изменилась с прошлого запуска - разбор и сохранение не нужны
+            if response.unchanged:
+                self._unchanged_urls.add(event_url)
+                return None
+            if response.store_in_cache is not None:
+                self._pending_cache[event_url] = response.store_in_cache
+
+            # Встроенные данные (JSON-LD, __NEXT_DATA__, микроразметка) ищутся
+            # без построения DOM; если событие в них полное, DOM не нужен
+            structured = None
+            if settings.SCRAPING_STRUCTURED_DATA:
+                structured = extract_structured_event(response.content, event_url)
+                if is_complete(structured):
+                    return structured
+
+            soup = parse_html(response.text, self.detail_parse_only)
+            event_data = self.extract_event(soup, event_url)
+
+            # Неполные встроенные данные надежнее значений, найденных селекторами
+            if event_data and structured:
+                event_data.update(structured)
+
+            # Событие без распознанной даты не сохраняем, чтобы не подставлять
+            # вместо нее время загрузки
+            if event_data and not event_data.get("start_datetime_utc"):
+                logger.warning(f"Skipping event without start date: {event_url}")
+                event_data = None
+
+            # Страница разобрана, но сохранять нечего - повторная загрузка
+            # даст тот же результат, поэтому страница сразу попадает в кэш
+            if not event_data:
+                self._empty_urls.add(event_url)
+                self.cache_saved_pages([event_url])
+            return event_data
+
+        except Exception as e:
+            logger.error(f"Error getting event details from {event_url}: {str(e)}")
+            return None
+
+    def cache_saved_pages(self, urls: List[str]) -> None:
+        """
+        Запись в HTTP-кэш страниц событий, которые сохранены в БД
+
+        Передается в EventBatchWriter как on_saved. Пока событие не
+        сохранено, его страница не считается неизменной при следующей загрузке.
+
+        Args:
+            urls: URL сохраненных событий
+        """
+        for event_url in urls:
+            store = self._pending_cache.pop(event_url, None)
+            if store is None:
+                continue
+            try:
+                store()
+            except Exception as e:
+                logger.warning(f"Error caching event page {event_url}: {str(e)}")
+
+    def normalize_event(self, event_data: Dict) -> Dict:
+        """
+        Приведение данных о событии к общему виду
+
+        Args:
+            event_data: Данные, извлеченные источником
+
+        Returns:
+            Нормализованные данные о событии
+        """
+        # Все пакеты upsert должны содержать одинаковый набор колонок
+        event_data = {key: event_data.get(key) for key in EVENT_FIELDS}
+
+        for key in ("name", "description", "location_text", "organizer"):
+            if isinstance(event_data.get(key), str):
+                event_data[key] = event_data[key].strip()
+
+        location = (event_data.get("location_text") or "").lower()
+        if event_data.get("is_virtual") is None:
+            event_data["is_virtual"] = "online" in location or "virtual" in location
+
+        if event_data["is_virtual"] and not event_data.get("virtual_url"):
+            event_data["virtual_url"] = event_data["original_url"]
+
+        if not event_data.get("end_datetime_utc"):
+            event_data["end_datetime_utc"] = event_data["start_datetime_utc"] + timedelta(hours=2)
+
+        return event_data
+
+    def iter_events(
+        self, on_unchanged: Optional[Callable[[str, Optional[str]], None]] = None, **params
+    ) -> Iterator[Dict]:
+        """
+        Потоковое получение нормализованных событий источника
+
+        Args:
+            on_unchanged: Необязательный обработчик (URL, отпечаток карточки)
+                для событий, страницы которых не изменились с прошлого запуска
+            **params: Параметры поиска
+
+        Returns:
+            Итератор словарей с информацией о событиях
+        """
+        for event_url, event_data in fetch_concurrently(self.iter_event_urls(**params), self.fetch_event):
+            fingerprint = self._card_fingerprints.pop(event_url, None)
+            if event_data:
+                event_data["listing_fingerprint"] = fingerprint
+                yield self.normalize_event(event_data)
+            elif on_unchanged and event_url in self._unchanged_urls:
+                on_unchanged(event_url, fingerprint)
+
+    def run(self, on_event: Optional[Callable[[Dict], None]] = None, **params) -> Optional[ScrapingLog]:
+        """
+        Полный цикл сбора событий источника с записью в ScrapingLog
+
+        Args:
+            on_event: Необязательный обработчик для каждого сохраняемого события
+            **params: Параметры поиска
+
+        Returns:
+            Запись ScrapingLog с результатами или None, если не удалось ее создать
+        """
+        self._unchanged_urls = set()
+        self._empty_urls = set()
+        self._skipped_urls = set()
+        self._card_fingerprints = {}
+        self._pending_cache = {}
+
+        try:
+            # Создаем лог скрейпинга
+            source = self.get_source()
+            self.configure_rate_limit(source)
+
+            scraping_log = ScrapingLog(
+                source_id=source.source_id,
+                status="running",
+                message=f"Started scraping {self.source_name}"
+            )
+            self.db.add(scraping_log)
+            self.db.commit()
+            self.db.refresh(scraping_log)
+
+            start_time = datetime.utcnow()
+            geocoding = create_geocoding_stage(self.db)
+            writer = EventBatchWriter(
+                self.db, source.source_id, geocoding=geocoding, on_saved=self.cache_saved_pages
+            )
+            scraped = 0
+
+            # Неизмененные события не загружаются заново, пока не устареют
+            for event_data in self.iter_events(on_unchanged=writer.touch, **params):
+                scraped += 1
+                if on_event:
+                    on_event(event_data)
+
+                # Сохраняем событие в базу данных (пакетами)
+                writer.add(event_data)
+
+            writer.flush()
+
+            # Новые и измененные события сбрасывают кэш ответов API
+            if writer.added or writer.updated:
+                bump_data_version(self.db)
+                self.db.commit()
+
+            # Обновляем лог скрейпинга
+            execution_time = (datetime.utcnow() - start_time).total_seconds()
+            scraping_log.status = "success"
+            scraping_log.message = (
+                f"Successfully scraped {scraped} events from {self.source_name}"
+                f" ({len(self._unchanged_urls)} unchanged, {len(self._skipped_urls)} skipped as known,"
+                f" {len(self._empty_urls)} without events, {writer.unchanged} with identical content)"
+            )
+            scraping_log.events_found = scraped + len(self._unchanged_urls) + len(self._skipped_urls)
+            scraping_log.events_added = writer.added
+            scraping_log.events_updated = writer.updated
+            scraping_log.execution_time = execution_time
+            self.db.commit()
+
+            # Обновляем источник
+            source.last_checked = datetime.utcnow()
+            self.db.commit()
+
+            stats = date_parsing_stats()
+            logger.info(
+                f"Date parsing cache: {stats['hits']} hits, {stats['misses']} misses "
+                f"({stats['hit_rate']:.0%}), {stats['failures']} unparsed"
+            )
+            if geocoding:
+                log_geocoding_stats(geocoding)
+
+            return scraping_log
+
+        except Exception as e:
+            logger.error(f"Error scraping {self.source_name}: {str(e)}")
+            self.db.rollback()
+
+            if 'scraping_log' in locals():
+                scraping_log.status = "error"
+                scraping_log.message = f"Error scraping {self.source_name}: {str(e)}"
+                self.db.commit()
+                return scraping_log
+
+            return None
+
+    def enqueue(self, **params) -> Optional[ScrapingLog]:
+        """
+        Обход списков источника с постановкой страниц событий в очередь обхода
+
+        Страницы событий затем загружают воркеры (app.services.scraping.worker).
+
+        Args:
+            **params: Параметры поиска
+
+        Returns:
+            Запись ScrapingLog с результатами или None, если не удалось ее создать
+        """
+        self._skipped_urls = set()
+        self._card_fingerprints = {}
+
+        try:
+            source = self.get_source()
+            self.configure_rate_limit(source)
+            start_time = datetime.utcnow()
+
+            def urls_with_fingerprints():
+                for event_url in self.iter_event_urls(**params):
+                    yield event_url, self._card_fingerprints.pop(event_url, None)
+
+            queued = CrawlFrontier(self.db).enqueue(source.source_id, urls_with_fingerprints(), self.crawl_priority)
+
+            scraping_log = ScrapingLog(
+                source_id=source.source_id,
+                status="success",
+                message=f"Queued {queued} event pages from {self.source_name} ({len(self._skipped_urls)} skipped as known)",
+                events_found=queued + len(self._skipped_urls),
+                execution_time=(datetime.utcnow() - start_time).total_seconds(),
+            )
+            self.db.add(scraping_log)
+            source.last_checked = datetime.utcnow()
+            self.db.commit()
+            return scraping_log
+
+        except Exception as e:
+            logger.error(f"Error queueing {self.source_name} event pages: {str(e)}")
+            self.db.rollback()
+            return None
+
+    def search_events(self, **params) -> List[Dict]:
+        """
+        Поиск событий источника
+
+        Сохраняет события так же, как run(), но дополнительно возвращает
+        их списком. Для больших объемов следует использовать run().
+
+        Args:
+            **params: Параметры поиска
+
+        Returns:
+            Список словарей с информацией о событиях
+        """
+        events = []
+        scraping_log = self.run(on_event=events.append, **params)
+        if not scraping_log or scraping_log.status != "success":
+            return []
+        return events
+
+
+def card_fingerprint(fields: Dict[str, Any]) -> str:
+    """
+    Отпечаток карточки события
+
+    Args:
+        fields: Дешевые поля карточки
+
+    Returns:
+        SHA-1 от полей карточки в шестнадцатеричном виде
+    """
+    payload = json.dumps(fields, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
@@ -0,0 +1,103 @@
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple, TypeVar
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+from urllib.parse import urlparse
+import logging
+import threading
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class HostLimiter:
+    """
+    Ограничение числа одновременных запросов к одному хосту
+    """
+
+    def __init__(self, per_host_limit: int):
+        self.per_host_limit = max(1, per_host_limit)
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _semaphore(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.per_host_limit)
+                self._semaphores[host] = semaphore
+            return semaphore
+
+    def call(self, url: str, func: Callable[[str], T]) -> T:
+        """
+        Вызов функции для URL с учетом лимита на хост
+
+        Args:
+            url: URL, по хосту которого применяется лимит
+            func: Функция загрузки
+
+        Returns:
+            Результат функции
+        """
+        with self._semaphore(url):
+            return func(url)
+
+
+def fetch_concurrently(
+    urls: Iterable[str],
+    fetch: Callable[[str], Optional[T]],
+    max_workers: Optional[int] = None,
+    per_host_limit: Optional[int] = None,
+) -> Iterator[Tuple[str, Optional[T]]]:
+    """
+    Параллельная загрузка страниц в ограниченном пуле потоков
+
+    Ошибка при обработке одного URL не прерывает обработку остальных:
+    для такого URL возвращается None.
+
+    Args:
+        urls: URL для загрузки
+        fetch: Функция загрузки и разбора одной страницы
+        max_workers: Размер пула потоков (1 - последовательный режим)
+        per_host_limit: Максимум одновременных запросов к одному хосту
+
+    Returns:
+        Итератор пар (URL, результат) в порядке завершения загрузки
+    """
+    if max_workers is None:
+        max_workers = settings.SCRAPING_CONCURRENCY
+    if per_host_limit is None:
+        per_host_limit = settings.SCRAPING_PER_HOST_CONCURRENCY
+
+    def safe_fetch(url: str) -> Optional[T]:
+        try:
+            return fetch(url)
+        except Exception as e:
+            logger.error(f"Error fetching {url}: {str(e)}")
+            return None
+
+    if max_workers <= 1:
+        for url in urls:
+            yield url, safe_fetch(url)
+        return
+
+    limiter = HostLimiter(per_host_limit)
+    # URL читаются из итератора по мере освобождения потоков, поэтому
+    # в памяти одновременно находится не больше max_in_flight страниц
+    max_in_flight = max_workers * 2
+    urls = iter(urls)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {
+            executor.submit(limiter.call, url, safe_fetch): url
+            for url in islice(urls, max_in_flight)
+        }
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield pending.pop(future), future.result()
+            for url in islice(urls, len(done)):
+                pending[executor.submit(limiter.call, url, safe_fetch)] = url
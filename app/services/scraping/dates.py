@@ -0,0 +1,266 @@
+from typing import Dict, Optional, Tuple
+from datetime import date, datetime, time, timedelta, timezone, tzinfo
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+import logging
+import re
+import threading
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Часовой пояс, в котором указано время событий без явного пояса
+LOCAL_TIMEZONE = ZoneInfo(settings.SCRAPING_LOCAL_TIMEZONE)
+
+_MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+
+# Сокращения часовых поясов США. Общие названия (PT, ET) учитывают летнее
+# время по дате события, явные (PST, PDT) задают фиксированное смещение
+_TIMEZONES: Dict[str, tzinfo] = {
+    "PT": ZoneInfo("America/Los_Angeles"),
+    "PST": timezone(timedelta(hours=-8)),
+    "PDT": timezone(timedelta(hours=-7)),
+    "MT": ZoneInfo("America/Denver"),
+    "MST": timezone(timedelta(hours=-7)),
+    "MDT": timezone(timedelta(hours=-6)),
+    "CT": ZoneInfo("America/Chicago"),
+    "CST": timezone(timedelta(hours=-6)),
+    "CDT": timezone(timedelta(hours=-5)),
+    "ET": ZoneInfo("America/New_York"),
+    "EST": timezone(timedelta(hours=-5)),
+    "EDT": timezone(timedelta(hours=-4)),
+    "UTC": timezone.utc,
+    "GMT": timezone.utc,
+}
+
+_MONTH_NAME_DATE_RE = re.compile(
+    r"\b(?P<month>jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+"
+    r"(?P<day>\d{1,2})(?:st|nd|rd|th)?,?\s+(?P<year>\d{4})\b",
+    re.IGNORECASE,
+)
+_DAY_MONTH_NAME_DATE_RE = re.compile(
+    r"\b(?P<day>\d{1,2})(?:st|nd|rd|th)?\s+"
+    r"(?P<month>jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?,?\s+(?P<year>\d{4})\b",
+    re.IGNORECASE,
+)
+_NUMERIC_DATE_RE = re.compile(r"\b(?P<month>\d{1,2})/(?P<day>\d{1,2})/(?P<year>\d{4})\b")
+_ISO_DATE_RE = re.compile(r"\b(?P<year>\d{4})-(?P<month>\d{2})-(?P<day>\d{2})\b")
+_TIME_RE = re.compile(
+    r"\b(?P<hour>\d{1,2})(?::(?P<minute>\d{2}))?\s*(?P<ampm>[ap])\.?m\.?(?![a-z])"
+    r"|\b(?P<hour24>[01]?\d|2[0-3]):(?P<minute24>\d{2})\b",
+    re.IGNORECASE,
+)
+_TZ_NAME_RE = re.compile(r"\b(" + "|".join(_TIMEZONES) + r")\b")
+# Смещение пояса: после UTC/GMT («GMT-7», «UTC+05:30») или вплотную за
+# временем в записи ISO («T18:00-07:00», «18:00:00-0700»). Просто «-11:00»
+# после времени - это конец интервала («10:00 AM-11:00 AM», «10:00-11:00»)
+_TZ_OFFSET_RE = re.compile(
+    r"\b(?:UTC|GMT)\s*(?P<sign>[+-])(?P<hours>\d{1,2})(?::?(?P<minutes>\d{2}))?\b"
+    r"|(?:T\d{2}:\d{2}(?::\d{2})?|\b\d{2}:\d{2}:\d{2})(?:\.\d+)?"
+    r"(?P<iso_sign>[+-])(?P<iso_hours>\d{2}):?(?P<iso_minutes>\d{2})\b"
+)
+
+_DATE_PATTERNS = (_MONTH_NAME_DATE_RE, _DAY_MONTH_NAME_DATE_RE, _NUMERIC_DATE_RE, _ISO_DATE_RE)
+
+_failures = 0
+_failures_lock = threading.Lock()
+
+
+def _record_failure(value: str) -> None:
+    global _failures
+    with _failures_lock:
+        _failures += 1
+    logger.warning(f"Could not parse date from {value[:100]!r}")
+
+
+def to_utc(value: datetime, default_tz: Optional[tzinfo] = None) -> datetime:
+    """
+    Перевод даты в UTC
+
+    Args:
+        value: Дата; без часового пояса считается локальной
+        default_tz: Часовой пояс для дат без пояса (по умолчанию SCRAPING_LOCAL_TIMEZONE)
+
+    Returns:
+        Дата в UTC с tzinfo
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=default_tz or LOCAL_TIMEZONE)
+    return value.astimezone(timezone.utc)
+
+
+def _find_date(text: str) -> Optional[Tuple[date, int]]:
+    for pattern in _DATE_PATTERNS:
+        match = pattern.search(text)
+        if not match:
+            continue
+        month = match.group("month")
+        month = _MONTHS[month[:3].lower()] if month.isalpha() else int(month)
+        try:
+            return date(int(match.group("year")), month, int(match.group("day"))), match.end()
+        except ValueError:
+            continue
+    return None
+
+
+def _find_times(text: str) -> Tuple[Optional[time], Optional[time]]:
+    times = []
+    for match in _TIME_RE.finditer(text):
+        if match.group("hour24") is not None:
+            hour, minute = int(match.group("hour24")), int(match.group("minute24"))
+        else:
+            hour, minute = int(match.group("hour")), int(match.group("minute") or 0)
+            if hour > 12:
+                continue
+            hour = hour % 12 + (12 if match.group("ampm").lower() == "p" else 0)
+        if minute > 59:
+            continue
+        times.append(time(hour, minute))
+        if len(times) == 2:
+            break
+    times.extend([None] * (2 - len(times)))
+    return times[0], times[1]
+
+
+def _find_timezone(text: str) -> Optional[tzinfo]:
+    # Смещение ищется первым: в «UTC+05:30» есть и название UTC
+    match = _TZ_OFFSET_RE.search(text)
+    if match:
+        if match.group("sign"):
+            sign, hours, minutes = match.group("sign", "hours", "minutes")
+        else:
+            sign, hours, minutes = match.group("iso_sign", "iso_hours", "iso_minutes")
+        offset = timedelta(hours=int(hours), minutes=int(minutes or 0))
+        return timezone(-offset if sign == "-" else offset)
+    match = _TZ_NAME_RE.search(text)
+    if match:
+        return _TIMEZONES[match.group(1)]
+    return None
+
+
+def parse_iso_datetime(value: str) -> Optional[datetime]:
+    """
+    Разбор даты в формате ISO 8601 (JSON-LD, __NEXT_DATA__, атрибут datetime)
+
+    Args:
+        value: Строка с датой
+
+    Returns:
+        Дата в UTC или None
+    """
+    # Неудачи считаются вне кэша, чтобы учитывался каждый вызов
+    parsed = _parse_iso_datetime(value)
+    if parsed is None:
+        _record_failure(value)
+    return parsed
+
+
+@lru_cache(maxsize=settings.SCRAPING_DATE_CACHE_SIZE)
+def _parse_iso_datetime(value: str) -> Optional[datetime]:
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        # Не чистый ISO 8601 - пробуем общий разбор
+        return _parse_event_datetimes(value)[0]
+    return to_utc(parsed)
+
+
+def parse_event_datetimes(
+    text: str,
+    default_start: Optional[time] = None,
+    default_end: Optional[time] = None,
+) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """
+    Разбор даты и времени события из текста страницы
+
+    Понимает «May 6, 2025 6:00 PM to 8:30 PM PDT», «October 27th, 2025»,
+    «05/15/2025 10:00 AM», «6 May 2025 18:00» и ISO 8601. Время без
+    часового пояса считается временем SCRAPING_LOCAL_TIMEZONE. Если время
+    окончания раньше времени начала, событие заканчивается на следующий день.
+
+    Строки дат повторяются от страницы к странице, поэтому результаты
+    кэшируются (статистика - date_parsing_stats()).
+
+    Args:
+        text: Текст с датой
+        default_start: Время начала, если в тексте указана только дата
+        default_end: Время окончания, если в тексте оно не указано
+
+    Returns:
+        Пара (начало, окончание) в UTC; (None, None), если дату найти не удалось
+    """
+    # Неудачи считаются вне кэша, чтобы учитывался каждый вызов
+    parsed = _parse_event_datetimes(text, default_start, default_end)
+    if parsed == (None, None):
+        _record_failure(text)
+    return parsed
+
+
+@lru_cache(maxsize=settings.SCRAPING_DATE_CACHE_SIZE)
+def _parse_event_datetimes(
+    text: str,
+    default_start: Optional[time] = None,
+    default_end: Optional[time] = None,
+) -> Tuple[Optional[datetime], Optional[datetime]]:
+    try:
+        return to_utc(datetime.fromisoformat(text.strip().replace("Z", "+00:00"))), None
+    except ValueError:
+        pass
+
+    found = _find_date(text)
+    if found is None:
+        return None, None
+
+    event_date, date_end = found
+    start_time, end_time = _find_times(text[date_end:])
+    if start_time is None:
+        start_time, end_time = _find_times(text)
+    start_time = start_time or default_start or time(0, 0)
+    end_time = end_time or default_end
+
+    tz = _find_timezone(text) or LOCAL_TIMEZONE
+    start = to_utc(datetime.combine(event_date, start_time), tz)
+    end = None
+    if end_time is not None:
+        end_date = event_date + timedelta(days=1) if end_time < start_time else event_date
+        end = to_utc(datetime.combine(end_date, end_time), tz)
+    return start, end
+
+
+def date_parsing_stats() -> Dict[str, float]:
+    """
+    Статистика кэша разбора дат
+
+    Returns:
+        Попадания, промахи, доля попаданий, размер кэша и число строк,
+        которые не удалось разобрать
+    """
+    hits = misses = size = 0
+    for func in (_parse_event_datetimes, _parse_iso_datetime):
+        info = func.cache_info()
+        hits += info.hits
+        misses += info.misses
+        size += info.currsize
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / total if total else 0.0,
+        "size": size,
+        "failures": _failures,
+    }
+
+
+def clear_date_cache() -> None:
+    """
+    Очистка кэша и статистики разбора дат
+    """
+    global _failures
+    _parse_event_datetimes.cache_clear()
+    _parse_iso_datetime.cache_clear()
+    with _failures_lock:
+        _failures = 0
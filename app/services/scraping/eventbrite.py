@@ -1,319 +1,107 @@
-from typing import Dict, List, Optional
-import requests
+from typing import Any, Dict, Iterable, Optional, Tuple
 from bs4 import BeautifulSoup
-from datetime import datetime, timedelta
+from datetime import datetime
 import logging
-import re
-import json
 
-from app.db.session import SessionLocal
-from app.models.models import Source, Event, ScrapingLog
+from app.services.scraping.base import DEFAULT_DAYS_AHEAD, BaseScraper
+from app.services.scraping.dates import parse_event_datetimes
+from app.services.scraping.parsing import SelectorStrainer
+from app.services.scraping.registry import register_scraper
 
 logger = logging.getLogger(__name__)
 
-class EventbriteScraper:
+@register_scraper
+class EventbriteScraper(BaseScraper):
     """
     Скрапер для сбора данных о событиях с Eventbrite
     """
-    
+
+    source_type = "eventbrite"
+    source_name = "Eventbrite"
+    source_url = "https://www.eventbrite.com"
+    base_url = "https://www.eventbrite.com"
+
+    listing_parse_only = SelectorStrainer(['.search-event-card-wrapper'])
+    detail_parse_only = SelectorStrainer(['h1', '.event-details__data', '.location-info__address', '.event-description', '.eds-text--left', '.organizer-name'])
+
     def __init__(self):
-        self.base_url = "https://www.eventbrite.com"
+        super().__init__()
         self.search_url = f"{self.base_url}/d/united-states--silicon-valley/events/"
-        self.headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-            "Accept-Language": "en-US,en;q=0.9",
-        }
-        self.db = SessionLocal()
-        
-    def __del__(self):
-        self.db.close()
-    
-    def search_events(self, days_ahead: int = 30) -> List[Dict]:
+
+    def listing_requests(self, days_ahead: int = DEFAULT_DAYS_AHEAD) -> Iterable[Tuple[str, Optional[Dict[str, Any]]]]:
         """
-        Поиск событий в Кремниевой долине
-        
+        Страницы со списком событий в Кремниевой долине (параметр page)
+
         Args:
             days_ahead: Количество дней вперед для поиска событий
-            
+
         Returns:
-            Список словарей с информацией о событиях
+            Пары (URL, параметры запроса)
         """
-        events = []
-        
-        try:
-            # Создаем лог скрейпинга
-            source = self.db.query(Source).filter(Source.type == "eventbrite").first()
-            if not source:
-                source = Source(
-                    name="Eventbrite",
-                    url="https://www.eventbrite.com",
-                    type="eventbrite",
-                    status="active"
-                )
-                self.db.add(source)
-                self.db.commit()
-                self.db.refresh(source)
-            
-            scraping_log = ScrapingLog(
-                source_id=source.source_id,
-                status="running",
-                message="Started scraping Eventbrite"
-            )
-            self.db.add(scraping_log)
-            self.db.commit()
-            self.db.refresh(scraping_log)
-            
-            start_time = datetime.utcnow()
-            
-            # Выполняем запрос
-            response = requests.get(self.search_url, headers=self.headers)
-            response.raise_for_status()
-            
-            # Парсим HTML
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Находим все карточки событий
-            event_cards = soup.select('.search-event-card-wrapper')
-            
-            for card in event_cards:
-                try:
-                    # Извлекаем данные о событии
-                    event_url_elem = card.select_one('a.event-card-link')
-                    if not event_url_elem:
-                        event_url_elem = card.select_one('a[href*="/e/"]')
-                    
-                    event_url = event_url_elem['href'] if event_url_elem else None
-                    
-                    if not event_url:
-                        continue
-                    
-                    # Формируем полный URL события
-                    if not event_url.startswith('http'):
-                        event_url = f"{self.base_url}{event_url}"
-                    
-                    # Получаем детальную информацию о событии
-                    event_data = self._get_event_details(event_url)
-                    
-                    if event_data:
-                        events.append(event_data)
-                        
-                        # Сохраняем событие в базу данных
-                        self._save_event(event_data, source.source_id)
-                
-                except Exception as e:
-                    logger.error(f"Error processing event card: {str(e)}")
-            
-            # Обновляем лог скрейпинга
-            execution_time = (datetime.utcnow() - start_time).total_seconds()
-            scraping_log.status = "success"
-            scraping_log.message = f"Successfully scraped {len(events)} events from Eventbrite"
-            scraping_log.events_found = len(events)
-            scraping_log.execution_time = execution_time
-            self.db.commit()
-            
-            # Обновляем источник
-            source.last_checked = datetime.utcnow()
-            self.db.commit()
-            
-            return events
-            
-        except Exception as e:
-            logger.error(f"Error scraping Eventbrite: {str(e)}")
-            
-            if 'scraping_log' in locals():
-                scraping_log.status = "error"
-                scraping_log.message = f"Error scraping Eventbrite: {str(e)}"
-                self.db.commit()
-            
-            return []
-    
-    def _get_event_details(self, event_url: str) -> Optional[Dict]:
+        for page in self.listing_pages():
+            yield self.search_url, {"page": page} if page > 1 else None
+
+    def extract_cards(self, soup: BeautifulSoup) -> Iterable[Any]:
+        return soup.select('.search-event-card-wrapper')
+
+    def extract_card_url(self, card: Any) -> Optional[str]:
+        event_url_elem = card.select_one('a.event-card-link')
+        if not event_url_elem:
+            event_url_elem = card.select_one('a[href*="/e/"]')
+        return event_url_elem['href'] if event_url_elem else None
+
+    def extract_card_date(self, card: Any) -> Optional[datetime]:
+        date_elem = card.select_one('.event-card-date')
+        return parse_event_datetimes(date_elem.text.strip())[0] if date_elem else None
+
+    def extract_event(self, soup: BeautifulSoup, event_url: str) -> Optional[Dict]:
         """
-        Получение детальной информации о событии
-        
+        Извлечение детальной информации о событии из разметки страницы
+
+        Используется, если на странице нет полного JSON-LD события
+        (см. structured_data.extract_structured_event).
+
         Args:
+            soup: Разобранная страница события
             event_url: URL события
-            
+
         Returns:
-            Словарь с информацией о событии или None в случае ошибки
-        """
-        try:
-            response = requests.get(event_url, headers=self.headers)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Попытка извлечь данные из JSON-LD
-            json_ld = None
-            script_tags = soup.select('script[type="application/ld+json"]')
-            for script in script_tags:
-                try:
-                    data = json.loads(script.string)
-                    if isinstance(data, dict) and data.get('@type') == 'Event':
-                        json_ld = data
-                        break
-                except:
-                    continue
-            
-            # Извлекаем название события
-            if json_ld and 'name' in json_ld:
-                title = json_ld['name']
-            else:
-                title_elem = soup.select_one('h1.event-title')
-                if not title_elem:
-                    title_elem = soup.select_one('h1')
-                title = title_elem.text.strip() if title_elem else "Unknown Event"
-            
-            # Извлекаем дату и время события
-            start_datetime = None
-            end_datetime = None
-            
-            if json_ld:
-                if 'startDate' in json_ld:
-                    try:
-                        start_datetime = datetime.fromisoformat(json_ld['startDate'].replace('Z', '+00:00'))
-                    except:
-                        pass
-                
-                if 'endDate' in json_ld:
-                    try:
-                        end_datetime = datetime.fromisoformat(json_ld['endDate'].replace('Z', '+00:00'))
-                    except:
-                        pass
-            
-            if not start_datetime:
-                date_elem = soup.select_one('.event-details__data')
-                date_str = date_elem.text.strip() if date_elem else ""
-                
-                if date_str:
-                    # Примерная логика парсинга даты
-                    try:
-                        # Различные форматы дат
-                        date_patterns = [
-                            r'(\w+ \d+, \d{4} \d+:\d+ [AP]M)',
-                            r'(\d{2}/\d{2}/\d{4} \d+:\d+ [AP]M)'
-                        ]
-                        
-                        for pattern in date_patterns:
-                            date_match = re.search(pattern, date_str)
-                            if date_match:
-                                date_part = date_match.group(1)
-                                try:
-                                    start_datetime = datetime.strptime(date_part, "%B %d, %Y %I:%M %p")
-                                    break
-                                except ValueError:
-                                    try:
-                                        start_datetime = datetime.strptime(date_part, "%m/%d/%Y %I:%M %p")
-                                        break
-                                    except ValueError:
-                                        pass
-                    except:
-                        pass
-            
-            # Если не удалось распарсить дату, используем текущую дату
-            if not start_datetime:
-                start_datetime = datetime.utcnow()
-            
-            if not end_datetime and start_datetime:
-                end_datetime = start_datetime + timedelta(hours=2)
-            
-            # Извлекаем локацию
-            location = "Unknown Location"
-            is_virtual = False
-            
-            if json_ld:
-                if 'location' in json_ld:
-                    if isinstance(json_ld['location'], dict):
-                        if '@type' in json_ld['location'] and json_ld['location']['@type'] == 'VirtualLocation':
-                            location = "Online"
-                            is_virtual = True
-                        elif 'name' in json_ld['location']:
-                            location = json_ld['location']['name']
-                    elif isinstance(json_ld['location'], str):
-                        location = json_ld['location']
-                
-                # Проверяем, является ли событие виртуальным
-                if not is_virtual:
-                    is_virtual = 'online' in location.lower() or 'virtual' in location.lower()
-            
-            if location == "Unknown Location":
-                location_elem = soup.select_one('.location-info__address')
-                if location_elem:
-                    location = location_elem.text.strip()
-                    is_virtual = 'online' in location.lower() or 'virtual' in location.lower()
-            
-            # Извлекаем описание
-            description = ""
-            
-            if json_ld and 'description' in json_ld:
-                description = json_ld['description']
-            else:
-                description_elem = soup.select_one('.event-description')
-                if not description_elem:
-                    description_elem = soup.select_one('.eds-text--left')
-                description = description_elem.text.strip() if description_elem else ""
-            
-            # Извлекаем организатора
-            organizer = "Unknown Organizer"
-            
-            if json_ld and 'organizer' in json_ld:
-                if isinstance(json_ld['organizer'], dict) and 'name' in json_ld['organizer']:
-                    organizer = json_ld['organizer']['name']
-            else:
-                organizer_elem = soup.select_one('.organizer-name')
-                organizer = organizer_elem.text.strip() if organizer_elem else "Unknown Organizer"
-            
-            # Формируем данные о событии
-            event_data = {
-                "name": title,
-                "description": description,
-                "start_datetime_utc": start_datetime,
-                "end_datetime_utc": end_datetime,
-                "location_text": location,
-                "is_virtual": is_virtual,
-                "virtual_url": event_url if is_virtual else None,
-                "original_url": event_url,
-                "organizer": organizer
-            }
-            
-            return event_data
-            
-        except Exception as e:
-            logger.error(f"Error getting event details from {event_url}: {str(e)}")
-            return None
-    
-    def _save_event(self, event_data: Dict, source_id: int) -> None:
+            Словарь с информацией о событии
         """
-        Сохранение события в базу данных
-        
-        Args:
-            event_data: Данные о событии
-            source_id: ID источника
-        """
-        try:
-            # Проверяем, существует ли уже событие с таким URL
-            existing_event = self.db.query(Event).filter(
-                Event.original_url == event_data["original_url"]
-            ).first()
-            
-            if existing_event:
-                # Обновляем существующее событие
-                for key, value in event_data.items():
-                    setattr(existing_event, key, value)
-                
-                self.db.commit()
-                logger.info(f"Updated existing event: {event_data['name']}")
-            else:
-                # Создаем новое событие
-                new_event = Event(
-                    source_id=source_id,
-                    **event_data
-                )
-                
-                self.db.add(new_event)
-                self.db.commit()
-                logger.info(f"Added new event: {event_data['name']}")
-                
-        except Exception as e:
-            self.db.rollback()
-            logger.error(f"Error saving event to database: {str(e)}")
+        # Извлекаем название события
+        title_elem = soup.select_one('h1.event-title')
+        if not title_elem:
+            title_elem = soup.select_one('h1')
+        title = title_elem.text.strip() if title_elem else "Unknown Event"
+
+        # Извлекаем дату и время события
+        date_elem = soup.select_one('.event-details__data')
+        date_str = date_elem.text.strip() if date_elem else ""
+        start_datetime, end_datetime = parse_event_datetimes(date_str)
+
+        # Извлекаем локацию
+        location = "Unknown Location"
+        location_elem = soup.select_one('.location-info__address')
+        if location_elem:
+            location = location_elem.text.strip()
+
+        # Извлекаем описание
+        description_elem = soup.select_one('.event-description')
+        if not description_elem:
+            description_elem = soup.select_one('.eds-text--left')
+        description = description_elem.text.strip() if description_elem else ""
+
+        # Извлекаем организатора
+        organizer_elem = soup.select_one('.organizer-name')
+        organizer = organizer_elem.text.strip() if organizer_elem else "Unknown Organizer"
+
+        # Формируем данные о событии
+        return {
+            "name": title,
+            "description": description,
+            "start_datetime_utc": start_datetime,
+            "end_datetime_utc": end_datetime,
+            "location_text": location,
+            "original_url": event_url,
+            "organizer": organizer
+        }
@@ -0,0 +1,213 @@
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from datetime import timedelta
+from itertools import islice
+import logging
+
+from sqlalchemy import case, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.models import CrawlTask
+
+logger = logging.getLogger(__name__)
+
+
+class LeasedTask(NamedTuple):
+    task_id: int
+    source_id: int
+    url: str
+    listing_fingerprint: Optional[str]
+    attempts: int
+
+
+class CrawlFrontier:
+    """
+    Очередь страниц событий в Postgres, общая для всех воркеров
+
+    URL уникальны: повторная постановка в очередь ожидающей или взятой
+    в работу страницы ничего не меняет. Воркер берет задачи в аренду
+    (SELECT ... FOR UPDATE SKIP LOCKED), поэтому несколько процессов на
+    разных машинах не получают одну и ту же страницу. Если воркер упал и
+    аренда истекла, задача возвращается в очередь.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.max_attempts = settings.SCRAPING_FRONTIER_MAX_ATTEMPTS
+        self.retry_delay = settings.SCRAPING_FRONTIER_RETRY_DELAY_SECONDS
+
+    def enqueue(self, source_id: int, urls: Iterable[Tuple[str, Optional[str]]], priority: int = 0) -> int:
+        """
+        Постановка страниц событий в очередь
+
+        Args:
+            source_id: ID источника
+            urls: Пары (URL события, отпечаток карточки)
+            priority: Приоритет (чем больше, тем раньше загружается)
+
+        Returns:
+            Количество новых или возвращенных в очередь задач
+        """
+        queued = 0
+        urls = iter(urls)
+        while True:
+            chunk = dict(islice(urls, settings.SCRAPING_DB_BATCH_SIZE))
+            if not chunk:
+                return queued
+
+            rows = [
+                {"source_id": source_id, "url": url, "priority": priority, "listing_fingerprint": fingerprint}
+                for url, fingerprint in chunk.items()
+            ]
+            stmt = insert(CrawlTask).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[CrawlTask.url],
+                set_={
+                    "status": "pending",
+                    "priority": stmt.excluded.priority,
+                    "listing_fingerprint": stmt.excluded.listing_fingerprint,
+                    "attempts": 0,
+                    "available_at": func.now(),
+                    "last_error": None,
+                    "updated_at": func.now(),
+                },
+                # Ожидающие и взятые в работу страницы не дублируются
+                where=CrawlTask.status.in_(("done", "failed")),
+            ).returning(CrawlTask.task_id)
+
+            queued += len(self.db.execute(stmt).all())
+            self.db.commit()
+
+    def requeue_expired(self) -> int:
+        """
+        Возврат в очередь задач упавших воркеров (аренда истекла)
+
+        Задачи, исчерпавшие число попыток, помечаются как 'failed'.
+
+        Returns:
+            Количество возвращенных в очередь задач
+        """
+        stmt = (
+            update(CrawlTask)
+            .where(CrawlTask.status == "leased", CrawlTask.lease_expires_at < func.now())
+            .values(
+                status=case((CrawlTask.attempts >= self.max_attempts, "failed"), else_="pending"),
+                lease_owner=None,
+                lease_expires_at=None,
+                last_error="lease expired",
+                updated_at=func.now(),
+            )
+            .returning(CrawlTask.status)
+        )
+        statuses = [row.status for row in self.db.execute(stmt)]
+        self.db.commit()
+
+        requeued = sum(1 for status in statuses if status == "pending")
+        if statuses:
+            logger.warning(f"Requeued {requeued} expired crawl tasks, {len(statuses) - requeued} failed")
+        return requeued
+
+    def lease(self, worker_id: str, limit: int, lease_seconds: int) -> List[LeasedTask]:
+        """
+        Получение задач в аренду
+
+        Args:
+            worker_id: Идентификатор воркера
+            limit: Максимальное количество задач
+            lease_seconds: Длительность аренды
+
+        Returns:
+            Список задач в порядке приоритета
+        """
+        self.requeue_expired()
+
+        candidates = (
+            select(CrawlTask.task_id)
+            .where(CrawlTask.status == "pending", CrawlTask.available_at <= func.now())
+            .order_by(CrawlTask.priority.desc(), CrawlTask.task_id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(CrawlTask)
+            .where(CrawlTask.task_id.in_(candidates))
+            .values(
+                status="leased",
+                lease_owner=worker_id,
+                lease_expires_at=func.now() + timedelta(seconds=lease_seconds),
+                attempts=CrawlTask.attempts + 1,
+                updated_at=func.now(),
+            )
+            .returning(
+                CrawlTask.task_id,
+                CrawlTask.source_id,
+                CrawlTask.url,
+                CrawlTask.listing_fingerprint,
+                CrawlTask.attempts,
+                CrawlTask.priority,
+            )
+        )
+        rows = self.db.execute(stmt).all()
+        self.db.commit()
+
+        rows.sort(key=lambda row: (-row.priority, row.task_id))
+        return [
+            LeasedTask(row.task_id, row.source_id, row.url, row.listing_fingerprint, row.attempts)
+            for row in rows
+        ]
+
+    def complete(self, worker_id: str, task_ids: List[int]) -> None:
+        """
+        Отметка задач как выполненных
+
+        Args:
+            worker_id: Идентификатор воркера
+            task_ids: ID задач
+        """
+        if not task_ids:
+            return
+        self.db.execute(
+            update(CrawlTask)
+            # Задачу, аренда которой истекла и перешла к другому воркеру, не трогаем
+            .where(CrawlTask.task_id.in_(task_ids), CrawlTask.lease_owner == worker_id)
+            .values(status="done", lease_owner=None, lease_expires_at=None, last_error=None, updated_at=func.now())
+        )
+        self.db.commit()
+
+    def fail(self, worker_id: str, task_ids: List[int], error: str) -> None:
+        """
+        Возврат задач в очередь после ошибки с задержкой, растущей с числом попыток
+
+        Задачи, исчерпавшие число попыток, помечаются как 'failed'.
+
+        Args:
+            worker_id: Идентификатор воркера
+            task_ids: ID задач
+            error: Описание ошибки
+        """
+        if not task_ids:
+            return
+        self.db.execute(
+            update(CrawlTask)
+            .where(CrawlTask.task_id.in_(task_ids), CrawlTask.lease_owner == worker_id)
+            .values(
+                status=case((CrawlTask.attempts >= self.max_attempts, "failed"), else_="pending"),
+                available_at=func.now() + CrawlTask.attempts * timedelta(seconds=self.retry_delay),
+                lease_owner=None,
+                lease_expires_at=None,
+                last_error=error,
+                updated_at=func.now(),
+            )
+        )
+        self.db.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Количество задач по статусам
+
+        Returns:
+            Словарь {статус: количество}
+        """
+        rows = self.db.query(CrawlTask.status, func.count(CrawlTask.task_id)).group_by(CrawlTask.status).all()
+        return {status: count for status, count in rows}
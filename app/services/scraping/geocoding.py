@@ -0,0 +1,266 @@
+from typing import Dict, Iterable, List, Optional, Protocol, Tuple
+from datetime import datetime, timezone
+import csv
+import logging
+import os
+import re
+import unicodedata
+
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.models import GeocodeCache
+
+logger = logging.getLogger(__name__)
+
+# Встроенный справочник мест и городов Кремниевой долины
+DEFAULT_GAZETTEER_PATH = os.path.join(os.path.dirname(__file__), "gazetteer.csv")
+
+# Длина колонки geocode_cache.address_key
+MAX_ADDRESS_KEY_LENGTH = 512
+
+Coordinates = Tuple[float, float]
+
+_SEPARATOR_RE = re.compile(r"[^\w,]+", re.UNICODE)
+_COMMA_RE = re.compile(r"\s*,[\s,]*")
+
+
+class Geocoder(Protocol):
+    """
+    Бэкенд геокодирования: по нормализованному адресу возвращает
+    координаты (широта, долгота) или None, если адрес не найден.
+    Исключение означает временную ошибку - такой адрес не кэшируется
+    """
+    name: str
+
+    def geocode(self, address_key: str) -> Optional[Coordinates]:
+        ...
+
+
+def normalize_address(text: str) -> str:
+    """
+    Ключ адреса для кэша: регистр, пунктуация и пробелы не различаются
+
+    Args:
+        text: Место проведения события, как оно указано на странице
+
+    Returns:
+        Нормализованный адрес, например 'computer history museum, mountain view, ca'
+    """
+    text = unicodedata.normalize("NFKC", text).lower()
+    text = _SEPARATOR_RE.sub(" ", text)
+    text = _COMMA_RE.sub(", ", text).strip(" ,")
+    return text[:MAX_ADDRESS_KEY_LENGTH]
+
+
+def address_candidates(address_key: str) -> List[str]:
+    """
+    Варианты поиска адреса в справочнике: адрес целиком, затем его части
+    через запятую (место, улица, город)
+
+    Args:
+        address_key: Нормализованный адрес
+
+    Returns:
+        Список вариантов в порядке убывания точности
+    """
+    parts = [part for part in address_key.split(", ") if part]
+    return [address_key] + [part for part in parts if part != address_key]
+
+
+class GazetteerGeocoder:
+    """
+    Офлайн-геокодер по локальному справочнику CSV с колонками address, lat, lon
+    """
+    name = "gazetteer"
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or DEFAULT_GAZETTEER_PATH
+        self.places: Dict[str, Coordinates] = {}
+        with open(self.path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                self.places[normalize_address(row["address"])] = (float(row["lat"]), float(row["lon"]))
+
+    def geocode(self, address_key: str) -> Optional[Coordinates]:
+        for candidate in address_candidates(address_key):
+            if candidate in self.places:
+                return self.places[candidate]
+        return None
+
+
+class StubGeocoder:
+    """
+    Заглушка на месте HTTP-геокодера: отвечает из переданного словаря
+    адресов и считает обращения. Без словаря не находит ни одного адреса
+    """
+    name = "stub"
+
+    def __init__(self, places: Optional[Dict[str, Coordinates]] = None):
+        self.places = {normalize_address(address): coords for address, coords in (places or {}).items()}
+        self.requests = 0
+
+    def geocode(self, address_key: str) -> Optional[Coordinates]:
+        self.requests += 1
+        return self.places.get(address_key)
+
+
+def create_geocoder() -> Geocoder:
+    """
+    Создание геокодера по настройкам
+
+    Returns:
+        Геокодер из SCRAPING_GEOCODER
+    """
+    name = settings.SCRAPING_GEOCODER
+    if name == "gazetteer":
+        return GazetteerGeocoder(settings.SCRAPING_GEOCODER_GAZETTEER_PATH)
+    if name == "stub":
+        return StubGeocoder()
+    raise ValueError(f"Unknown geocoder: {name}")
+
+
+class GeocodingStage:
+    """
+    Этап конвейера, заполняющий координаты событий по location_text
+
+    Адреса нормализуются и ищутся в таблице geocode_cache одним запросом
+    на пакет событий; геокодер вызывается только для адресов, которых в
+    кэше нет, и его ответ (в том числе "не найдено") сохраняется навсегда.
+    Онлайн-события и события, у которых координаты уже есть, пропускаются.
+    Число попаданий в кэш, промахов и ошибок геокодера накапливается в
+    атрибутах `hits`, `misses` и `failures`.
+    """
+
+    def __init__(self, db: Session, geocoder: Geocoder):
+        self.db = db
+        self.geocoder = geocoder
+        self.hits = 0
+        self.misses = 0
+        self.failures = 0
+
+    def apply(self, rows: Iterable[Dict]) -> None:
+        """
+        Заполнение location_lat/location_lon у событий пакета
+
+        Изменения кэша записываются в текущей транзакции сессии и
+        фиксируются вместе с пакетом событий.
+
+        Args:
+            rows: Данные о событиях
+        """
+        pending: Dict[str, List[Dict]] = {}
+        for row in rows:
+            if row.get("is_virtual") or row.get("location_lat") is not None:
+                continue
+            address_key = normalize_address(row.get("location_text") or "")
+            if address_key:
+                pending.setdefault(address_key, []).append(row)
+
+        if not pending:
+            return
+
+        for address_key, coords in self.resolve(list(pending)).items():
+            if coords:
+                for row in pending[address_key]:
+                    row["location_lat"], row["location_lon"] = coords
+
+    def resolve(self, address_keys: List[str]) -> Dict[str, Optional[Coordinates]]:
+        """
+        Координаты нормализованных адресов: из кэша или от геокодера
+
+        Args:
+            address_keys: Различные нормализованные адреса
+
+        Returns:
+            Словарь адрес -> координаты (None - адрес не найден); адреса,
+            на которых геокодер упал, в словарь не попадают
+        """
+        cached = {
+            row.address_key: (row.location_lat, row.location_lon) if row.location_lat is not None else None
+            for row in self.db.execute(
+                select(GeocodeCache.address_key, GeocodeCache.location_lat, GeocodeCache.location_lon)
+                .where(GeocodeCache.address_key.in_(address_keys))
+            )
+        }
+        if cached:
+            self.hits += len(cached)
+            self.db.execute(
+                update(GeocodeCache)
+                .where(GeocodeCache.address_key.in_(list(cached)))
+                .values(hits=GeocodeCache.hits + 1, last_hit_at=datetime.now(timezone.utc))
+            )
+
+        resolved = dict(cached)
+        new_rows = []
+        for address_key in address_keys:
+            if address_key in cached:
+                continue
+            self.misses += 1
+            try:
+                coords = self.geocoder.geocode(address_key)
+            except Exception as e:
+                self.failures += 1
+                logger.warning(f"Geocoder {self.geocoder.name} failed for {address_key!r}: {str(e)}")
+                continue
+            resolved[address_key] = coords
+            new_rows.append({
+                "address_key": address_key,
+                "location_lat": coords[0] if coords else None,
+                "location_lon": coords[1] if coords else None,
+                "provider": self.geocoder.name,
+                "hits": 0,
+                "created_at": datetime.now(timezone.utc),
+            })
+
+        # Тот же адрес мог одновременно добавить другой воркер
+        if new_rows:
+            self.db.execute(insert(GeocodeCache).values(new_rows).on_conflict_do_nothing(
+                index_elements=[GeocodeCache.address_key]
+            ))
+        return resolved
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Статистика кэша геокодирования
+
+        Returns:
+            Словарь с hits, misses, failures и hit_rate (доля адресов из кэша)
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "failures": self.failures,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+def create_geocoding_stage(db: Session) -> Optional[GeocodingStage]:
+    """
+    Этап геокодирования по настройкам
+
+    Args:
+        db: Сессия БД
+
+    Returns:
+        GeocodingStage или None, если геокодирование отключено
+    """
+    if not settings.SCRAPING_GEOCODING_ENABLED:
+        return None
+    return GeocodingStage(db, create_geocoder())
+
+
+def log_geocoding_stats(stage: GeocodingStage) -> None:
+    """
+    Запись статистики кэша геокодирования в лог
+
+    Args:
+        stage: Этап геокодирования
+    """
+    stats = stage.stats()
+    logger.info(
+        f"Geocode cache: {stats['hits']} hits, {stats['misses']} misses "
+        f"({stats['hit_rate']:.0%}), {stats['failures']} geocoder errors"
+    )
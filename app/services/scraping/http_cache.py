@@ -0,0 +1,257 @@
+from typing import Dict, NamedTuple, Optional
+from datetime import datetime
+import gzip
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Время последнего обращения к записи обновляется не чаще раза в столько
+# секунд: для вытеснения LRU точнее не нужно, а каждая запись в индекс
+# блокирует его для остальных процессов
+ACCESS_UPDATE_INTERVAL = 60
+
+
+class CacheEntry(NamedTuple):
+    url: str
+    source: Optional[str]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    body_hash: str
+    encoding: Optional[str]
+    size: int
+    stored_at: float
+
+
+class HttpCache:
+    """
+    Дисковый кэш HTTP-ответов для скраперов
+
+    Хранит тело ответа (в gzip), ETag, Last-Modified и хэш тела.
+    Индекс записей ведется в SQLite, при превышении лимита размера
+    удаляются давно не использованные записи (LRU). Индекс общий для
+    процессов планировщика и воркеров, поэтому он работает в режиме WAL:
+    чтения не ждут записей, а записи ждут друг друга до 30 секунд.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int,
+        default_ttl: int = 0,
+        source_ttls: Optional[Dict[str, int]] = None,
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.source_ttls = source_ttls or {}
+        self._lock = threading.Lock()
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._conn = sqlite3.connect(
+            os.path.join(self.directory, "index.sqlite3"),
+            timeout=30,
+            check_same_thread=False,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                url TEXT PRIMARY KEY,
+                source TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                body_hash TEXT NOT NULL,
+                encoding TEXT,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_entries_accessed_at ON entries (accessed_at)")
+        self._conn.commit()
+
+    @staticmethod
+    def _now() -> float:
+        return datetime.utcnow().timestamp()
+
+    def _body_path(self, url: str) -> str:
+        return os.path.join(self.directory, hashlib.sha1(url.encode()).hexdigest() + ".gz")
+
+    def ttl_for(self, source: Optional[str]) -> int:
+        """
+        Время жизни записи для источника
+
+        Args:
+            source: Тип источника ('meetup', 'eventbrite', ...)
+
+        Returns:
+            TTL в секундах
+        """
+        return self.source_ttls.get(source, self.default_ttl)
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """
+        Получение записи кэша по URL
+
+        Args:
+            url: URL запроса
+
+        Returns:
+            Запись кэша или None, если ее нет
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, source, etag, last_modified, body_hash, encoding, size, stored_at, accessed_at "
+                "FROM entries WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if not row:
+                return None
+            if not os.path.exists(self._body_path(url)):
+                self._conn.execute("DELETE FROM entries WHERE url = ?", (url,))
+                self._conn.commit()
+                return None
+            now = self._now()
+            if now - row[-1] >= ACCESS_UPDATE_INTERVAL:
+                self._conn.execute("UPDATE entries SET accessed_at = ? WHERE url = ?", (now, url))
+                self._conn.commit()
+            return CacheEntry(*row[:-1])
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """
+        Проверка, можно ли использовать запись без обращения к серверу
+
+        Args:
+            entry: Запись кэша
+
+        Returns:
+            True, если TTL источника еще не истек
+        """
+        return self._now() - entry.stored_at < self.ttl_for(entry.source)
+
+    def read_body(self, entry: CacheEntry) -> Optional[bytes]:
+        """
+        Чтение тела ответа из кэша
+
+        Args:
+            entry: Запись кэша
+
+        Returns:
+            Тело ответа или None, если файл поврежден
+        """
+        try:
+            with gzip.open(self._body_path(entry.url), "rb") as f:
+                return f.read()
+        except (OSError, EOFError) as e:
+            logger.warning(f"Corrupted cache entry for {entry.url}: {str(e)}")
+            return None
+
+    def is_changed(self, url: str, body: bytes) -> bool:
+        """
+        Отличается ли тело ответа от сохраненного (без записи в кэш)
+
+        Args:
+            url: URL запроса
+            body: Тело ответа
+
+        Returns:
+            True, если записи нет или хэш тела другой
+        """
+        body_hash = hashlib.sha256(body).hexdigest()
+        with self._lock:
+            row = self._conn.execute("SELECT body_hash FROM entries WHERE url = ?", (url,)).fetchone()
+        return not row or row[0] != body_hash
+
+    def store(
+        self,
+        url: str,
+        body: bytes,
+        source: Optional[str] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        encoding: Optional[str] = None,
+    ) -> bool:
+        """
+        Сохранение ответа в кэш
+
+        Args:
+            url: URL запроса
+            body: Тело ответа
+            source: Тип источника
+            etag: Заголовок ETag
+            last_modified: Заголовок Last-Modified
+            encoding: Кодировка тела ответа
+
+        Returns:
+            True, если содержимое изменилось по сравнению с прежней записью
+        """
+        body_hash = hashlib.sha256(body).hexdigest()
+        now = self._now()
+
+        with self._lock:
+            row = self._conn.execute("SELECT body_hash FROM entries WHERE url = ?", (url,)).fetchone()
+            changed = not row or row[0] != body_hash
+
+            if changed:
+                with gzip.open(self._body_path(url), "wb") as f:
+                    f.write(body)
+
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries "
+                "(url, source, etag, last_modified, body_hash, encoding, size, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, source, etag, last_modified, body_hash, encoding,
+                 os.path.getsize(self._body_path(url)), now, now),
+            )
+            self._conn.commit()
+            self._evict()
+
+        return changed
+
+    def touch(self, url: str) -> None:
+        """
+        Продление записи после ответа 304 Not Modified
+
+        Args:
+            url: URL запроса
+        """
+        now = self._now()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE entries SET stored_at = ?, accessed_at = ? WHERE url = ?",
+                (now, now, url),
+            )
+            self._conn.commit()
+
+    def total_size(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def _evict(self) -> None:
+        """
+        Удаление давно не использованных записей сверх лимита размера
+        """
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute("SELECT url, size FROM entries ORDER BY accessed_at").fetchall()
+        for url, size in rows:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(self._body_path(url))
+            except FileNotFoundError:
+                pass
+            self._conn.execute("DELETE FROM entries WHERE url = ?", (url,))
+            total -= size
+        self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
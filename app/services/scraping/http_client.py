@@ -0,0 +1,316 @@
+from typing import Dict, Optional
+from urllib.parse import urlparse
+import functools
+import logging
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+
+from app.core.config import settings
+from app.services.scraping.http_cache import CacheEntry, HttpCache
+from app.services.scraping.rate_limit import (
+    THROTTLE_STATUS_CODES,
+    RateLimiter,
+    create_rate_limiter,
+    parse_retry_after,
+)
+
+logger = logging.getLogger(__name__)
+
+# urllib3 умеет распаковывать brotli только при установленном пакете brotli/brotlicffi
+try:
+    import brotli  # noqa: F401
+    _ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        _ACCEPT_ENCODING = "gzip, deflate, br"
+    except ImportError:
+        _ACCEPT_ENCODING = "gzip, deflate"
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class HttpClient:
+    """
+    Общий HTTP-клиент для скраперов с пулом соединений на каждый хост
+    """
+
+    def __init__(
+        self,
+        pool_size: Optional[int] = None,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        backoff_factor: Optional[float] = None,
+        cache: Optional[HttpCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
+        self.pool_size = pool_size or settings.SCRAPING_HTTP_POOL_SIZE
+        self.timeout = (
+            connect_timeout or settings.SCRAPING_HTTP_CONNECT_TIMEOUT,
+            read_timeout or settings.SCRAPING_HTTP_READ_TIMEOUT,
+        )
+        self.max_retries = settings.SCRAPING_HTTP_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_factor = settings.SCRAPING_HTTP_BACKOFF_FACTOR if backoff_factor is None else backoff_factor
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self._sessions: Dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+
+    def _create_adapter(self, pool_maxsize: int, retry: Retry) -> HTTPAdapter:
+        """
+        Создание транспортного адаптера сессии
+
+        Args:
+            pool_maxsize: Размер пула соединений
+            retry: Политика повторных попыток
+
+        Returns:
+            Адаптер requests
+        """
+        return HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize, max_retries=retry)
+
+    def _create_session(self) -> requests.Session:
+        """
+        Создание сессии с keep-alive, повторными попытками и сжатием
+
+        Returns:
+            Настроенная сессия requests
+        """
+        # С ограничителем частоты ответы 429/503 обрабатываются в _send,
+        # чтобы снизить скорость для всех потоков, а не только повторить запрос
+        status_forcelist = RETRY_STATUS_CODES
+        if self.rate_limiter is not None:
+            status_forcelist = tuple(code for code in RETRY_STATUS_CODES if code not in THROTTLE_STATUS_CODES)
+
+        retry = Retry(
+            total=self.max_retries,
+            connect=self.max_retries,
+            read=self.max_retries,
+            status=self.max_retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=status_forcelist,
+            allowed_methods=frozenset(["GET", "HEAD"]),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        # Размер пула не меньше лимита одновременных запросов к хосту,
+        # иначе потоки будут открывать лишние соединения
+        pool_maxsize = max(self.pool_size, settings.SCRAPING_PER_HOST_CONCURRENCY)
+        adapter = self._create_adapter(pool_maxsize, retry)
+
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers["Accept-Encoding"] = _ACCEPT_ENCODING
+        return session
+
+    def session_for(self, url: str) -> requests.Session:
+        """
+        Получение сессии для хоста указанного URL
+
+        Args:
+            url: URL запроса
+
+        Returns:
+            Сессия, общая для всех запросов к этому хосту
+        """
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = self._create_session()
+                self._sessions[host] = session
+            return session
+
+    def _send(self, session: requests.Session, url: str, **kwargs) -> requests.Response:
+        """
+        Отправка запроса с учетом ограничения частоты для хоста
+
+        Ответы 429/503 снижают скорость запросов к хосту и повторяются
+        после паузы из Retry-After (не более max_retries раз).
+
+        Args:
+            session: Сессия хоста
+            url: URL запроса
+            **kwargs: Параметры requests
+
+        Returns:
+            Ответ сервера
+        """
+        if self.rate_limiter is None:
+            return session.get(url, **kwargs)
+
+        attempt = 0
+        while True:
+            self.rate_limiter.wait(url)
+            response = session.get(url, **kwargs)
+            if response.status_code not in THROTTLE_STATUS_CODES:
+                self.rate_limiter.record_success(url)
+                return response
+
+            self.rate_limiter.penalize(url, parse_retry_after(response.headers.get("Retry-After")))
+            if attempt >= self.max_retries:
+                return response
+            attempt += 1
+            response.close()
+
+    def get(
+        self,
+        url: str,
+        source: Optional[str] = None,
+        defer_store: bool = False,
+        **kwargs,
+    ) -> requests.Response:
+        """
+        Выполнение GET-запроса через пул соединений хоста
+
+        Если включен кэш, запрос выполняется условно (If-None-Match /
+        If-Modified-Since). У ответа выставляется атрибут `unchanged`:
+        True, если содержимое не изменилось с прошлой загрузки
+        (свежая запись кэша, 304 или совпадение хэша тела).
+
+        С defer_store измененное тело не записывается в кэш сразу: запись
+        откладывается в атрибут `store_in_cache` (функция без аргументов).
+        Скрапер вызывает ее только после сохранения события, иначе после
+        сбоя страница считалась бы неизменной и событие не сохранилось бы.
+
+        Args:
+            url: URL запроса
+            source: Тип источника, определяет TTL записи в кэше
+            defer_store: Отложить запись измененного тела в кэш
+            **kwargs: Параметры requests (params, headers, timeout и др.)
+
+        Returns:
+            Ответ сервера
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        session = self.session_for(url)
+
+        if self.cache is None:
+            response = self._send(session, url, **kwargs)
+            response.unchanged = False
+            response.store_in_cache = None
+            return response
+
+        cache_key = requests.Request("GET", url, params=kwargs.get("params")).prepare().url
+        entry = self.cache.get(cache_key)
+
+        if entry and self.cache.is_fresh(entry):
+            cached = self._cached_response(entry)
+            if cached is not None:
+                return cached
+
+        if entry:
+            headers = dict(kwargs.get("headers") or {})
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+            kwargs["headers"] = headers
+
+        response = self._send(session, url, **kwargs)
+
+        if response.status_code == 304 and entry:
+            cached = self._cached_response(entry)
+            if cached is not None:
+                self.cache.touch(cache_key)
+                return cached
+            # Тело в кэше повреждено - повторяем запрос без условий
+            kwargs["headers"].pop("If-None-Match", None)
+            kwargs["headers"].pop("If-Modified-Since", None)
+            response = self._send(session, url, **kwargs)
+
+        response.unchanged = False
+        response.store_in_cache = None
+        if response.status_code == 200:
+            store = functools.partial(
+                self.cache.store,
+                cache_key,
+                response.content,
+                source=source,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+                encoding=response.encoding,
+            )
+            # Неизмененное тело уже сохранено после успешной обработки - только продлеваем запись
+            if defer_store and self.cache.is_changed(cache_key, response.content):
+                response.store_in_cache = store
+            else:
+                response.unchanged = not store()
+
+        return response
+
+    def _cached_response(self, entry: CacheEntry) -> Optional[requests.Response]:
+        """
+        Построение ответа из записи кэша
+
+        Args:
+            entry: Запись кэша
+
+        Returns:
+            Ответ с телом из кэша или None, если тело не удалось прочитать
+        """
+        body = self.cache.read_body(entry)
+        if body is None:
+            return None
+
+        response = requests.Response()
+        response.status_code = 200
+        response.url = entry.url
+        response._content = body
+        response.encoding = entry.encoding
+        response.headers = CaseInsensitiveDict()
+        if entry.etag:
+            response.headers["ETag"] = entry.etag
+        if entry.last_modified:
+            response.headers["Last-Modified"] = entry.last_modified
+        response.unchanged = True
+        response.store_in_cache = None
+        return response
+
+    def close(self) -> None:
+        """
+        Закрытие всех открытых соединений
+        """
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+        if self.cache is not None:
+            self.cache.close()
+        if self.rate_limiter is not None:
+            self.rate_limiter.close()
+
+
+_client: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """
+    Получение общего HTTP-клиента для всех скраперов
+
+    Returns:
+        Экземпляр HttpClient
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            cache = None
+            if settings.SCRAPING_HTTP_CACHE_ENABLED:
+                cache = HttpCache(
+                    directory=settings.SCRAPING_HTTP_CACHE_DIR,
+                    max_bytes=settings.SCRAPING_HTTP_CACHE_MAX_MB * 1024 * 1024,
+                    default_ttl=settings.SCRAPING_HTTP_CACHE_TTL_SECONDS,
+                    source_ttls=settings.SCRAPING_HTTP_CACHE_SOURCE_TTLS,
+                )
+            rate_limiter = None
+            if settings.SCRAPING_RATE_LIMIT_ENABLED:
+                rate_limiter = create_rate_limiter()
+            _client = HttpClient(cache=cache, rate_limiter=rate_limiter)
+        return _client
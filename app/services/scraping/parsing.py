@@ -0,0 +1,108 @@
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+import logging
+import re
+
+from bs4 import BeautifulSoup, FeatureNotFound, SoupStrainer
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# tag, .class, #id, tag.class, tag[attr] и tag[attr=value]
+_SELECTOR_RE = re.compile(
+    r"^(?P<name>[\w-]+)?"
+    r"(?:\.(?P<cls>[\w-]+))?"
+    r"(?:#(?P<id>[\w-]+))?"
+    r"(?:\[(?P<attr>[\w-]+)(?:=[\"']?(?P<value>[^\"'\]]+)[\"']?)?\])?$"
+)
+
+Rule = Tuple[Optional[str], Optional[str], Optional[str], Optional[str], Optional[str]]
+
+
+class SelectorStrainer(SoupStrainer):
+    """
+    Ограничение разбора HTML элементами, подходящими под простые селекторы
+
+    В дерево попадают только подходящие элементы вместе со всем их
+    содержимым, остальная разметка отбрасывается во время разбора.
+    Поддерживаются селекторы вида `tag`, `.class`, `#id`, `tag.class`,
+    `tag[attr]` и `tag[attr=value]`; селекторы объединяются по ИЛИ.
+    """
+
+    def __init__(self, selectors: Iterable[str]):
+        super().__init__()
+        self.selectors = list(selectors)
+        self._rules: List[Rule] = []
+        for selector in self.selectors:
+            match = _SELECTOR_RE.match(selector.strip())
+            if not match or not any(match.groups()):
+                raise ValueError(f"Unsupported selector for partial parsing: {selector}")
+            self._rules.append(
+                (match.group("name"), match.group("cls"), match.group("id"), match.group("attr"), match.group("value"))
+            )
+
+    def _matches(self, name: str, attrs: Optional[Dict]) -> bool:
+        attrs = attrs or {}
+        classes = attrs.get("class") or ""
+        if isinstance(classes, str):
+            classes = classes.split()
+
+        for rule_name, rule_class, rule_id, rule_attr, rule_value in self._rules:
+            if rule_name and rule_name != name:
+                continue
+            if rule_class and rule_class not in classes:
+                continue
+            if rule_id and attrs.get("id") != rule_id:
+                continue
+            if rule_attr:
+                if rule_attr not in attrs:
+                    continue
+                if rule_value is not None and attrs.get(rule_attr) != rule_value:
+                    continue
+            return True
+        return False
+
+    # beautifulsoup4 >= 4.13
+    def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+        return self._matches(name, attrs)
+
+    def allow_string_creation(self, string) -> bool:
+        return False
+
+    # beautifulsoup4 < 4.13
+    def search_tag(self, markup_name=None, markup_attrs={}):
+        return self._matches(markup_name, dict(markup_attrs or {}))
+
+    def search(self, markup):
+        return None
+
+    def __repr__(self) -> str:
+        return f"SelectorStrainer({self.selectors!r})"
+
+
+_warned_parsers = set()
+
+
+def parse_html(markup: Union[str, bytes], parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """
+    Разбор HTML выбранным в настройках парсером
+
+    Args:
+        markup: HTML-код страницы
+        parse_only: Ограничение разбора (например, SelectorStrainer);
+            не применяется, если частичный разбор отключен в настройках
+
+    Returns:
+        Разобранный документ
+    """
+    if not settings.SCRAPING_PARTIAL_PARSING:
+        parse_only = None
+
+    parser = settings.SCRAPING_HTML_PARSER
+    try:
+        return BeautifulSoup(markup, parser, parse_only=parse_only)
+    except FeatureNotFound:
+        if parser not in _warned_parsers:
+            _warned_parsers.add(parser)
+            logger.warning(f"HTML parser '{parser}' is not installed, falling back to html.parser")
+        return BeautifulSoup(markup, "html.parser", parse_only=parse_only)
@@ -0,0 +1,281 @@
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from datetime import datetime, timezone
+import hashlib
+import json
+import logging
+
+from sqlalchemy import bindparam, case, func, literal_column, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.models import Event
+from app.services.scraping.geocoding import GeocodingStage
+
+logger = logging.getLogger(__name__)
+
+# Поля, от которых зависит отпечаток содержимого события. Служебные поля
+# (время загрузки, отпечаток карточки) в него не входят
+CONTENT_FIELDS = (
+    "name",
+    "description",
+    "start_datetime_utc",
+    "end_datetime_utc",
+    "location_text",
+    "is_virtual",
+    "virtual_url",
+    "organizer",
+)
+
+# Координаты заполняет геокодирование; если в новой версии события их нет,
+# а содержимое не изменилось, сохраненные координаты не затираются
+LOCATION_FIELDS = ("location_lat", "location_lon")
+
+
+def content_hash(event_data: Dict[str, Any]) -> str:
+    """
+    Отпечаток содержимого события
+
+    Не меняется, пока не меняются данные события, поэтому по нему можно
+    определить реальные изменения без сравнения всех полей. Даты с часовым
+    поясом приводятся к UTC, чтобы отпечаток загруженного из БД события
+    совпадал с отпечатком тех же данных от скрапера.
+
+    Args:
+        event_data: Данные о событии
+
+    Returns:
+        SHA-256 от полей содержимого в шестнадцатеричном виде
+    """
+    fields = {}
+    for key in CONTENT_FIELDS:
+        value = event_data.get(key)
+        if isinstance(value, datetime) and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        fields[key] = value
+    payload = json.dumps(fields, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def event_content_hash(event: Event) -> str:
+    """
+    Отпечаток содержимого сохраненного события (после изменения его полей)
+
+    Args:
+        event: Объект события
+
+    Returns:
+        SHA-256 от полей содержимого в шестнадцатеричном виде
+    """
+    return content_hash({key: getattr(event, key) for key in CONTENT_FIELDS})
+
+
+class EventBatchWriter:
+    """
+    Пакетное сохранение событий через INSERT ... ON CONFLICT (original_url) DO UPDATE
+
+    События буферизуются и записываются одним запросом и одним коммитом
+    на пакет. Если отпечаток содержимого совпадает с сохраненным, поля
+    события и updated_at не перезаписываются - обновляются только время
+    загрузки и отпечаток карточки. Количество добавленных, измененных и
+    неизмененных событий накапливается в атрибутах `added`, `updated` и
+    `unchanged`. Если передан этап геокодирования, координаты событий
+    заполняются перед записью пакета. После коммита вызывается on_saved
+    со списком URL сохраненных событий. URL всех успешно записанных и
+    отмеченных событий накапливаются в `saved_urls`.
+
+    У событий, страницы которых не изменились (touch), обновляются только
+    время загрузки и отпечаток карточки, чтобы они не считались устаревшими.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        source_id: int,
+        batch_size: Optional[int] = None,
+        geocoding: Optional[GeocodingStage] = None,
+        on_saved: Optional[Callable[[List[str]], None]] = None,
+    ):
+        self.db = db
+        self.source_id = source_id
+        self.batch_size = batch_size or settings.SCRAPING_DB_BATCH_SIZE
+        self.geocoding = geocoding
+        self.on_saved = on_saved
+        self.added = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.failed = 0
+        self.touched = 0
+        self.saved_urls: Set[str] = set()
+        self._buffer: Dict[str, Dict] = {}
+        self._touched: Dict[str, Optional[str]] = {}
+
+    def add(self, event_data: Dict) -> None:
+        """
+        Добавление события в буфер
+
+        Args:
+            event_data: Данные о событии
+        """
+        # Один и тот же URL не может дважды встречаться в одном
+        # INSERT ... ON CONFLICT, поэтому оставляем последнюю версию
+        self._buffer[event_data["original_url"]] = event_data
+
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def touch(self, original_url: str, listing_fingerprint: Optional[str] = None) -> None:
+        """
+        Отметка о загрузке события, страница которого не изменилась
+
+        Args:
+            original_url: URL события
+            listing_fingerprint: Отпечаток карточки (None - оставить сохраненный)
+        """
+        self._touched[original_url] = listing_fingerprint
+
+        if len(self._touched) >= self.batch_size:
+            self._flush_touched()
+
+    def flush(self) -> None:
+        """
+        Запись накопленных событий в базу данных
+        """
+        self._flush_touched()
+        if not self._buffer:
+            return
+
+        scraped_at = datetime.now(timezone.utc)
+        rows = [
+            dict(
+                event_data,
+                source_id=self.source_id,
+                last_scraped_at=scraped_at,
+                content_hash=event_data.get("content_hash") or content_hash(event_data),
+            )
+            for event_data in self._buffer.values()
+        ]
+        self._buffer = {}
+
+        try:
+            if self.geocoding:
+                self.geocoding.apply(rows)
+            added, updated, unchanged = self._upsert(rows)
+            self.db.commit()
+            saved = [row["original_url"] for row in rows]
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Error saving batch of {len(rows)} events, retrying one by one: {str(e)}")
+            added, updated, unchanged, saved = self._upsert_one_by_one(rows)
+
+        self.added += added
+        self.updated += updated
+        self.unchanged += unchanged
+        self.saved_urls.update(saved)
+        logger.info(
+            f"Saved batch of {len(rows)} events: {added} added, {updated} updated, {unchanged} unchanged"
+        )
+        if self.on_saved and saved:
+            self.on_saved(saved)
+
+    def _flush_touched(self) -> None:
+        """
+        Обновление времени загрузки неизмененных событий одним UPDATE на пакет
+        """
+        if not self._touched:
+            return
+
+        params = [
+            {"touched_url": original_url, "touched_fingerprint": fingerprint}
+            for original_url, fingerprint in self._touched.items()
+        ]
+        self._touched = {}
+
+        table = Event.__table__
+        stmt = update(table).where(table.c.original_url == bindparam("touched_url")).values(
+            last_scraped_at=datetime.now(timezone.utc),
+            listing_fingerprint=func.coalesce(bindparam("touched_fingerprint"), table.c.listing_fingerprint),
+            # Содержимое не менялось - onupdate столбца updated_at не применяем
+            updated_at=table.c.updated_at,
+        )
+        try:
+            self.db.execute(stmt, params)
+            self.db.commit()
+            self.touched += len(params)
+            self.saved_urls.update(param["touched_url"] for param in params)
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Error updating scrape time of {len(params)} unchanged events: {str(e)}")
+
+    def _upsert(self, rows: List[Dict]) -> Tuple[int, int, int]:
+        """
+        Выполнение одного INSERT ... ON CONFLICT для списка событий
+
+        Args:
+            rows: Данные о событиях
+
+        Returns:
+            Количество добавленных, измененных и неизмененных событий
+        """
+        stmt = insert(Event).values(rows)
+        changed = Event.content_hash.is_distinct_from(stmt.excluded.content_hash)
+        update_columns = {}
+        for key in rows[0].keys():
+            if key == "original_url":
+                continue
+            if key in CONTENT_FIELDS:
+                update_columns[key] = case((changed, stmt.excluded[key]), else_=Event.__table__.c[key])
+            elif key in LOCATION_FIELDS:
+                update_columns[key] = case(
+                    (changed, stmt.excluded[key]), else_=func.coalesce(stmt.excluded[key], Event.__table__.c[key])
+                )
+            else:
+                update_columns[key] = stmt.excluded[key]
+        update_columns["updated_at"] = case((changed, func.now()), else_=Event.updated_at)
+
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Event.original_url],
+            set_=update_columns,
+        ).returning(
+            # xmax = 0 только у строк, вставленных этим запросом; у измененных
+            # строк updated_at равен времени начала транзакции
+            literal_column("(xmax = 0)").label("inserted"),
+            (Event.updated_at == func.now()).label("changed"),
+        )
+
+        added = updated = unchanged = 0
+        for row in self.db.execute(stmt):
+            if row.inserted:
+                added += 1
+            elif row.changed:
+                updated += 1
+            else:
+                unchanged += 1
+        return added, updated, unchanged
+
+    def _upsert_one_by_one(self, rows: List[Dict]) -> Tuple[int, int, int, List[str]]:
+        """
+        Поштучное сохранение событий, чтобы ошибка в одном событии
+        не отменяла сохранение всего пакета
+
+        Args:
+            rows: Данные о событиях
+
+        Returns:
+            Количество добавленных, измененных и неизмененных событий и URL сохраненных
+        """
+        added = updated = unchanged = 0
+        saved = []
+        for row in rows:
+            try:
+                row_added, row_updated, row_unchanged = self._upsert([row])
+                self.db.commit()
+                added += row_added
+                updated += row_updated
+                unchanged += row_unchanged
+                saved.append(row["original_url"])
+            except Exception as e:
+                self.db.rollback()
+                self.failed += 1
+                logger.error(f"Error saving event {row.get('original_url')} to database: {str(e)}")
+        return added, updated, unchanged, saved
@@ -0,0 +1,326 @@
+from typing import Callable, Dict, Iterator, Optional, Tuple
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Ответы, после которых скорость запросов к хосту снижается
+THROTTLE_STATUS_CODES = (429, 503)
+
+# Верхняя граница паузы из Retry-After, чтобы ошибочный заголовок не остановил сбор
+MAX_RETRY_AFTER_SECONDS = 600
+
+
+def host_of(url: str) -> str:
+    """
+    Хост, по которому ведется учет лимитов
+
+    Args:
+        url: URL запроса или имя хоста
+
+    Returns:
+        Имя хоста в нижнем регистре
+    """
+    if "//" not in url:
+        return url.lower()
+    return urlparse(url).netloc.lower()
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """
+    Разбор заголовка Retry-After
+
+    Args:
+        value: Значение заголовка (секунды или HTTP-дата)
+        now: Текущее время (timestamp)
+
+    Returns:
+        Пауза в секундах или None, если заголовок отсутствует или некорректен
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        seconds = float(value)
+    else:
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        now = datetime.now(timezone.utc).timestamp() if now is None else now
+        seconds = retry_at.timestamp() - now
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER_SECONDS)
+
+
+class MemoryRateLimitBackend:
+    """
+    Хранение состояния корзин в памяти процесса (общее для всех потоков)
+    """
+
+    def __init__(self):
+        self._states: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def bucket(self, host: str) -> Iterator[Dict]:
+        """
+        Атомарный доступ к состоянию корзины хоста
+
+        Args:
+            host: Имя хоста
+
+        Returns:
+            Изменяемый словарь состояния (tokens, updated_at, rate)
+        """
+        with self._lock:
+            yield self._states.setdefault(host, {})
+
+    def close(self) -> None:
+        pass
+
+
+class SqliteRateLimitBackend:
+    """
+    Хранение состояния корзин в файле SQLite
+
+    Состояние общее для всех потоков и процессов, использующих один файл:
+    каждое обращение выполняется в транзакции BEGIN IMMEDIATE.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS buckets (
+                host TEXT PRIMARY KEY,
+                tokens REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                rate REAL NOT NULL
+            )
+            """
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        # Соединение SQLite нельзя разделять между потоками без блокировки,
+        # поэтому у каждого потока свое
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def bucket(self, host: str) -> Iterator[Dict]:
+        """
+        Атомарный доступ к состоянию корзины хоста
+
+        Args:
+            host: Имя хоста
+
+        Returns:
+            Изменяемый словарь состояния (tokens, updated_at, rate)
+        """
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT tokens, updated_at, rate FROM buckets WHERE host = ?",
+                (host,),
+            ).fetchone()
+            state = dict(zip(("tokens", "updated_at", "rate"), row)) if row else {}
+            yield state
+            if state:
+                conn.execute(
+                    "INSERT INTO buckets (host, tokens, updated_at, rate) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (host) DO UPDATE SET "
+                    "tokens = excluded.tokens, updated_at = excluded.updated_at, rate = excluded.rate",
+                    (host, state["tokens"], state["updated_at"], state["rate"]),
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+class RateLimiter:
+    """
+    Ограничение частоты запросов к хосту по алгоритму token bucket
+
+    Корзина хоста пополняется со скоростью `rate` запросов в секунду и
+    вмещает не более `burst` запросов. После ответа 429/503 скорость
+    снижается в `backoff_factor` раз, а запросы приостанавливаются на время
+    из Retry-After; каждый успешный ответ постепенно возвращает скорость
+    к настроенной (аддитивное увеличение, мультипликативное уменьшение).
+    """
+
+    def __init__(
+        self,
+        backend,
+        rate: Optional[float] = None,
+        burst: Optional[int] = None,
+        min_rate: Optional[float] = None,
+        backoff_factor: Optional[float] = None,
+        recovery_step: Optional[float] = None,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.backend = backend
+        self.rate = rate or settings.SCRAPING_RATE_LIMIT_PER_SECOND
+        self.burst = burst or settings.SCRAPING_RATE_LIMIT_BURST
+        self.min_rate = min_rate or settings.SCRAPING_RATE_LIMIT_MIN_PER_SECOND
+        self.backoff_factor = backoff_factor or settings.SCRAPING_RATE_LIMIT_BACKOFF_FACTOR
+        self.recovery_step = settings.SCRAPING_RATE_LIMIT_RECOVERY_STEP if recovery_step is None else recovery_step
+        self._clock = clock
+        self._sleep = sleep
+        self._limits: Dict[str, Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, url: str, rate: Optional[float] = None, burst: Optional[int] = None) -> None:
+        """
+        Установка лимитов для хоста (например, из настроек источника)
+
+        Args:
+            url: URL или имя хоста
+            rate: Максимальное число запросов в секунду
+            burst: Максимальное число запросов подряд без ожидания
+        """
+        with self._lock:
+            self._limits[host_of(url)] = (rate or self.rate, burst or self.burst)
+
+    def limits_for(self, host: str) -> Tuple[float, int]:
+        """
+        Лимиты хоста
+
+        Args:
+            host: Имя хоста
+
+        Returns:
+            Пара (запросов в секунду, размер корзины)
+        """
+        with self._lock:
+            return self._limits.get(host, (self.rate, self.burst))
+
+    def reserve(self, url: str) -> float:
+        """
+        Резервирование одного запроса к хосту
+
+        Args:
+            url: URL запроса
+
+        Returns:
+            Время в секундах, которое нужно подождать перед запросом
+        """
+        host = host_of(url)
+        max_rate, burst = self.limits_for(host)
+        now = self._clock()
+
+        with self.backend.bucket(host) as state:
+            rate = min(state.get("rate") or max_rate, max_rate)
+            tokens = min(state.get("tokens", burst), burst)
+            updated_at = state.get("updated_at", now)
+
+            # updated_at может быть в будущем, если хост приостановлен после 429
+            if now > updated_at:
+                tokens = min(burst, tokens + (now - updated_at) * rate)
+                updated_at = now
+            tokens -= 1
+
+            state.update(tokens=tokens, updated_at=updated_at, rate=rate)
+
+        return (updated_at - now) + max(0.0, -tokens) / rate
+
+    def wait(self, url: str) -> float:
+        """
+        Ожидание разрешения на запрос к хосту
+
+        Args:
+            url: URL запроса
+
+        Returns:
+            Время ожидания в секундах
+        """
+        delay = self.reserve(url)
+        if delay > 0:
+            self._sleep(delay)
+        return delay
+
+    def penalize(self, url: str, retry_after: Optional[float] = None) -> None:
+        """
+        Снижение скорости после ответа 429/503
+
+        Args:
+            url: URL запроса
+            retry_after: Пауза из заголовка Retry-After в секундах
+        """
+        host = host_of(url)
+        max_rate, burst = self.limits_for(host)
+        now = self._clock()
+
+        with self.backend.bucket(host) as state:
+            rate = max(self.min_rate, min(state.get("rate") or max_rate, max_rate) * self.backoff_factor)
+            pause = retry_after if retry_after is not None else 1.0 / rate
+            state.update(
+                tokens=min(state.get("tokens", 0.0), 0.0),
+                updated_at=max(state.get("updated_at", now), now + pause),
+                rate=rate,
+            )
+
+        logger.warning(f"Host {host} is throttling requests, slowing down to {rate:.2f} req/s for {pause:.1f}s")
+
+    def record_success(self, url: str) -> None:
+        """
+        Постепенное восстановление скорости после успешного ответа
+
+        Args:
+            url: URL запроса
+        """
+        host = host_of(url)
+        max_rate, _ = self.limits_for(host)
+
+        with self.backend.bucket(host) as state:
+            rate = state.get("rate")
+            if rate is not None and rate < max_rate:
+                state["rate"] = min(max_rate, rate + max_rate * self.recovery_step)
+
+    def close(self) -> None:
+        self.backend.close()
+
+
+def create_rate_limiter() -> RateLimiter:
+    """
+    Создание ограничителя частоты запросов по настройкам
+
+    Returns:
+        Экземпляр RateLimiter с бэкендом из SCRAPING_RATE_LIMIT_BACKEND
+    """
+    backend_name = settings.SCRAPING_RATE_LIMIT_BACKEND
+    if backend_name == "sqlite":
+        backend = SqliteRateLimitBackend(settings.SCRAPING_RATE_LIMIT_DB_PATH)
+    elif backend_name == "memory":
+        backend = MemoryRateLimitBackend()
+    else:
+        raise ValueError(f"Unknown rate limit backend: {backend_name}")
+    return RateLimiter(backend)
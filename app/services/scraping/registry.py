@@ -0,0 +1,90 @@
+from typing import Dict, Type
+from importlib import import_module
+from importlib.metadata import entry_points
+import logging
+
+from app.services.scraping.base import BaseScraper
+
+logger = logging.getLogger(__name__)
+
+# Группа entry points, через которую сторонние пакеты подключают свои источники:
+#
+#   [project.entry-points."event_pulse.scrapers"]
+#   luma = "my_package.luma:LumaScraper"
+ENTRY_POINT_GROUP = "event_pulse.scrapers"
+
+BUILTIN_SCRAPER_MODULES = (
+    "app.services.scraping.meetup",
+    "app.services.scraping.eventbrite",
+    "app.services.scraping.techcrunch",
+)
+
+_registry: Dict[str, Type[BaseScraper]] = {}
+_loaded = False
+
+
+def register_scraper(scraper_class: Type[BaseScraper]) -> Type[BaseScraper]:
+    """
+    Регистрация класса скрапера (используется как декоратор)
+
+    Args:
+        scraper_class: Класс, унаследованный от BaseScraper
+
+    Returns:
+        Тот же класс
+    """
+    if not scraper_class.source_type:
+        raise ValueError(f"{scraper_class.__name__} must define source_type")
+    _registry[scraper_class.source_type] = scraper_class
+    return scraper_class
+
+
+def _load_scrapers() -> None:
+    """
+    Загрузка встроенных источников и источников из entry points
+    """
+    global _loaded
+    if _loaded:
+        return
+    _loaded = True
+
+    for module_name in BUILTIN_SCRAPER_MODULES:
+        import_module(module_name)
+
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        try:
+            scraper_class = entry_point.load()
+            if scraper_class.source_type != entry_point.name:
+                logger.warning(
+                    f"Scraper entry point '{entry_point.name}' registers source type '{scraper_class.source_type}'"
+                )
+            register_scraper(scraper_class)
+        except Exception as e:
+            logger.error(f"Error loading scraper entry point '{entry_point.name}': {str(e)}")
+
+
+def get_scraper_class(source_type: str) -> Type[BaseScraper]:
+    """
+    Получение класса скрапера по типу источника
+
+    Args:
+        source_type: Тип источника ('meetup', 'eventbrite', 'techcrunch', ...)
+
+    Returns:
+        Класс скрапера
+    """
+    _load_scrapers()
+    if source_type not in _registry:
+        raise ValueError(f"Unknown scraper source type: {source_type}")
+    return _registry[source_type]
+
+
+def available_scrapers() -> Dict[str, Type[BaseScraper]]:
+    """
+    Получение всех зарегистрированных скраперов
+
+    Returns:
+        Словарь {тип источника: класс скрапера}
+    """
+    _load_scrapers()
+    return dict(_registry)
@@ -0,0 +1,389 @@
+"""
+Запись и воспроизведение HTTP-ответов источников
+
+Страницы списков и событий записываются в сжатый архив (zip), а затем
+отдаются локальным HTTP-сервером вместо настоящих сайтов. Скраперы при
+этом работают через обычный HttpClient (пулы соединений, повторы,
+распаковка), меняется только адрес, куда уходят запросы.
+
+Запуск:
+    python -m app.services.scraping.replay record meetup meetup.zip [--limit 50]
+    python -m app.services.scraping.replay serve meetup.zip [--port 8765]
+"""
+from typing import Dict, Iterator, List, NamedTuple, Optional
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import islice
+from urllib.parse import urljoin, urlsplit
+import argparse
+import hashlib
+import json
+import logging
+import threading
+import zipfile
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+
+from app.services.scraping.concurrency import fetch_concurrently
+from app.services.scraping.http_client import HttpClient, get_http_client
+from app.services.scraping.parsing import parse_html
+from app.services.scraping.registry import get_scraper_class
+
+logger = logging.getLogger(__name__)
+
+# Заголовок, в котором локальному серверу передается исходный URL запроса
+REPLAY_URL_HEADER = "X-Replay-Url"
+
+# Заголовки ответа, которые сохраняются в архиве
+RECORDED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+class RecordedResponse(NamedTuple):
+    url: str
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+
+
+def request_url(url: str, params: Optional[Dict] = None) -> str:
+    """
+    URL запроса вместе с параметрами, как его отправляет requests
+
+    Args:
+        url: URL
+        params: Параметры запроса
+
+    Returns:
+        Полный URL (ключ записи в архиве)
+    """
+    return requests.Request("GET", url, params=params).prepare().url
+
+
+class ReplayArchive:
+    """
+    Архив записанных ответов: index.json и тела ответов в одном zip-файле
+
+    Одинаковые тела хранятся один раз.
+    """
+
+    def __init__(self):
+        self._responses: Dict[str, RecordedResponse] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._responses)
+
+    def add(self, url: str, status: int, headers: Dict[str, str], body: bytes) -> None:
+        """
+        Добавление ответа в архив
+
+        Args:
+            url: Полный URL запроса
+            status: Код ответа
+            headers: Заголовки ответа
+            body: Тело ответа
+        """
+        kept = {name: headers[name] for name in RECORDED_HEADERS if headers.get(name)}
+        with self._lock:
+            self._responses[url] = RecordedResponse(url, status, kept, body)
+
+    def get(self, url: str) -> Optional[RecordedResponse]:
+        """
+        Получение записанного ответа
+
+        Args:
+            url: Полный URL запроса
+
+        Returns:
+            Записанный ответ или None
+        """
+        return self._responses.get(url)
+
+    def __iter__(self) -> Iterator[RecordedResponse]:
+        return iter(list(self._responses.values()))
+
+    def save(self, path: str) -> None:
+        """
+        Сохранение архива в zip-файл
+
+        Args:
+            path: Путь к файлу
+        """
+        index = []
+        with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            written = set()
+            for response in self:
+                body_name = f"bodies/{hashlib.sha1(response.body).hexdigest()}"
+                if body_name not in written:
+                    archive.writestr(body_name, response.body)
+                    written.add(body_name)
+                index.append({
+                    "url": response.url,
+                    "status": response.status,
+                    "headers": response.headers,
+                    "body": body_name,
+                })
+            archive.writestr("index.json", json.dumps(index, indent=1))
+
+    @classmethod
+    def load(cls, path: str) -> "ReplayArchive":
+        """
+        Загрузка архива из zip-файла
+
+        Args:
+            path: Путь к файлу
+
+        Returns:
+            Архив
+        """
+        replay_archive = cls()
+        with zipfile.ZipFile(path) as archive:
+            bodies: Dict[str, bytes] = {}
+            for item in json.loads(archive.read("index.json")):
+                if item["body"] not in bodies:
+                    bodies[item["body"]] = archive.read(item["body"])
+                replay_archive.add(item["url"], item["status"], item["headers"], bodies[item["body"]])
+        return replay_archive
+
+    def response_for(self, url: str) -> requests.Response:
+        """
+        Ответ requests для записанного URL (без сети)
+
+        Args:
+            url: Полный URL запроса
+
+        Returns:
+            Ответ; для отсутствующего в архиве URL - 404
+        """
+        recorded = self.get(url)
+        response = requests.Response()
+        response.url = url
+        response.headers = CaseInsensitiveDict(recorded.headers if recorded else {})
+        response.status_code = recorded.status if recorded else 404
+        response._content = recorded.body if recorded else b""
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers) or "utf-8"
+        response.unchanged = False
+        response.store_in_cache = None
+        return response
+
+
+class RecordingHttpClient(HttpClient):
+    """
+    HTTP-клиент, записывающий все полученные ответы в архив
+    """
+
+    def __init__(self, archive: ReplayArchive, **kwargs):
+        super().__init__(**kwargs)
+        self.archive = archive
+
+    def get(self, url: str, source: Optional[str] = None, **kwargs) -> requests.Response:
+        response = super().get(url, source=source, **kwargs)
+        self.archive.add(request_url(url, kwargs.get("params")), response.status_code, response.headers, response.content)
+        return response
+
+
+class ReplayAdapter(HTTPAdapter):
+    """
+    Транспортный адаптер, отправляющий все запросы на локальный сервер воспроизведения
+    """
+
+    def __init__(self, server_url: str, **kwargs):
+        super().__init__(**kwargs)
+        self.server_url = server_url.rstrip("/")
+
+    def send(self, request, **kwargs):
+        original_url = request.url
+        parts = urlsplit(original_url)
+        request.headers[REPLAY_URL_HEADER] = original_url
+        request.url = self.server_url + (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        response = super().send(request, **kwargs)
+        response.url = original_url
+        return response
+
+
+class ReplayHttpClient(HttpClient):
+    """
+    HTTP-клиент, который вместо сайтов обращается к локальному серверу воспроизведения
+    """
+
+    def __init__(self, server_url: str, **kwargs):
+        super().__init__(**kwargs)
+        self.server_url = server_url
+
+    def _create_adapter(self, pool_maxsize: int, retry: Retry) -> HTTPAdapter:
+        return ReplayAdapter(self.server_url, pool_connections=1, pool_maxsize=pool_maxsize, max_retries=retry)
+
+
+class ArchiveHttpClient:
+    """
+    Клиент, отдающий ответы прямо из архива, без сокетов
+
+    Используется, когда нужно измерить только разбор страниц.
+    """
+
+    def __init__(self, archive: ReplayArchive):
+        self.archive = archive
+        self.rate_limiter = None
+
+    def get(self, url: str, source: Optional[str] = None, **kwargs) -> requests.Response:
+        return self.archive.response_for(request_url(url, kwargs.get("params")))
+
+    def close(self) -> None:
+        pass
+
+
+class ReplayServer:
+    """
+    Локальный HTTP-сервер, отдающий ответы из архива
+
+    Исходный URL запроса берется из заголовка X-Replay-Url (его выставляет
+    ReplayAdapter). Сервер поддерживает keep-alive и обслуживает запросы
+    в отдельных потоках.
+    """
+
+    def __init__(self, archive: ReplayArchive, host: str = "127.0.0.1", port: int = 0):
+        self.archive = archive
+        self.misses: List[str] = []
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Заголовки и тело пишутся отдельно; без этого keep-alive упирается в задержку ACK
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                original_url = self.headers.get(REPLAY_URL_HEADER, "")
+                recorded = server.archive.get(original_url)
+                if recorded is None:
+                    server.misses.append(original_url)
+                    status, headers, body = 404, {"Content-Type": "text/plain"}, b"not recorded"
+                else:
+                    status, headers, body = recorded.status, recorded.headers, recorded.body
+
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        return Handler
+
+    def start(self) -> "ReplayServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """
+        Обслуживание запросов в текущем потоке до прерывания процесса
+        """
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "ReplayServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def build_fixture_archive(scraper, listing_markup: str, detail_markup: str) -> ReplayArchive:
+    """
+    Архив из сохраненных страниц: страница списка на каждый запрос списка
+    и одна и та же страница события на каждую карточку
+
+    Args:
+        scraper: Скрапер источника
+        listing_markup: HTML страницы списка
+        detail_markup: HTML страницы события
+
+    Returns:
+        Архив ответов
+    """
+    archive = ReplayArchive()
+    headers = {"Content-Type": "text/html; charset=utf-8"}
+    listing_body = listing_markup.encode("utf-8")
+    detail_body = detail_markup.encode("utf-8")
+
+    for listing_url, params in scraper.listing_requests():
+        archive.add(request_url(listing_url, params), 200, headers, listing_body)
+
+    for card in scraper.extract_cards(parse_html(listing_markup)):
+        card_url = scraper.extract_card_url(card)
+        if card_url:
+            archive.add(request_url(urljoin(scraper.base_url, card_url)), 200, headers, detail_body)
+
+    return archive
+
+
+def record(source_type: str, path: str, limit: Optional[int] = None) -> ReplayArchive:
+    """
+    Запись страниц списка и событий источника в архив
+
+    Args:
+        source_type: Тип источника
+        path: Путь к файлу архива
+        limit: Максимальное количество страниц событий
+
+    Returns:
+        Записанный архив
+    """
+    archive = ReplayArchive()
+    scraper = get_scraper_class(source_type)()
+    # Без дискового кэша, чтобы в архив попали настоящие тела ответов
+    scraper.http = RecordingHttpClient(archive, rate_limiter=get_http_client().rate_limiter)
+
+    event_urls = [url for url, _ in islice(scraper.iter_cards(), limit)]
+    for _ in fetch_concurrently(event_urls, scraper.fetch_event):
+        pass
+
+    archive.save(path)
+    logger.info(f"Recorded {len(archive)} responses from {scraper.source_name} to {path}")
+    return archive
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Record and replay source pages")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = commands.add_parser("record", help="record listing and event pages of a source")
+    record_parser.add_argument("source_type")
+    record_parser.add_argument("archive")
+    record_parser.add_argument("--limit", type=int, default=None, help="maximum number of event pages")
+
+    serve_parser = commands.add_parser("serve", help="serve a recorded archive")
+    serve_parser.add_argument("archive")
+    serve_parser.add_argument("--port", type=int, default=8765)
+
+    args = parser.parse_args()
+    if args.command == "record":
+        record(args.source_type, args.archive, args.limit)
+    else:
+        replay_server = ReplayServer(ReplayArchive.load(args.archive), port=args.port)
+        print(f"Serving {len(replay_server.archive)} responses at {replay_server.url}")
+        replay_server.serve_forever()
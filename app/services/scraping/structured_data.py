@@ -0,0 +1,258 @@
+from typing import Any, Dict, Iterator, List, Optional, Union
+from datetime import datetime
+import html
+import json
+import logging
+import re
+
+from app.services.scraping.dates import parse_iso_datetime
+
+logger = logging.getLogger(__name__)
+
+# Поиск встроенных данных выполняется регулярными выражениями по исходным
+# байтам страницы, без построения DOM
+_JSON_LD_RE = re.compile(
+    rb"<script[^>]*type\s*=\s*[\"']application/ld\+json[\"'][^>]*>(.*?)</script>",
+    re.IGNORECASE | re.DOTALL,
+)
+_NEXT_DATA_RE = re.compile(
+    rb"<script[^>]*id\s*=\s*[\"']__NEXT_DATA__[\"'][^>]*>(.*?)</script>",
+    re.IGNORECASE | re.DOTALL,
+)
+_MICRODATA_SCOPE_RE = re.compile(
+    rb"itemtype\s*=\s*[\"']https?://schema\.org/(\w*Event)[\"']",
+    re.IGNORECASE,
+)
+_MICRODATA_PROP_RE = re.compile(
+    rb"<(\w+)([^>]*?)\bitemprop\s*=\s*[\"']([\w-]+)[\"']([^>]*)>",
+    re.IGNORECASE,
+)
+_ATTR_RE = re.compile(rb"\b(content|datetime|href)\s*=\s*[\"']([^\"']*)[\"']", re.IGNORECASE)
+_TAG_RE = re.compile(r"<[^>]+>")
+
+EVENT_TYPES = ("Event", "BusinessEvent", "EducationEvent", "SocialEvent", "Hackathon")
+
+# Поля, без которых событие не считается полным
+REQUIRED_FIELDS = ("name", "start_datetime_utc")
+
+
+def _parse_datetime(value: Any) -> Optional[datetime]:
+    """
+    Разбор даты в формате ISO 8601
+
+    Args:
+        value: Строка с датой
+
+    Returns:
+        Дата в UTC или None
+    """
+    if not isinstance(value, str) or not value:
+        return None
+    return parse_iso_datetime(value)
+
+
+def _name_of(value: Any) -> Optional[str]:
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if isinstance(value, dict):
+        value = value.get("name")
+    if isinstance(value, str) and value.strip():
+        return value.strip()
+    return None
+
+
+def _is_event_node(node: Dict) -> bool:
+    node_type = node.get("@type") or node.get("__typename")
+    if isinstance(node_type, list):
+        return any(t in EVENT_TYPES for t in node_type)
+    return node_type in EVENT_TYPES
+
+
+def _iter_event_nodes(data: Any) -> Iterator[Dict]:
+    """
+    Рекурсивный поиск объектов-событий в JSON
+
+    Args:
+        data: Разобранный JSON
+
+    Returns:
+        Итератор словарей, описывающих событие
+    """
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if _is_event_node(node):
+                yield node
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+
+
+def _location_from_schema(node: Dict) -> Dict:
+    """
+    Извлечение места проведения из объекта schema.org или данных Meetup
+
+    Args:
+        node: Объект события
+
+    Returns:
+        Словарь с location_text и is_virtual (если их удалось определить)
+    """
+    result = {}
+
+    attendance_mode = str(node.get("eventAttendanceMode") or "")
+    if "OnlineEventAttendanceMode" in attendance_mode or node.get("isOnline") is True:
+        result["is_virtual"] = True
+        result["location_text"] = "Online"
+
+    location = node.get("location") or node.get("venue")
+    if isinstance(location, list):
+        location = next((loc for loc in location if isinstance(loc, dict) and loc.get("@type") != "VirtualLocation"), location[0] if location else None)
+
+    if isinstance(location, str) and location.strip():
+        result["location_text"] = location.strip()
+    elif isinstance(location, dict):
+        if location.get("@type") == "VirtualLocation":
+            result["is_virtual"] = True
+            result["location_text"] = "Online"
+        else:
+            parts = [location.get("name")]
+            address = location.get("address")
+            if isinstance(address, dict):
+                parts.extend([address.get("streetAddress"), address.get("addressLocality"), address.get("addressRegion")])
+            else:
+                parts.extend([address, location.get("city"), location.get("state")])
+            text = ", ".join(p.strip() for p in parts if isinstance(p, str) and p.strip())
+            if text:
+                result["location_text"] = text
+                result.setdefault("is_virtual", False)
+
+    return result
+
+
+def _event_from_node(node: Dict, event_url: str) -> Dict:
+    """
+    Преобразование объекта события (JSON-LD или __NEXT_DATA__) в данные о событии
+
+    Args:
+        node: Объект события
+        event_url: URL страницы события
+
+    Returns:
+        Словарь с найденными полями события
+    """
+    event_data = {
+        "name": _name_of(node.get("name") or node.get("title")),
+        "description": node.get("description") if isinstance(node.get("description"), str) else None,
+        "start_datetime_utc": _parse_datetime(node.get("startDate") or node.get("dateTime")),
+        "end_datetime_utc": _parse_datetime(node.get("endDate") or node.get("endTime")),
+        "organizer": _name_of(node.get("organizer") or node.get("group")),
+        "original_url": event_url,
+    }
+    event_data.update(_location_from_schema(node))
+    return {key: value for key, value in event_data.items() if value is not None}
+
+
+def _json_candidates(markup: bytes) -> Iterator[Any]:
+    for pattern in (_JSON_LD_RE, _NEXT_DATA_RE):
+        for match in pattern.finditer(markup):
+            try:
+                yield json.loads(match.group(1))
+            except ValueError:
+                continue
+
+
+def _microdata_event(markup: bytes, event_url: str) -> Optional[Dict]:
+    """
+    Извлечение события из микроразметки schema.org (itemprop)
+
+    Args:
+        markup: Исходный HTML
+        event_url: URL страницы события
+
+    Returns:
+        Словарь с найденными полями события или None
+    """
+    scope = _MICRODATA_SCOPE_RE.search(markup)
+    if not scope:
+        return None
+
+    props: Dict[str, str] = {}
+    for match in _MICRODATA_PROP_RE.finditer(markup, scope.end()):
+        tag, before, prop, after = match.groups()
+        prop = prop.decode()
+        if prop in props:
+            continue
+
+        attrs = dict((k.lower(), v) for k, v in _ATTR_RE.findall(before + after))
+        value = attrs.get(b"content") or attrs.get(b"datetime")
+        if value is None:
+            end = markup.find(b"</" + tag, match.end())
+            if end == -1:
+                continue
+            value = markup[match.end():end]
+        text = html.unescape(_TAG_RE.sub(" ", value.decode("utf-8", "replace")))
+        props[prop] = " ".join(text.split())
+
+    if not props:
+        return None
+
+    node = {
+        "name": props.get("name"),
+        "description": props.get("description"),
+        "startDate": props.get("startDate"),
+        "endDate": props.get("endDate"),
+        "location": props.get("location"),
+        "organizer": props.get("organizer"),
+    }
+    return _event_from_node(node, event_url)
+
+
+def extract_structured_event(markup: Union[str, bytes], event_url: str) -> Optional[Dict]:
+    """
+    Извлечение события из встроенных структурированных данных страницы
+
+    Порядок поиска: JSON-LD, __NEXT_DATA__, микроразметка. Возвращается
+    наиболее полный из найденных вариантов.
+
+    Args:
+        markup: Исходный HTML страницы
+        event_url: URL страницы события
+
+    Returns:
+        Словарь с найденными полями события или None, если данных нет
+    """
+    if isinstance(markup, str):
+        markup = markup.encode("utf-8")
+
+    candidates: List[Dict] = []
+    for data in _json_candidates(markup):
+        for node in _iter_event_nodes(data):
+            candidate = _event_from_node(node, event_url)
+            if is_complete(candidate):
+                return candidate
+            candidates.append(candidate)
+
+    microdata = _microdata_event(markup, event_url)
+    if microdata:
+        if is_complete(microdata):
+            return microdata
+        candidates.append(microdata)
+
+    if not candidates:
+        return None
+    return max(candidates, key=len)
+
+
+def is_complete(event_data: Optional[Dict]) -> bool:
+    """
+    Проверка, достаточно ли данных для сохранения события без разбора DOM
+
+    Args:
+        event_data: Данные о событии
+
+    Returns:
+        True, если заполнены все обязательные поля
+    """
+    return bool(event_data) and all(event_data.get(field) for field in REQUIRED_FIELDS)
@@ -0,0 +1,234 @@
+from typing import Dict, List, Optional
+from collections import defaultdict
+from datetime import datetime
+import argparse
+import logging
+import multiprocessing
+import os
+import socket
+import time
+
+from sqlalchemy import func, select, update
+
+from app.core.config import settings
+from app.db.data_version import bump_data_version
+from app.db.session import SessionLocal
+from app.models.models import ScrapingLog, Source
+from app.services.scraping.base import BaseScraper
+from app.services.scraping.concurrency import fetch_concurrently
+from app.services.scraping.frontier import CrawlFrontier, LeasedTask
+from app.services.scraping.geocoding import create_geocoding_stage, log_geocoding_stats
+from app.services.scraping.persistence import EventBatchWriter
+from app.services.scraping.registry import get_scraper_class
+
+logger = logging.getLogger(__name__)
+
+
+class CrawlWorker:
+    """
+    Воркер, загружающий страницы событий из очереди обхода
+
+    Воркеров может быть сколько угодно на любых машинах с доступом к БД:
+    задачи распределяются через аренду в таблице crawl_frontier.
+    """
+
+    def __init__(
+        self,
+        worker_id: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        lease_seconds: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+    ):
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.batch_size = batch_size or settings.SCRAPING_FRONTIER_BATCH_SIZE
+        self.lease_seconds = lease_seconds or settings.SCRAPING_FRONTIER_LEASE_SECONDS
+        self.poll_interval = settings.SCRAPING_FRONTIER_POLL_SECONDS if poll_interval is None else poll_interval
+        self.db = SessionLocal()
+        self.frontier = CrawlFrontier(self.db)
+        self._scrapers: Dict[int, BaseScraper] = {}
+
+    def close(self) -> None:
+        for scraper in self._scrapers.values():
+            scraper.db.close()
+        self._scrapers.clear()
+        self.db.close()
+
+    def scraper_for(self, source_id: int) -> BaseScraper:
+        """
+        Скрапер источника (создается один раз на воркер)
+
+        Args:
+            source_id: ID источника
+
+        Returns:
+            Экземпляр скрапера
+        """
+        scraper = self._scrapers.get(source_id)
+        if scraper is None:
+            source = self.db.query(Source).filter(Source.source_id == source_id).one()
+            scraper = get_scraper_class(source.type)()
+            scraper.configure_rate_limit(source)
+            self._scrapers[source_id] = scraper
+        return scraper
+
+    def run_once(self) -> int:
+        """
+        Загрузка одной порции страниц из очереди
+
+        Returns:
+            Количество обработанных задач
+        """
+        tasks = self.frontier.lease(self.worker_id, self.batch_size, self.lease_seconds)
+
+        by_source: Dict[int, List[LeasedTask]] = defaultdict(list)
+        for task in tasks:
+            by_source[task.source_id].append(task)
+
+        for source_id, source_tasks in by_source.items():
+            try:
+                self.process(source_id, source_tasks)
+            except Exception as e:
+                logger.error(f"Error processing crawl tasks of source {source_id}: {str(e)}")
+                self.db.rollback()
+                self.frontier.fail(self.worker_id, [task.task_id for task in source_tasks], str(e))
+
+        return len(tasks)
+
+    def process(self, source_id: int, tasks: List[LeasedTask]) -> ScrapingLog:
+        """
+        Загрузка, разбор и сохранение страниц событий одного источника
+
+        Args:
+            source_id: ID источника
+            tasks: Задачи из очереди
+
+        Returns:
+            Запись ScrapingLog с результатами
+        """
+        start_time = datetime.utcnow()
+        scraper = self.scraper_for(source_id)
+        scraper._unchanged_urls = set()
+        scraper._empty_urls = set()
+        scraper._pending_cache = {}
+        by_url = {task.url: task for task in tasks}
+
+        geocoding = create_geocoding_stage(scraper.db)
+        writer = EventBatchWriter(scraper.db, source_id, geocoding=geocoding, on_saved=scraper.cache_saved_pages)
+        # URL, под которым событие задачи передано на запись
+        written: Dict[int, str] = {}
+        done: List[int] = []
+        failed: List[int] = []
+
+        for event_url, event_data in fetch_concurrently(by_url.keys(), scraper.fetch_event):
+            task = by_url[event_url]
+            if event_data:
+                event_data["listing_fingerprint"] = task.listing_fingerprint
+                normalized = scraper.normalize_event(event_data)
+                writer.add(normalized)
+                written[task.task_id] = normalized["original_url"]
+            elif event_url in scraper._unchanged_urls:
+                writer.touch(event_url, task.listing_fingerprint)
+                written[task.task_id] = event_url
+
+        writer.flush()
+        if geocoding:
+            log_geocoding_stats(geocoding)
+        if writer.added or writer.updated:
+            bump_data_version(scraper.db)
+            scraper.db.commit()
+
+        # Задача выполнена, только если ее событие действительно записано:
+        # ошибки записи возвращают страницу в очередь
+        for task in tasks:
+            if written.get(task.task_id) in writer.saved_urls:
+                done.append(task.task_id)
+            elif task.url in scraper._empty_urls:
+                # Страница загружена и разобрана, но события на ней нет - повтор не поможет
+                done.append(task.task_id)
+            else:
+                failed.append(task.task_id)
+        self.frontier.complete(self.worker_id, done)
+        self.frontier.fail(self.worker_id, failed, "failed to fetch or parse event page")
+
+        if writer.added or writer.updated:
+            self.credit_run(source_id, writer.added, writer.updated)
+
+        # Отдельный статус: порции воркеров не должны попадать в историю
+        # запусков, по которой планировщик подбирает интервал опроса
+        scraping_log = ScrapingLog(
+            source_id=source_id,
+            status="worker",
+            message=(
+                f"Worker {self.worker_id} fetched {len(tasks)} event pages from {scraper.source_name}"
+                f" ({len(scraper._unchanged_urls)} unchanged, {len(scraper._empty_urls)} without events,"
+                f" {writer.unchanged} with identical content, {len(failed)} failed)"
+            ),
+            events_found=len(tasks),
+            events_added=writer.added,
+            events_updated=writer.updated,
+            execution_time=(datetime.utcnow() - start_time).total_seconds(),
+        )
+        self.db.add(scraping_log)
+        self.db.commit()
+        return scraping_log
+
+    def credit_run(self, source_id: int, added: int, updated: int) -> None:
+        """
+        Учет найденных воркером изменений в последнем успешном запуске источника
+
+        Запуск только ставит страницы в очередь, поэтому без этого история
+        запусков показывала бы источник неизменным.
+
+        Args:
+            source_id: ID источника
+            added: Количество добавленных событий
+            updated: Количество измененных событий
+        """
+        latest_run = (
+            select(ScrapingLog.log_id)
+            .where(ScrapingLog.source_id == source_id, ScrapingLog.status == "success")
+            .order_by(ScrapingLog.created_at.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        self.db.execute(
+            update(ScrapingLog)
+            .where(ScrapingLog.log_id == latest_run)
+            .values(
+                events_added=func.coalesce(ScrapingLog.events_added, 0) + added,
+                events_updated=func.coalesce(ScrapingLog.events_updated, 0) + updated,
+            )
+        )
+
+    def run_forever(self) -> None:
+        """
+        Обработка очереди до остановки процесса
+        """
+        logger.info(f"Crawl worker {self.worker_id} started")
+        try:
+            while True:
+                if self.run_once() == 0:
+                    time.sleep(self.poll_interval)
+        finally:
+            self.close()
+
+
+def _worker_main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    CrawlWorker().run_forever()
+
+
+if __name__ == "__main__":
+    # Запуск воркеров: python -m app.services.scraping.worker --processes 4
+    parser = argparse.ArgumentParser(description="Crawl frontier workers")
+    parser.add_argument("--processes", type=int, default=1, help="number of worker processes")
+    args = parser.parse_args()
+
+    if args.processes <= 1:
+        _worker_main()
+    else:
+        processes = [multiprocessing.Process(target=_worker_main) for _ in range(args.processes)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
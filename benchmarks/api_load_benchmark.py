@@ -0,0 +1,254 @@
+"""
+Нагрузочный бенчмарк API: синхронные и асинхронные обработчики /events
+
+Для каждого режима (API_DB_ASYNC=false/true) запускается отдельный
+процесс uvicorn с одним воркером, кэш ответов и планировщик отключены,
+чтобы каждый запрос доходил до БД. Заданное число клиентов в течение
+--duration секунд без пауз запрашивают смесь ресурсов: страницу списка
+событий, карточку события, категории и временной ряд. Измеряются:
+
+- req/s — успешные ответы в секунду;
+- p50 / p99 — задержка ответа, мс;
+- errors — ответы с кодом, отличным от 200, и сетевые ошибки (по видам).
+
+Запросы идут в БД из SQLALCHEMY_DATABASE_URI, используйте отдельную базу.
+С флагом --seed N в пустую базу добавляется N синтетических событий.
+
+Запуск:
+    python -m benchmarks.api_load_benchmark [--concurrency 200] [--duration 20] [--seed 100000]
+"""
+from collections import Counter
+from typing import Dict, List, Optional
+import argparse
+import asyncio
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+from sqlalchemy import text
+
+from app.db.rollups import REBUILD_ROLLUPS
+from app.db.session import Base, engine
+
+SEED = """
+INSERT INTO sources (name, url, type, status, relevance_score, created_at, updated_at)
+SELECT 'Source ' || i, 'https://s' || i || '.example.com', 's' || i, 'active', 0, now(), now()
+FROM generate_series(1, 3) AS i;
+
+INSERT INTO events (
+    source_id, name, description, start_datetime_utc, location_text,
+    location_lat, location_lon, is_virtual, original_url, created_at, updated_at
+)
+SELECT (SELECT min(source_id) FROM sources) + i % 3, 'Event ' || i, 'Description ' || i,
+    now() - interval '30 days' + i * interval '5 minutes', 'Location ' || i % 100,
+    37.0 + (i * 7919 % 10007) / 10007.0, -122.5 + (i * 104729::bigint % 10009) / 10009.0,
+    i % 20 = 0, 'https://example.com/bench/' || i, now(), now()
+FROM generate_series(1, :rows) AS i;
+
+INSERT INTO event_analytics (event_id, category, created_at, updated_at)
+SELECT event_id, 'Category ' || event_id % 10, now(), now() FROM events;
+"""
+
+MODES = {"sync": "false", "async": "true"}
+
+
+def seed_database(rows: int) -> None:
+    """
+    Заполнение пустой базы синтетическими событиями
+
+    Args:
+        rows: Число событий
+    """
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        if conn.execute(text("SELECT EXISTS (SELECT 1 FROM events)")).scalar():
+            return
+        # Триггеры поиска и сводки замедлили бы загрузку; сводка пересчитывается после нее
+        for table in ("events", "event_analytics"):
+            conn.execute(text(f"ALTER TABLE {table} DISABLE TRIGGER USER"))
+        for statement in SEED.split(";\n"):
+            if statement.strip():
+                conn.execute(text(statement), {"rows": rows})
+        for table in ("events", "event_analytics"):
+            conn.execute(text(f"ALTER TABLE {table} ENABLE TRIGGER USER"))
+        conn.execute(text(REBUILD_ROLLUPS))
+    with engine.connect() as conn:
+        conn.execution_options(isolation_level="AUTOCOMMIT").execute(text("VACUUM ANALYZE"))
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(mode: str, port: int) -> subprocess.Popen:
+    """
+    Запуск API в отдельном процессе uvicorn
+
+    Args:
+        mode: 'sync' или 'async'
+        port: Порт
+
+    Returns:
+        Процесс сервера, который уже отвечает на запросы
+    """
+    env = dict(
+        os.environ,
+        API_DB_ASYNC=MODES[mode],
+        API_CACHE_ENABLED="false",
+        SCRAPING_SCHEDULER_ENABLED="false",
+    )
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/", timeout=1)
+            return process
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"API server ({mode}) did not start on port {port}")
+
+
+def request_mix(event_ids: List[int]) -> List[str]:
+    """
+    Смесь запросов: список, карточки событий и агрегаты
+
+    Args:
+        event_ids: ID событий для запросов карточек
+
+    Returns:
+        Пути запросов
+    """
+    return [
+        "/api/events/events?include_total=false&page_size=20",
+        "/api/events/events?is_virtual=true&include_total=false",
+        "/api/events/analytics/categories",
+        "/api/events/analytics/timeseries?interval=week",
+    ] + [f"/api/events/events/{event_id}" for event_id in event_ids]
+
+
+async def _client(client: httpx.AsyncClient, paths: List[str], deadline: float, latencies: List[float], errors: Counter):
+    while time.perf_counter() < deadline:
+        path = random.choice(paths)
+        started = time.perf_counter()
+        try:
+            response = await client.get(path)
+        except httpx.HTTPError as exc:
+            errors[type(exc).__name__] += 1
+            continue
+        if response.status_code == 200:
+            latencies.append(time.perf_counter() - started)
+        else:
+            errors[str(response.status_code)] += 1
+
+
+async def generate_load(base_url: str, paths: List[str], concurrency: int, duration: float, warmup: float) -> Dict:
+    """
+    Нагрузка заданным числом одновременных клиентов
+
+    Args:
+        base_url: Адрес API
+        paths: Пути запросов
+        concurrency: Число одновременных клиентов
+        duration: Длительность измерения, с
+        warmup: Длительность прогрева (не учитывается), с
+
+    Returns:
+        Строка результатов
+    """
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    timeout = httpx.Timeout(60.0)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout) as client:
+        warm_deadline = time.perf_counter() + warmup
+        await asyncio.gather(*(_client(client, paths, warm_deadline, [], Counter()) for _ in range(concurrency)))
+
+        latencies: List[float] = []
+        errors: Counter = Counter()
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            _client(client, paths, started + duration, latencies, errors) for _ in range(concurrency)
+        ))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else None,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000 if latencies else None,
+        "errors": sum(errors.values()),
+        "error_kinds": dict(errors),
+    }
+
+
+def run(concurrency: int = 200, duration: float = 20, warmup: float = 3, modes: List[str] = None) -> List[Dict]:
+    """
+    Запуск бенчмарка для каждого режима обработчиков
+
+    Args:
+        concurrency: Число одновременных клиентов
+        duration: Длительность измерения, с
+        warmup: Длительность прогрева, с
+        modes: Режимы ('sync', 'async')
+
+    Returns:
+        Строки результатов
+    """
+    with engine.connect() as conn:
+        event_ids = list(conn.execute(text("SELECT event_id FROM events ORDER BY random() LIMIT 200")).scalars())
+    engine.dispose()
+    paths = request_mix(event_ids)
+
+    rows = []
+    for mode in modes or list(MODES):
+        port = _free_port()
+        server = start_server(mode, port)
+        try:
+            result = asyncio.run(generate_load(f"http://127.0.0.1:{port}", paths, concurrency, duration, warmup))
+        finally:
+            server.terminate()
+            server.wait()
+        rows.append(dict(result, mode=mode))
+    return rows
+
+
+def _ms(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.1f}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark sync vs async API handlers under concurrent load")
+    parser.add_argument("--concurrency", type=int, default=200, help="number of concurrent clients")
+    parser.add_argument("--duration", type=float, default=20, help="measurement time per mode, seconds")
+    parser.add_argument("--warmup", type=float, default=3, help="warm-up time per mode, seconds")
+    parser.add_argument("--modes", default="sync,async", help="comma-separated modes: sync, async")
+    parser.add_argument("--seed", type=int, default=0, help="add N synthetic events if the database is empty")
+    args = parser.parse_args()
+
+    if args.seed:
+        seed_database(args.seed)
+
+    rows = run(args.concurrency, args.duration, args.warmup, args.modes.split(","))
+
+    print(f"{'mode':<6} {'clients':>8} {'requests':>9} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for row in rows:
+        print(
+            f"{row['mode']:<6} {args.concurrency:>8} {row['requests']:>9} {row['rps']:>8.1f} "
+            f"{_ms(row['p50_ms']):>8} {_ms(row['p99_ms']):>8} {row['errors']:>7}"
+        )
+        if row["error_kinds"]:
+            print(f"       errors by kind: {row['error_kinds']}")
+
+
+if __name__ == "__main__":
+    main()
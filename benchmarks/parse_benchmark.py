@@ -0,0 +1,139 @@
+"""
+Бенчмарк разбора HTML-страниц источников
+
+Сравнивает время и пиковое потребление памяти при разборе сохраненных
+страниц (tests/fixtures/pages) разными способами:
+
+- html.parser — полный разбор встроенным парсером (исходное поведение);
+- lxml — полный разбор парсером lxml;
+- lxml+strainer — разбор lxml только элементов, нужных экстракторам;
+- structured-data — извлечение события из JSON-LD/__NEXT_DATA__ без DOM
+  (только для страниц событий, где такие данные есть).
+
+Запуск:
+    python -m benchmarks.parse_benchmark [--repeat 20]
+"""
+from typing import Callable, Dict, List, Optional, Tuple
+import argparse
+import os
+import statistics
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup
+
+from app.services.scraping.registry import available_scrapers
+from app.services.scraping.structured_data import extract_structured_event, is_complete
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests", "fixtures", "pages")
+
+
+def _modes(strainer) -> List[Tuple[str, Callable[[str], BeautifulSoup]]]:
+    return [
+        ("html.parser", lambda markup: BeautifulSoup(markup, "html.parser")),
+        ("lxml", lambda markup: BeautifulSoup(markup, "lxml")),
+        ("lxml+strainer", lambda markup: BeautifulSoup(markup, "lxml", parse_only=strainer)),
+    ]
+
+
+def _extract(scraper, kind: str, soup: BeautifulSoup, url: str):
+    if kind == "listing":
+        return [scraper.extract_card_url(card) for card in scraper.extract_cards(soup)]
+    return scraper.extract_event(soup, url)
+
+
+def _measure(parse: Callable[[str], BeautifulSoup], extract: Callable[[BeautifulSoup], object],
+             markup: str, repeat: int) -> Tuple[float, float, object]:
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = extract(parse(markup))
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    extract(parse(markup))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return statistics.median(timings) * 1000, peak / 1024, result
+
+
+def run(repeat: int = 20, fixtures_dir: str = FIXTURES_DIR) -> List[Dict]:
+    """
+    Запуск бенчмарка по всем сохраненным страницам
+
+    Args:
+        repeat: Число повторов разбора каждой страницы
+        fixtures_dir: Каталог с сохраненными страницами
+
+    Returns:
+        Строки результатов
+    """
+    rows = []
+    scrapers = available_scrapers()
+
+    for filename in sorted(os.listdir(fixtures_dir)):
+        if not filename.endswith(".html"):
+            continue
+        source_type, kind = filename[:-len(".html")].split("_", 1)
+        if source_type not in scrapers:
+            continue
+
+        scraper_class = scrapers[source_type]
+        # Экстракторам не нужны БД и HTTP-клиент
+        scraper = scraper_class.__new__(scraper_class)
+        strainer = scraper_class.listing_parse_only if kind == "listing" else scraper_class.detail_parse_only
+
+        with open(os.path.join(fixtures_dir, filename), encoding="utf-8") as f:
+            markup = f.read()
+
+        url = f"{scraper_class.base_url}/fixture/{filename}"
+        baseline: Optional[object] = None
+
+        for mode, parse in _modes(strainer):
+            ms, peak_kb, result = _measure(
+                parse, lambda soup: _extract(scraper, kind, soup, url), markup, repeat
+            )
+            if baseline is None:
+                baseline = result
+            rows.append({
+                "page": filename,
+                "mode": mode,
+                "ms": ms,
+                "peak_kb": peak_kb,
+                "same_result": result == baseline,
+            })
+
+        if kind == "detail" and is_complete(extract_structured_event(markup, url)):
+            raw = markup.encode("utf-8")
+            ms, peak_kb, result = _measure(lambda data: data, lambda data: extract_structured_event(data, url), raw, repeat)
+            rows.append({
+                "page": filename,
+                "mode": "structured-data",
+                "ms": ms,
+                "peak_kb": peak_kb,
+                # Встроенные данные точнее селекторов, поэтому сравниваем только название
+                "same_result": result["name"] == baseline["name"],
+            })
+
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark HTML parsing of saved source pages")
+    parser.add_argument("--repeat", type=int, default=20, help="parse repetitions per page and mode")
+    args = parser.parse_args()
+
+    rows = run(repeat=args.repeat)
+
+    print(f"{'page':<26} {'mode':<14} {'median ms':>10} {'peak KiB':>10} {'same result':>12}")
+    for row in rows:
+        print(
+            f"{row['page']:<26} {row['mode']:<14} {row['ms']:>10.2f} "
+            f"{row['peak_kb']:>10.0f} {str(row['same_result']):>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
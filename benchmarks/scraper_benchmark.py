@@ -0,0 +1,173 @@
+"""
+Бенчмарк пропускной способности скраперов на записанных страницах
+
+Страницы источника воспроизводятся локальным HTTP-сервером
+(app.services.scraping.replay), поэтому сеть не нужна. Для каждого
+источника измеряются:
+
+- pages/s и events/s — полный цикл загрузки и разбора списка и страниц
+  событий через HttpClient и пул потоков;
+- parse CPU — процессорное время разбора всех страниц (ответы берутся
+  прямо из архива, без сокетов);
+- DB write — время пакетного сохранения событий (только с флагом --db,
+  запись идет в БД из SQLALCHEMY_DATABASE_URI, используйте отдельную базу).
+
+Без --archives используются сохраненные страницы из tests/fixtures/pages.
+Архивы настоящих страниц записываются командой
+`python -m app.services.scraping.replay record <source> <source>.zip`.
+
+Запуск:
+    python -m benchmarks.scraper_benchmark [--archives DIR] [--repeat 3] [--db]
+"""
+from typing import Dict, List, Optional
+import argparse
+import os
+import statistics
+import time
+
+from app.services.scraping.concurrency import fetch_concurrently
+from app.services.scraping.dates import date_parsing_stats
+from app.services.scraping.persistence import EventBatchWriter
+from app.services.scraping.registry import available_scrapers
+from app.services.scraping.replay import (
+    ArchiveHttpClient,
+    ReplayArchive,
+    ReplayHttpClient,
+    ReplayServer,
+    build_fixture_archive,
+)
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests", "fixtures", "pages")
+
+
+def _load_archive(scraper, archives_dir: Optional[str]) -> Optional[ReplayArchive]:
+    if archives_dir:
+        path = os.path.join(archives_dir, f"{scraper.source_type}.zip")
+        return ReplayArchive.load(path) if os.path.exists(path) else None
+
+    listing = os.path.join(PAGES_DIR, f"{scraper.source_type}_listing.html")
+    detail = os.path.join(PAGES_DIR, f"{scraper.source_type}_detail.html")
+    if not (os.path.exists(listing) and os.path.exists(detail)):
+        return None
+    with open(listing, encoding="utf-8") as f:
+        listing_markup = f.read()
+    with open(detail, encoding="utf-8") as f:
+        detail_markup = f.read()
+    return build_fixture_archive(scraper, listing_markup, detail_markup)
+
+
+def _crawl(scraper) -> List[Dict]:
+    # Без инкрементального фильтра: измеряем загрузку и разбор всех страниц
+    urls = [url for url, _ in scraper.iter_cards()]
+    return [
+        scraper.normalize_event(event_data)
+        for _, event_data in fetch_concurrently(urls, scraper.fetch_event)
+        if event_data
+    ]
+
+
+def benchmark_source(scraper_class, archive: ReplayArchive, repeat: int, write_db: bool) -> Dict:
+    """
+    Измерение одного источника
+
+    Args:
+        scraper_class: Класс скрапера
+        archive: Записанные страницы источника
+        repeat: Число повторов
+        write_db: Измерять ли сохранение в БД
+
+    Returns:
+        Строка результатов
+    """
+    scraper = scraper_class()
+    wall, cpu = [], []
+    events: List[Dict] = []
+
+    with ReplayServer(archive) as server:
+        for _ in range(repeat):
+            # Новый клиент на каждый повтор: учитываем и установку соединений
+            scraper.http = ReplayHttpClient(server.url)
+            started = time.perf_counter()
+            events = _crawl(scraper)
+            wall.append(time.perf_counter() - started)
+            scraper.http.close()
+
+    scraper.http = ArchiveHttpClient(archive)
+    for _ in range(repeat):
+        started = time.process_time()
+        _crawl(scraper)
+        cpu.append(time.process_time() - started)
+
+    db_ms = None
+    if write_db:
+        source = scraper.get_source()
+        writer = EventBatchWriter(scraper.db, source.source_id)
+        started = time.perf_counter()
+        for event_data in events:
+            writer.add(event_data)
+        writer.flush()
+        db_ms = (time.perf_counter() - started) * 1000
+    scraper.db.close()
+
+    pages = len(archive)
+    wall_s = statistics.median(wall)
+    return {
+        "source": scraper.source_type,
+        "pages": pages,
+        "events": len(events),
+        "pages_per_s": pages / wall_s,
+        "events_per_s": len(events) / wall_s,
+        "parse_cpu_ms": statistics.median(cpu) * 1000,
+        "db_write_ms": db_ms,
+    }
+
+
+def run(archives_dir: Optional[str] = None, repeat: int = 3, write_db: bool = False) -> List[Dict]:
+    """
+    Запуск бенчмарка по всем источникам, для которых есть записанные страницы
+
+    Args:
+        archives_dir: Каталог с архивами <source>.zip (None - сохраненные страницы из тестов)
+        repeat: Число повторов
+        write_db: Измерять ли сохранение в БД
+
+    Returns:
+        Строки результатов
+    """
+    rows = []
+    for source_type, scraper_class in sorted(available_scrapers().items()):
+        scraper = scraper_class()
+        archive = _load_archive(scraper, archives_dir)
+        scraper.db.close()
+        if archive is None:
+            continue
+        rows.append(benchmark_source(scraper_class, archive, repeat, write_db))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark scraper throughput on recorded pages")
+    parser.add_argument("--archives", default=None, help="directory with <source>.zip archives")
+    parser.add_argument("--repeat", type=int, default=3, help="repetitions per source")
+    parser.add_argument("--db", action="store_true", help="also measure batch writes to the configured database")
+    args = parser.parse_args()
+
+    rows = run(archives_dir=args.archives, repeat=args.repeat, write_db=args.db)
+
+    print(f"{'source':<12} {'pages':>6} {'events':>7} {'pages/s':>9} {'events/s':>9} {'parse CPU ms':>13} {'DB write ms':>12}")
+    for row in rows:
+        db_write = f"{row['db_write_ms']:.1f}" if row["db_write_ms"] is not None else "-"
+        print(
+            f"{row['source']:<12} {row['pages']:>6} {row['events']:>7} {row['pages_per_s']:>9.1f} "
+            f"{row['events_per_s']:>9.1f} {row['parse_cpu_ms']:>13.1f} {db_write:>12}"
+        )
+
+    stats = date_parsing_stats()
+    print(
+        f"date cache: {stats['hits']} hits, {stats['misses']} misses, "
+        f"hit rate {stats['hit_rate']:.1%}, {stats['failures']} unparsed"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""Уникальный индекс events.original_url для пакетного upsert
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Удаляем дубликаты, оставляя самую свежую запись для каждого URL
+    op.execute(
+        """
+        DELETE FROM events a
+        USING events b
+        WHERE a.original_url = b.original_url
+          AND a.event_id < b.event_id
+        """
+    )
+    op.create_index("ix_events_original_url", "events", ["original_url"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_events_original_url", table_name="events")
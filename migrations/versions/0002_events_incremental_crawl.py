@@ -0,0 +1,23 @@
+"""Отпечаток карточки и время последней загрузки события для инкрементального сбора
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("events", sa.Column("listing_fingerprint", sa.String(length=64), nullable=True))
+    op.add_column("events", sa.Column("last_scraped_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("events", "last_scraped_at")
+    op.drop_column("events", "listing_fingerprint")
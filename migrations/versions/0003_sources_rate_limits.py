@@ -0,0 +1,23 @@
+"""Лимиты частоты запросов для источника
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("sources", sa.Column("rate_limit_per_second", sa.Float(), nullable=True))
+    op.add_column("sources", sa.Column("rate_limit_burst", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("sources", "rate_limit_burst")
+    op.drop_column("sources", "rate_limit_per_second")
@@ -0,0 +1,52 @@
+"""Очередь обхода (crawl frontier) для распределенной загрузки страниц событий
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "crawl_frontier",
+        sa.Column("task_id", sa.Integer(), primary_key=True),
+        sa.Column("source_id", sa.Integer(), sa.ForeignKey("sources.source_id"), nullable=False),
+        sa.Column("url", sa.String(length=512), nullable=False, unique=True),
+        sa.Column("priority", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("status", sa.String(length=20), nullable=False, server_default="pending"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("listing_fingerprint", sa.String(length=64), nullable=True),
+        sa.Column("lease_owner", sa.String(length=255), nullable=True),
+        sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("available_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_crawl_frontier_task_id", "crawl_frontier", ["task_id"])
+    op.create_index(
+        "ix_crawl_frontier_pending",
+        "crawl_frontier",
+        [sa.text("priority DESC"), "task_id"],
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+    op.create_index(
+        "ix_crawl_frontier_lease_expires_at",
+        "crawl_frontier",
+        ["lease_expires_at"],
+        postgresql_where=sa.text("status = 'leased'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_crawl_frontier_lease_expires_at", table_name="crawl_frontier")
+    op.drop_index("ix_crawl_frontier_pending", table_name="crawl_frontier")
+    op.drop_index("ix_crawl_frontier_task_id", table_name="crawl_frontier")
+    op.drop_table("crawl_frontier")
@@ -0,0 +1,20 @@
+"""Индекс (start_datetime_utc, event_id) для постраничного вывода событий по курсору
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_events_start_datetime_event_id", "events", ["start_datetime_utc", "event_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_events_start_datetime_event_id", table_name="events")
@@ -0,0 +1,89 @@
+"""Полнотекстовый поиск событий (tsvector + GIN) и индексы pg_trgm
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+# Копия app/db/search.py на момент миграции
+SEARCH_VECTOR_FUNCTION = """
+CREATE OR REPLACE FUNCTION event_search_vector(
+    p_event_id integer, p_name text, p_organizer text, p_description text
+) RETURNS tsvector LANGUAGE sql STABLE AS $$
+    SELECT
+        setweight(to_tsvector('english', coalesce(p_name, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(p_organizer, '')), 'B')
+        || setweight(to_tsvector('english', coalesce((
+            SELECT array_to_string(tags, ' ') FROM event_analytics
+            WHERE event_id = p_event_id AND tags IS NOT NULL
+            LIMIT 1
+        ), '')), 'B')
+        || setweight(to_tsvector('english', coalesce(p_description, '')), 'C')
+$$;
+
+CREATE OR REPLACE FUNCTION events_search_vector_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.search_vector := event_search_vector(NEW.event_id, NEW.name, NEW.organizer, NEW.description);
+    RETURN NEW;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION event_analytics_search_vector_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    target_id integer := CASE WHEN TG_OP = 'DELETE' THEN OLD.event_id ELSE NEW.event_id END;
+BEGIN
+    UPDATE events
+    SET search_vector = event_search_vector(event_id, name, organizer, description)
+    WHERE event_id = target_id;
+    RETURN NULL;
+END
+$$;
+"""
+
+SEARCH_VECTOR_TRIGGERS = """
+CREATE TRIGGER events_search_vector_update
+    BEFORE INSERT OR UPDATE OF name, organizer, description ON events
+    FOR EACH ROW EXECUTE FUNCTION events_search_vector_trigger();
+
+CREATE TRIGGER event_analytics_search_vector_update
+    AFTER INSERT OR DELETE OR UPDATE OF tags ON event_analytics
+    FOR EACH ROW EXECUTE FUNCTION event_analytics_search_vector_trigger();
+"""
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.add_column("events", sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True))
+    op.execute(SEARCH_VECTOR_FUNCTION)
+    op.execute(SEARCH_VECTOR_TRIGGERS)
+    op.execute("UPDATE events SET search_vector = event_search_vector(event_id, name, organizer, description)")
+
+    op.create_index("ix_events_search_vector", "events", ["search_vector"], postgresql_using="gin")
+    op.create_index(
+        "ix_events_name_trgm", "events", ["name"],
+        postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_events_location_text_trgm", "events", ["location_text"],
+        postgresql_using="gin", postgresql_ops={"location_text": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_events_location_text_trgm", table_name="events")
+    op.drop_index("ix_events_name_trgm", table_name="events")
+    op.drop_index("ix_events_search_vector", table_name="events")
+    op.execute("DROP TRIGGER IF EXISTS event_analytics_search_vector_update ON event_analytics")
+    op.execute("DROP TRIGGER IF EXISTS events_search_vector_update ON events")
+    op.execute("DROP FUNCTION IF EXISTS event_analytics_search_vector_trigger()")
+    op.execute("DROP FUNCTION IF EXISTS events_search_vector_trigger()")
+    op.execute("DROP FUNCTION IF EXISTS event_search_vector(integer, text, text, text)")
+    op.drop_column("events", "search_vector")
@@ -0,0 +1,44 @@
+"""Составные и частичные индексы под запросы API и планировщика
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_events_virtual_start_datetime_event_id",
+        "events",
+        ["start_datetime_utc", "event_id"],
+        postgresql_where=sa.text("is_virtual"),
+    )
+    op.create_index("ix_events_updated_at", "events", ["updated_at"])
+    op.create_index("ix_event_analytics_event_id", "event_analytics", ["event_id"])
+    op.create_index("ix_event_analytics_category_event_id", "event_analytics", ["category", "event_id"])
+    op.create_index(
+        "ix_trend_events_trend_id_relevance_score",
+        "trend_events",
+        ["trend_id", sa.text("relevance_score DESC")],
+    )
+    op.create_index("ix_trend_events_event_id", "trend_events", ["event_id"])
+    op.create_index("ix_scraping_logs_source_id_created_at", "scraping_logs", ["source_id", "created_at"])
+    op.create_index("ix_scraping_logs_created_at", "scraping_logs", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_scraping_logs_created_at", table_name="scraping_logs")
+    op.drop_index("ix_scraping_logs_source_id_created_at", table_name="scraping_logs")
+    op.drop_index("ix_trend_events_event_id", table_name="trend_events")
+    op.drop_index("ix_trend_events_trend_id_relevance_score", table_name="trend_events")
+    op.drop_index("ix_event_analytics_category_event_id", table_name="event_analytics")
+    op.drop_index("ix_event_analytics_event_id", table_name="event_analytics")
+    op.drop_index("ix_events_updated_at", table_name="events")
+    op.drop_index("ix_events_virtual_start_datetime_event_id", table_name="events")
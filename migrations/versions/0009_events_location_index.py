@@ -0,0 +1,26 @@
+"""GiST-индекс по координатам события для поиска по радиусу и прямоугольнику
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_events_location_point",
+        "events",
+        [sa.text("point(location_lon, location_lat)")],
+        postgresql_using="gist",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_events_location_point", table_name="events")
@@ -0,0 +1,30 @@
+"""Кэш геокодирования адресов событий
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "geocode_cache",
+        sa.Column("address_key", sa.String(length=512), primary_key=True),
+        sa.Column("location_lat", sa.Float(), nullable=True),
+        sa.Column("location_lon", sa.Float(), nullable=True),
+        sa.Column("provider", sa.String(length=50), nullable=False),
+        sa.Column("hits", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_hit_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("geocode_cache")
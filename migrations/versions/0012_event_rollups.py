@@ -0,0 +1,229 @@
+"""Сводка числа событий по дням, категориям, источникам и формату
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0012"
+down_revision = "0011"
+branch_labels = None
+depends_on = None
+
+# Копия app/db/rollups.py на момент миграции
+ROLLUP_FUNCTIONS = """
+CREATE OR REPLACE FUNCTION events_rollup_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO event_rollups AS r (day, category, source_id, is_virtual, event_count)
+    SELECT day, category, source_id, is_virtual, sum(delta) FROM (
+    SELECT (e.start_datetime_utc AT TIME ZONE 'UTC')::date AS day,
+    coalesce(a.category, '') AS category,
+    coalesce(e.source_id, 0) AS source_id,
+    coalesce(e.is_virtual, false) AS is_virtual,
+    1 AS delta
+FROM new_rows AS e LEFT JOIN event_analytics AS a ON a.event_id = e.event_id
+    ) AS d
+    GROUP BY day, category, source_id, is_virtual
+    HAVING sum(delta) <> 0
+    ORDER BY day, category, source_id, is_virtual
+    ON CONFLICT (day, category, source_id, is_virtual)
+    DO UPDATE SET event_count = r.event_count + excluded.event_count;
+    ELSE
+        INSERT INTO event_rollups AS r (day, category, source_id, is_virtual, event_count)
+    SELECT day, category, source_id, is_virtual, sum(delta) FROM (
+    SELECT (e.start_datetime_utc AT TIME ZONE 'UTC')::date AS day,
+    coalesce(a.category, '') AS category,
+    coalesce(e.source_id, 0) AS source_id,
+    coalesce(e.is_virtual, false) AS is_virtual,
+    -1 AS delta
+FROM old_rows AS e LEFT JOIN event_analytics AS a ON a.event_id = e.event_id
+    UNION ALL
+    SELECT (e.start_datetime_utc AT TIME ZONE 'UTC')::date AS day,
+    coalesce(a.category, '') AS category,
+    coalesce(e.source_id, 0) AS source_id,
+    coalesce(e.is_virtual, false) AS is_virtual,
+    1 AS delta
+FROM new_rows AS e LEFT JOIN event_analytics AS a ON a.event_id = e.event_id
+    ) AS d
+    GROUP BY day, category, source_id, is_virtual
+    HAVING sum(delta) <> 0
+    ORDER BY day, category, source_id, is_virtual
+    ON CONFLICT (day, category, source_id, is_virtual)
+    DO UPDATE SET event_count = r.event_count + excluded.event_count;
+    END IF;
+    RETURN NULL;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION events_rollup_delete_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO event_rollups AS r (day, category, source_id, is_virtual, event_count)
+    SELECT day, category, source_id, is_virtual, sum(delta) FROM (
+    SELECT (e.start_datetime_utc AT TIME ZONE 'UTC')::date AS day,
+    coalesce(a.category, '') AS category,
+    coalesce(e.source_id, 0) AS source_id,
+    coalesce(e.is_virtual, false) AS is_virtual,
+    -1 AS delta
+FROM (SELECT OLD.event_id, OLD.start_datetime_utc, OLD.source_id, OLD.is_virtual) AS e LEFT JOIN event_analytics AS a ON a.event_id = e.event_id
+    ) AS d
+    GROUP BY day, category, source_id, is_virtual
+    HAVING sum(delta) <> 0
+    ORDER BY day, category, source_id, is_virtual
+    ON CONFLICT (day, category, source_id, is_virtual)
+    DO UPDATE SET event_count = r.event_count + excluded.event_count;
+    RETURN OLD;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION event_analytics_rollup_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO event_rollups AS r (day, category, source_id, is_virtual, event_count)
+    SELECT day, category, source_id, is_virtual, sum(delta) FROM (
+    SELECT (e.start_datetime_utc AT TIME ZONE 'UTC')::date AS day,
+    coalesce(a.category, '') AS category,
+    coalesce(e.source_id, 0) AS source_id,
+    coalesce(e.is_virtual, false) AS is_virtual,
+    -1 AS delta
+FROM events AS e LEFT JOIN (SELECT event_id, category FROM event_analytics WHERE event_id IN (SELECT event_id FROM new_rows) AND analytics_id NOT IN (SELECT analytics_id FROM new_rows)) AS a ON a.event_id = e.event_id
+WHERE e.event_id IN (SELECT event_id FROM new_rows)
+    UNION ALL
+    SELECT (e.start_datetime_utc AT TIME ZONE 'UTC')::date AS day,
+    coalesce(a.category, '') AS category,
+    coalesce(e.source_id, 0) AS source_id,
+    coalesce(e.is_virtual, false) AS is_virtual,
+    1 AS delta
+FROM events AS e LEFT JOIN (SELECT event_id, category FROM event_analytics WHERE event_id IN (SELECT event_id FROM new_rows)) AS a ON a.event_id = e.event_id
+WHERE e.event_id IN (SELECT event_id FROM new_rows)
+    ) AS d
+    GROUP BY day, category, source_id, is_virtual
+    HAVING sum(delta) <> 0
+    ORDER BY day, category, source_id, is_virtual
+    ON CONFLICT (day, category, source_id, is_virtual)
+    DO UPDATE SET event_count = r.event_count + excluded.event_count;
+    ELSIF TG_OP = 'UPDATE' THEN
+        INSERT INTO event_rollups AS r (day, category, source_id, is_virtual, event_count)
+    SELECT day, category, source_id, is_virtual, sum(delta) FROM (
+    SELECT (e.start_datetime_utc AT TIME ZONE 'UTC')::date AS day,
+    coalesce(a.category, '') AS category,
+    coalesce(e.source_id, 0) AS source_id,
+    coalesce(e.is_virtual, false) AS is_virtual,
+    -1 AS delta
+FROM events AS e LEFT JOIN (SELECT event_id, category FROM event_analytics WHERE event_id IN (SELECT event_id FROM new_rows UNION SELECT event_id FROM old_rows) AND analytics_id NOT IN (SELECT analytics_id FROM new_rows) UNION ALL SELECT event_id, category FROM old_rows) AS a ON a.event_id = e.event_id
+WHERE e.event_id IN (SELECT event_id FROM new_rows UNION SELECT event_id FROM old_rows)
+    UNION ALL
+    SELECT (e.start_datetime_utc AT TIME ZONE 'UTC')::date AS day,
+    coalesce(a.category, '') AS category,
+    coalesce(e.source_id, 0) AS source_id,
+    coalesce(e.is_virtual, false) AS is_virtual,
+    1 AS delta
+FROM events AS e LEFT JOIN (SELECT event_id, category FROM event_analytics WHERE event_id IN (SELECT event_id FROM new_rows UNION SELECT event_id FROM old_rows)) AS a ON a.event_id = e.event_id
+WHERE e.event_id IN (SELECT event_id FROM new_rows UNION SELECT event_id FROM old_rows)
+    ) AS d
+    GROUP BY day, category, source_id, is_virtual
+    HAVING sum(delta) <> 0
+    ORDER BY day, category, source_id, is_virtual
+    ON CONFLICT (day, category, source_id, is_virtual)
+    DO UPDATE SET event_count = r.event_count + excluded.event_count;
+    ELSE
+        INSERT INTO event_rollups AS r (day, category, source_id, is_virtual, event_count)
+    SELECT day, category, source_id, is_virtual, sum(delta) FROM (
+    SELECT (e.start_datetime_utc AT TIME ZONE 'UTC')::date AS day,
+    coalesce(a.category, '') AS category,
+    coalesce(e.source_id, 0) AS source_id,
+    coalesce(e.is_virtual, false) AS is_virtual,
+    -1 AS delta
+FROM events AS e LEFT JOIN (SELECT event_id, category FROM event_analytics WHERE event_id IN (SELECT event_id FROM old_rows) UNION ALL SELECT event_id, category FROM old_rows) AS a ON a.event_id = e.event_id
+WHERE e.event_id IN (SELECT event_id FROM old_rows)
+    UNION ALL
+    SELECT (e.start_datetime_utc AT TIME ZONE 'UTC')::date AS day,
+    coalesce(a.category, '') AS category,
+    coalesce(e.source_id, 0) AS source_id,
+    coalesce(e.is_virtual, false) AS is_virtual,
+    1 AS delta
+FROM events AS e LEFT JOIN (SELECT event_id, category FROM event_analytics WHERE event_id IN (SELECT event_id FROM old_rows)) AS a ON a.event_id = e.event_id
+WHERE e.event_id IN (SELECT event_id FROM old_rows)
+    ) AS d
+    GROUP BY day, category, source_id, is_virtual
+    HAVING sum(delta) <> 0
+    ORDER BY day, category, source_id, is_virtual
+    ON CONFLICT (day, category, source_id, is_virtual)
+    DO UPDATE SET event_count = r.event_count + excluded.event_count;
+    END IF;
+    RETURN NULL;
+END
+$$;
+"""
+
+ROLLUP_TRIGGERS = """
+CREATE TRIGGER events_rollup_insert
+    AFTER INSERT ON events REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION events_rollup_trigger();
+
+CREATE TRIGGER events_rollup_update
+    AFTER UPDATE ON events REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION events_rollup_trigger();
+
+CREATE TRIGGER events_rollup_delete
+    BEFORE DELETE ON events
+    FOR EACH ROW EXECUTE FUNCTION events_rollup_delete_trigger();
+
+CREATE TRIGGER event_analytics_rollup_insert
+    AFTER INSERT ON event_analytics REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION event_analytics_rollup_trigger();
+
+CREATE TRIGGER event_analytics_rollup_update
+    AFTER UPDATE ON event_analytics REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION event_analytics_rollup_trigger();
+
+CREATE TRIGGER event_analytics_rollup_delete
+    AFTER DELETE ON event_analytics REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION event_analytics_rollup_trigger();
+"""
+
+REBUILD_ROLLUPS = """
+DELETE FROM event_rollups;
+INSERT INTO event_rollups AS r (day, category, source_id, is_virtual, event_count)
+    SELECT day, category, source_id, is_virtual, sum(delta) FROM (
+    SELECT (e.start_datetime_utc AT TIME ZONE 'UTC')::date AS day,
+    coalesce(a.category, '') AS category,
+    coalesce(e.source_id, 0) AS source_id,
+    coalesce(e.is_virtual, false) AS is_virtual,
+    1 AS delta
+FROM events AS e LEFT JOIN event_analytics AS a ON a.event_id = e.event_id
+    ) AS d
+    GROUP BY day, category, source_id, is_virtual
+    HAVING sum(delta) <> 0
+    ORDER BY day, category, source_id, is_virtual
+    ON CONFLICT (day, category, source_id, is_virtual)
+    DO UPDATE SET event_count = r.event_count + excluded.event_count;
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        "event_rollups",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("category", sa.String(length=100), primary_key=True),
+        sa.Column("source_id", sa.Integer(), primary_key=True),
+        sa.Column("is_virtual", sa.Boolean(), primary_key=True),
+        sa.Column("event_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.execute(ROLLUP_FUNCTIONS)
+    op.execute(ROLLUP_TRIGGERS)
+    op.execute(REBUILD_ROLLUPS)
+
+
+def downgrade() -> None:
+    for table, action in (
+        ("event_analytics", "delete"), ("event_analytics", "update"), ("event_analytics", "insert"),
+        ("events", "delete"), ("events", "update"), ("events", "insert"),
+    ):
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_rollup_{action} ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS event_analytics_rollup_trigger()")
+    op.execute("DROP FUNCTION IF EXISTS events_rollup_delete_trigger()")
+    op.execute("DROP FUNCTION IF EXISTS events_rollup_trigger()")
+    op.drop_table("event_rollups")
@@ -0,0 +1,67 @@
+"""Триггеры поискового вектора пропускают обновления без изменений
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0013"
+down_revision = "0012"
+branch_labels = None
+depends_on = None
+
+# Копия app/db/search.py на момент миграции
+SEARCH_VECTOR_TRIGGERS = """
+CREATE TRIGGER events_search_vector_insert
+    BEFORE INSERT ON events
+    FOR EACH ROW EXECUTE FUNCTION events_search_vector_trigger();
+
+CREATE TRIGGER events_search_vector_update
+    BEFORE UPDATE OF name, organizer, description ON events
+    FOR EACH ROW
+    WHEN (
+        OLD.name IS DISTINCT FROM NEW.name
+        OR OLD.organizer IS DISTINCT FROM NEW.organizer
+        OR OLD.description IS DISTINCT FROM NEW.description
+    )
+    EXECUTE FUNCTION events_search_vector_trigger();
+
+CREATE TRIGGER event_analytics_search_vector_change
+    AFTER INSERT OR DELETE ON event_analytics
+    FOR EACH ROW EXECUTE FUNCTION event_analytics_search_vector_trigger();
+
+CREATE TRIGGER event_analytics_search_vector_update
+    AFTER UPDATE OF tags ON event_analytics
+    FOR EACH ROW
+    WHEN (OLD.tags IS DISTINCT FROM NEW.tags)
+    EXECUTE FUNCTION event_analytics_search_vector_trigger();
+"""
+
+# Версия миграции 0007 для отката
+OLD_SEARCH_VECTOR_TRIGGERS = """
+CREATE TRIGGER events_search_vector_update
+    BEFORE INSERT OR UPDATE OF name, organizer, description ON events
+    FOR EACH ROW EXECUTE FUNCTION events_search_vector_trigger();
+
+CREATE TRIGGER event_analytics_search_vector_update
+    AFTER INSERT OR DELETE OR UPDATE OF tags ON event_analytics
+    FOR EACH ROW EXECUTE FUNCTION event_analytics_search_vector_trigger();
+"""
+
+
+def _drop_search_triggers() -> None:
+    op.execute("DROP TRIGGER IF EXISTS event_analytics_search_vector_update ON event_analytics")
+    op.execute("DROP TRIGGER IF EXISTS event_analytics_search_vector_change ON event_analytics")
+    op.execute("DROP TRIGGER IF EXISTS events_search_vector_update ON events")
+    op.execute("DROP TRIGGER IF EXISTS events_search_vector_insert ON events")
+
+
+def upgrade() -> None:
+    _drop_search_triggers()
+    op.execute(SEARCH_VECTOR_TRIGGERS)
+
+
+def downgrade() -> None:
+    _drop_search_triggers()
+    op.execute(OLD_SEARCH_VECTOR_TRIGGERS)
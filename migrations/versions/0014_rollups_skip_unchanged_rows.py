@@ -0,0 +1,324 @@
+"""Триггеры сводки пропускают строки пакета, не меняющие корзину
+
+Revision ID: 0014
+Revises: 0013
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0014"
+down_revision = "0013"
+branch_labels = None
+depends_on = None
+
+# Копия app/db/rollups.py на момент миграции
+ROLLUP_FUNCTIONS = """
+CREATE OR REPLACE FUNCTION events_rollup_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO event_rollups AS r (day, category, source_id, is_virtual, event_count)
+    SELECT day, category, source_id, is_virtual, sum(delta) FROM (
+    SELECT (e.start_datetime_utc AT TIME ZONE 'UTC')::date AS day,
+    coalesce(a.category, '') AS category,
+    coalesce(e.source_id, 0) AS source_id,
+    coalesce(e.is_virtual, false) AS is_virtual,
+    1 AS delta
+FROM new_rows AS e LEFT JOIN event_analytics AS a ON a.event_id = e.event_id
+    ) AS d
+    GROUP BY day, category, source_id, is_virtual
+    HAVING sum(delta) <> 0
+    ORDER BY day, category, source_id, is_virtual
+    ON CONFLICT (day, category, source_id, is_virtual)
+    DO UPDATE SET event_count = r.event_count + excluded.event_count;
+    ELSE
+        INSERT INTO event_rollups AS r (day, category, source_id, is_virtual, event_count)
+    SELECT day, category, source_id, is_virtual, sum(delta) FROM (
+    SELECT (e.start_datetime_utc AT TIME ZONE 'UTC')::date AS day,
+    coalesce(a.category, '') AS category,
+    coalesce(e.source_id, 0) AS source_id,
+    coalesce(e.is_virtual, false) AS is_virtual,
+    -1 AS delta
+FROM (SELECT o.* FROM old_rows AS o JOIN new_rows AS n ON n.event_id = o.event_id
+    WHERE (o.start_datetime_utc, o.source_id, o.is_virtual)
+        IS DISTINCT FROM (n.start_datetime_utc, n.source_id, n.is_virtual)) AS e LEFT JOIN event_analytics AS a ON a.event_id = e.event_id
+    UNION ALL
+    SELECT (e.start_datetime_utc AT TIME ZONE 'UTC')::date AS day,
+    coalesce(a.category, '') AS category,
+    coalesce(e.source_id, 0) AS source_id,
+    coalesce(e.is_virtual, false) AS is_virtual,
+    1 AS delta
+FROM (SELECT n.* FROM old_rows AS o JOIN new_rows AS n ON n.event_id = o.event_id
+    WHERE (o.start_datetime_utc, o.source_id, o.is_virtual)
+        IS DISTINCT FROM (n.start_datetime_utc, n.source_id, n.is_virtual)) AS e LEFT JOIN event_analytics AS a ON a.event_id = e.event_id
+    ) AS d
+    GROUP BY day, category, source_id, is_virtual
+    HAVING sum(delta) <> 0
+    ORDER BY day, category, source_id, is_virtual
+    ON CONFLICT (day, category, source_id, is_virtual)
+    DO UPDATE SET event_count = r.event_count + excluded.event_count;
+    END IF;
+    RETURN NULL;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION events_rollup_delete_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO event_rollups AS r (day, category, source_id, is_virtual, event_count)
+    SELECT day, category, source_id, is_virtual, sum(delta) FROM (
+    SELECT (e.start_datetime_utc AT TIME ZONE 'UTC')::date AS day,
+    coalesce(a.category, '') AS category,
+    coalesce(e.source_id, 0) AS source_id,
+    coalesce(e.is_virtual, false) AS is_virtual,
+    -1 AS delta
+FROM (SELECT OLD.event_id, OLD.start_datetime_utc, OLD.source_id, OLD.is_virtual) AS e LEFT JOIN event_analytics AS a ON a.event_id = e.event_id
+    ) AS d
+    GROUP BY day, category, source_id, is_virtual
+    HAVING sum(delta) <> 0
+    ORDER BY day, category, source_id, is_virtual
+    ON CONFLICT (day, category, source_id, is_virtual)
+    DO UPDATE SET event_count = r.event_count + excluded.event_count;
+    RETURN OLD;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION event_analytics_rollup_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO event_rollups AS r (day, category, source_id, is_virtual, event_count)
+    SELECT day, category, source_id, is_virtual, sum(delta) FROM (
+    SELECT (e.start_datetime_utc AT TIME ZONE 'UTC')::date AS day,
+    coalesce(a.category, '') AS category,
+    coalesce(e.source_id, 0) AS source_id,
+    coalesce(e.is_virtual, false) AS is_virtual,
+    -1 AS delta
+FROM events AS e LEFT JOIN (SELECT event_id, category FROM event_analytics WHERE event_id IN (SELECT event_id FROM new_rows) AND analytics_id NOT IN (SELECT analytics_id FROM new_rows)) AS a ON a.event_id = e.event_id
+WHERE e.event_id IN (SELECT event_id FROM new_rows)
+    UNION ALL
+    SELECT (e.start_datetime_utc AT TIME ZONE 'UTC')::date AS day,
+    coalesce(a.category, '') AS category,
+    coalesce(e.source_id, 0) AS source_id,
+    coalesce(e.is_virtual, false) AS is_virtual,
+    1 AS delta
+FROM events AS e LEFT JOIN (SELECT event_id, category FROM event_analytics WHERE event_id IN (SELECT event_id FROM new_rows)) AS a ON a.event_id = e.event_id
+WHERE e.event_id IN (SELECT event_id FROM new_rows)
+    ) AS d
+    GROUP BY day, category, source_id, is_virtual
+    HAVING sum(delta) <> 0
+    ORDER BY day, category, source_id, is_virtual
+    ON CONFLICT (day, category, source_id, is_virtual)
+    DO UPDATE SET event_count = r.event_count + excluded.event_count;
+    ELSIF TG_OP = 'UPDATE' THEN
+        INSERT INTO event_rollups AS r (day, category, source_id, is_virtual, event_count)
+    SELECT day, category, source_id, is_virtual, sum(delta) FROM (
+    SELECT (e.start_datetime_utc AT TIME ZONE 'UTC')::date AS day,
+    coalesce(a.category, '') AS category,
+    coalesce(e.source_id, 0) AS source_id,
+    coalesce(e.is_virtual, false) AS is_virtual,
+    -1 AS delta
+FROM events AS e LEFT JOIN (SELECT event_id, category FROM event_analytics WHERE event_id IN (SELECT o.event_id FROM old_rows AS o JOIN new_rows AS n ON n.analytics_id = o.analytics_id
+    WHERE (o.event_id, o.category) IS DISTINCT FROM (n.event_id, n.category) UNION SELECT n.event_id FROM old_rows AS o JOIN new_rows AS n ON n.analytics_id = o.analytics_id
+    WHERE (o.event_id, o.category) IS DISTINCT FROM (n.event_id, n.category)) AND analytics_id NOT IN (SELECT analytics_id FROM new_rows) UNION ALL SELECT event_id, category FROM old_rows) AS a ON a.event_id = e.event_id
+WHERE e.event_id IN (SELECT o.event_id FROM old_rows AS o JOIN new_rows AS n ON n.analytics_id = o.analytics_id
+    WHERE (o.event_id, o.category) IS DISTINCT FROM (n.event_id, n.category) UNION SELECT n.event_id FROM old_rows AS o JOIN new_rows AS n ON n.analytics_id = o.analytics_id
+    WHERE (o.event_id, o.category) IS DISTINCT FROM (n.event_id, n.category))
+    UNION ALL
+    SELECT (e.start_datetime_utc AT TIME ZONE 'UTC')::date AS day,
+    coalesce(a.category, '') AS category,
+    coalesce(e.source_id, 0) AS source_id,
+    coalesce(e.is_virtual, false) AS is_virtual,
+    1 AS delta
+FROM events AS e LEFT JOIN (SELECT event_id, category FROM event_analytics WHERE event_id IN (SELECT o.event_id FROM old_rows AS o JOIN new_rows AS n ON n.analytics_id = o.analytics_id
+    WHERE (o.event_id, o.category) IS DISTINCT FROM (n.event_id, n.category) UNION SELECT n.event_id FROM old_rows AS o JOIN new_rows AS n ON n.analytics_id = o.analytics_id
+    WHERE (o.event_id, o.category) IS DISTINCT FROM (n.event_id, n.category))) AS a ON a.event_id = e.event_id
+WHERE e.event_id IN (SELECT o.event_id FROM old_rows AS o JOIN new_rows AS n ON n.analytics_id = o.analytics_id
+    WHERE (o.event_id, o.category) IS DISTINCT FROM (n.event_id, n.category) UNION SELECT n.event_id FROM old_rows AS o JOIN new_rows AS n ON n.analytics_id = o.analytics_id
+    WHERE (o.event_id, o.category) IS DISTINCT FROM (n.event_id, n.category))
+    ) AS d
+    GROUP BY day, category, source_id, is_virtual
+    HAVING sum(delta) <> 0
+    ORDER BY day, category, source_id, is_virtual
+    ON CONFLICT (day, category, source_id, is_virtual)
+    DO UPDATE SET event_count = r.event_count + excluded.event_count;
+    ELSE
+        INSERT INTO event_rollups AS r (day, category, source_id, is_virtual, event_count)
+    SELECT day, category, source_id, is_virtual, sum(delta) FROM (
+    SELECT (e.start_datetime_utc AT TIME ZONE 'UTC')::date AS day,
+    coalesce(a.category, '') AS category,
+    coalesce(e.source_id, 0) AS source_id,
+    coalesce(e.is_virtual, false) AS is_virtual,
+    -1 AS delta
+FROM events AS e LEFT JOIN (SELECT event_id, category FROM event_analytics WHERE event_id IN (SELECT event_id FROM old_rows) UNION ALL SELECT event_id, category FROM old_rows) AS a ON a.event_id = e.event_id
+WHERE e.event_id IN (SELECT event_id FROM old_rows)
+    UNION ALL
+    SELECT (e.start_datetime_utc AT TIME ZONE 'UTC')::date AS day,
+    coalesce(a.category, '') AS category,
+    coalesce(e.source_id, 0) AS source_id,
+    coalesce(e.is_virtual, false) AS is_virtual,
+    1 AS delta
+FROM events AS e LEFT JOIN (SELECT event_id, category FROM event_analytics WHERE event_id IN (SELECT event_id FROM old_rows)) AS a ON a.event_id = e.event_id
+WHERE e.event_id IN (SELECT event_id FROM old_rows)
+    ) AS d
+    GROUP BY day, category, source_id, is_virtual
+    HAVING sum(delta) <> 0
+    ORDER BY day, category, source_id, is_virtual
+    ON CONFLICT (day, category, source_id, is_virtual)
+    DO UPDATE SET event_count = r.event_count + excluded.event_count;
+    END IF;
+    RETURN NULL;
+END
+$$;
+"""
+
+# Версия миграции 0012 для отката
+OLD_ROLLUP_FUNCTIONS = """
+CREATE OR REPLACE FUNCTION events_rollup_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO event_rollups AS r (day, category, source_id, is_virtual, event_count)
+    SELECT day, category, source_id, is_virtual, sum(delta) FROM (
+    SELECT (e.start_datetime_utc AT TIME ZONE 'UTC')::date AS day,
+    coalesce(a.category, '') AS category,
+    coalesce(e.source_id, 0) AS source_id,
+    coalesce(e.is_virtual, false) AS is_virtual,
+    1 AS delta
+FROM new_rows AS e LEFT JOIN event_analytics AS a ON a.event_id = e.event_id
+    ) AS d
+    GROUP BY day, category, source_id, is_virtual
+    HAVING sum(delta) <> 0
+    ORDER BY day, category, source_id, is_virtual
+    ON CONFLICT (day, category, source_id, is_virtual)
+    DO UPDATE SET event_count = r.event_count + excluded.event_count;
+    ELSE
+        INSERT INTO event_rollups AS r (day, category, source_id, is_virtual, event_count)
+    SELECT day, category, source_id, is_virtual, sum(delta) FROM (
+    SELECT (e.start_datetime_utc AT TIME ZONE 'UTC')::date AS day,
+    coalesce(a.category, '') AS category,
+    coalesce(e.source_id, 0) AS source_id,
+    coalesce(e.is_virtual, false) AS is_virtual,
+    -1 AS delta
+FROM old_rows AS e LEFT JOIN event_analytics AS a ON a.event_id = e.event_id
+    UNION ALL
+    SELECT (e.start_datetime_utc AT TIME ZONE 'UTC')::date AS day,
+    coalesce(a.category, '') AS category,
+    coalesce(e.source_id, 0) AS source_id,
+    coalesce(e.is_virtual, false) AS is_virtual,
+    1 AS delta
+FROM new_rows AS e LEFT JOIN event_analytics AS a ON a.event_id = e.event_id
+    ) AS d
+    GROUP BY day, category, source_id, is_virtual
+    HAVING sum(delta) <> 0
+    ORDER BY day, category, source_id, is_virtual
+    ON CONFLICT (day, category, source_id, is_virtual)
+    DO UPDATE SET event_count = r.event_count + excluded.event_count;
+    END IF;
+    RETURN NULL;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION events_rollup_delete_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO event_rollups AS r (day, category, source_id, is_virtual, event_count)
+    SELECT day, category, source_id, is_virtual, sum(delta) FROM (
+    SELECT (e.start_datetime_utc AT TIME ZONE 'UTC')::date AS day,
+    coalesce(a.category, '') AS category,
+    coalesce(e.source_id, 0) AS source_id,
+    coalesce(e.is_virtual, false) AS is_virtual,
+    -1 AS delta
+FROM (SELECT OLD.event_id, OLD.start_datetime_utc, OLD.source_id, OLD.is_virtual) AS e LEFT JOIN event_analytics AS a ON a.event_id = e.event_id
+    ) AS d
+    GROUP BY day, category, source_id, is_virtual
+    HAVING sum(delta) <> 0
+    ORDER BY day, category, source_id, is_virtual
+    ON CONFLICT (day, category, source_id, is_virtual)
+    DO UPDATE SET event_count = r.event_count + excluded.event_count;
+    RETURN OLD;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION event_analytics_rollup_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO event_rollups AS r (day, category, source_id, is_virtual, event_count)
+    SELECT day, category, source_id, is_virtual, sum(delta) FROM (
+    SELECT (e.start_datetime_utc AT TIME ZONE 'UTC')::date AS day,
+    coalesce(a.category, '') AS category,
+    coalesce(e.source_id, 0) AS source_id,
+    coalesce(e.is_virtual, false) AS is_virtual,
+    -1 AS delta
+FROM events AS e LEFT JOIN (SELECT event_id, category FROM event_analytics WHERE event_id IN (SELECT event_id FROM new_rows) AND analytics_id NOT IN (SELECT analytics_id FROM new_rows)) AS a ON a.event_id = e.event_id
+WHERE e.event_id IN (SELECT event_id FROM new_rows)
+    UNION ALL
+    SELECT (e.start_datetime_utc AT TIME ZONE 'UTC')::date AS day,
+    coalesce(a.category, '') AS category,
+    coalesce(e.source_id, 0) AS source_id,
+    coalesce(e.is_virtual, false) AS is_virtual,
+    1 AS delta
+FROM events AS e LEFT JOIN (SELECT event_id, category FROM event_analytics WHERE event_id IN (SELECT event_id FROM new_rows)) AS a ON a.event_id = e.event_id
+WHERE e.event_id IN (SELECT event_id FROM new_rows)
+    ) AS d
+    GROUP BY day, category, source_id, is_virtual
+    HAVING sum(delta) <> 0
+    ORDER BY day, category, source_id, is_virtual
+    ON CONFLICT (day, category, source_id, is_virtual)
+    DO UPDATE SET event_count = r.event_count + excluded.event_count;
+    ELSIF TG_OP = 'UPDATE' THEN
+        INSERT INTO event_rollups AS r (day, category, source_id, is_virtual, event_count)
+    SELECT day, category, source_id, is_virtual, sum(delta) FROM (
+    SELECT (e.start_datetime_utc AT TIME ZONE 'UTC')::date AS day,
+    coalesce(a.category, '') AS category,
+    coalesce(e.source_id, 0) AS source_id,
+    coalesce(e.is_virtual, false) AS is_virtual,
+    -1 AS delta
+FROM events AS e LEFT JOIN (SELECT event_id, category FROM event_analytics WHERE event_id IN (SELECT event_id FROM new_rows UNION SELECT event_id FROM old_rows) AND analytics_id NOT IN (SELECT analytics_id FROM new_rows) UNION ALL SELECT event_id, category FROM old_rows) AS a ON a.event_id = e.event_id
+WHERE e.event_id IN (SELECT event_id FROM new_rows UNION SELECT event_id FROM old_rows)
+    UNION ALL
+    SELECT (e.start_datetime_utc AT TIME ZONE 'UTC')::date AS day,
+    coalesce(a.category, '') AS category,
+    coalesce(e.source_id, 0) AS source_id,
+    coalesce(e.is_virtual, false) AS is_virtual,
+    1 AS delta
+FROM events AS e LEFT JOIN (SELECT event_id, category FROM event_analytics WHERE event_id IN (SELECT event_id FROM new_rows UNION SELECT event_id FROM old_rows)) AS a ON a.event_id = e.event_id
+WHERE e.event_id IN (SELECT event_id FROM new_rows UNION SELECT event_id FROM old_rows)
+    ) AS d
+    GROUP BY day, category, source_id, is_virtual
+    HAVING sum(delta) <> 0
+    ORDER BY day, category, source_id, is_virtual
+    ON CONFLICT (day, category, source_id, is_virtual)
+    DO UPDATE SET event_count = r.event_count + excluded.event_count;
+    ELSE
+        INSERT INTO event_rollups AS r (day, category, source_id, is_virtual, event_count)
+    SELECT day, category, source_id, is_virtual, sum(delta) FROM (
+    SELECT (e.start_datetime_utc AT TIME ZONE 'UTC')::date AS day,
+    coalesce(a.category, '') AS category,
+    coalesce(e.source_id, 0) AS source_id,
+    coalesce(e.is_virtual, false) AS is_virtual,
+    -1 AS delta
+FROM events AS e LEFT JOIN (SELECT event_id, category FROM event_analytics WHERE event_id IN (SELECT event_id FROM old_rows) UNION ALL SELECT event_id, category FROM old_rows) AS a ON a.event_id = e.event_id
+WHERE e.event_id IN (SELECT event_id FROM old_rows)
+    UNION ALL
+    SELECT (e.start_datetime_utc AT TIME ZONE 'UTC')::date AS day,
+    coalesce(a.category, '') AS category,
+    coalesce(e.source_id, 0) AS source_id,
+    coalesce(e.is_virtual, false) AS is_virtual,
+    1 AS delta
+FROM events AS e LEFT JOIN (SELECT event_id, category FROM event_analytics WHERE event_id IN (SELECT event_id FROM old_rows)) AS a ON a.event_id = e.event_id
+WHERE e.event_id IN (SELECT event_id FROM old_rows)
+    ) AS d
+    GROUP BY day, category, source_id, is_virtual
+    HAVING sum(delta) <> 0
+    ORDER BY day, category, source_id, is_virtual
+    ON CONFLICT (day, category, source_id, is_virtual)
+    DO UPDATE SET event_count = r.event_count + excluded.event_count;
+    END IF;
+    RETURN NULL;
+END
+$$;
+"""
+
+
+def upgrade() -> None:
+    op.execute(ROLLUP_FUNCTIONS)
+
+
+def downgrade() -> None:
+    op.execute(OLD_ROLLUP_FUNCTIONS)
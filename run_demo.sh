@@ -22,6 +22,11 @@ echo "Запуск бэкенда на порту 8000..."
 uvicorn app.main:app --host 0.0.0.0 --port 8000 --reload > backend.log 2>&1 &
 BACKEND_PID=$!
 
+# Запускаем планировщик скраперов отдельным процессом
+echo "Запуск планировщика скраперов..."
+python -m app.services.scheduler > scheduler.log 2>&1 &
+SCHEDULER_PID=$!
+
 # Ждем запуска бэкенда
 echo "Ожидание запуска бэкенда..."
 sleep 5
@@ -36,10 +41,10 @@ echo "Демо-версия Silicon Valley Event Pulse запущена!"
 echo "Бэкенд доступен по адресу: http://localhost:8000"
 echo "Фронтенд доступен по адресу: http://localhost:8080"
 echo ""
-echo "Для остановки демо-версии используйте: kill $BACKEND_PID $FRONTEND_PID"
+echo "Для остановки демо-версии используйте: kill $BACKEND_PID $SCHEDULER_PID $FRONTEND_PID"
 
 # Сохраняем PID процессов в файл для последующей остановки
-echo "$BACKEND_PID $FRONTEND_PID" > .demo_pids
+echo "$BACKEND_PID $SCHEDULER_PID $FRONTEND_PID" > .demo_pids
 
 echo "Открытие фронтенда в браузере..."
 if command -v xdg-open > /dev/null; then
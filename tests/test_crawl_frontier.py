@@ -0,0 +1,149 @@
+import unittest
+import sys
+import os
+from unittest.mock import patch, MagicMock
+
+# Add parent directory to path to import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.dialects import postgresql
+
+from app.services.scraping.frontier import CrawlFrontier, LeasedTask
+from app.services.scraping.worker import CrawlWorker
+
+def compile_sql(stmt):
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+class TestCrawlFrontier(unittest.TestCase):
+    """Test cases for the Postgres crawl frontier queries"""
+
+    def setUp(self):
+        self.db = MagicMock()
+        self.frontier = CrawlFrontier(self.db)
+
+    def test_enqueue_dedupes_urls(self):
+        """Pending and leased URLs are not duplicated, finished ones are requeued"""
+        self.db.execute.return_value.all.return_value = [MagicMock(), MagicMock()]
+
+        queued = self.frontier.enqueue(1, iter([("https://a/1", "f1"), ("https://a/2", "f2"), ("https://a/1", "f1")]))
+
+        self.assertEqual(queued, 2)
+        stmt = self.db.execute.call_args.args[0]
+        sql = compile_sql(stmt)
+        self.assertIn("ON CONFLICT (url) DO UPDATE", sql)
+        self.assertIn("WHERE crawl_frontier.status IN", sql)
+        # дубликаты внутри пакета схлопываются до отправки в БД
+        urls = [value for value in stmt.compile().params.values() if str(value).startswith("https://")]
+        self.assertEqual(sorted(urls), ["https://a/1", "https://a/2"])
+
+    def test_lease_skips_locked_rows(self):
+        """Concurrent workers never lease the same row"""
+        self.frontier.requeue_expired = MagicMock(return_value=0)
+        self.db.execute.return_value = MagicMock(all=MagicMock(return_value=[]))
+
+        self.frontier.lease("worker-1", 10, 300)
+
+        sql = compile_sql(self.db.execute.call_args.args[0])
+        self.assertIn("FOR UPDATE SKIP LOCKED", sql)
+        self.assertIn("ORDER BY crawl_frontier.priority DESC", sql)
+        self.frontier.requeue_expired.assert_called_once()
+
+    def test_requeue_expired_leases(self):
+        """Leases of crashed workers go back to the queue"""
+        self.db.execute.return_value = [MagicMock(status="pending"), MagicMock(status="failed")]
+
+        self.assertEqual(self.frontier.requeue_expired(), 1)
+
+        sql = compile_sql(self.db.execute.call_args.args[0])
+        self.assertIn("crawl_frontier.lease_expires_at < now()", sql)
+
+class TestCrawlWorker(unittest.TestCase):
+    """Test cases for crawl frontier workers"""
+
+    def make_worker(self):
+        worker = CrawlWorker(worker_id="worker-1")
+        worker.frontier = MagicMock()
+
+        scraper = MagicMock()
+        scraper.source_name = "Fake"
+        scraper.normalize_event.side_effect = lambda event: event
+
+        def fetch_event(url):
+            if url.endswith("/unchanged"):
+                scraper._unchanged_urls.add(url)
+                return None
+            if url.endswith("/no-date"):
+                scraper._empty_urls.add(url)
+                return None
+            if url.endswith("/broken"):
+                return None
+            return {"original_url": url}
+
+        scraper.fetch_event.side_effect = fetch_event
+        worker._scrapers[1] = scraper
+        return worker
+
+    def make_tasks(self):
+        return [
+            LeasedTask(1, 1, "https://a/new", "f1", 1),
+            LeasedTask(2, 1, "https://a/unchanged", "f2", 1),
+            LeasedTask(3, 1, "https://a/broken", "f3", 1),
+            LeasedTask(4, 1, "https://a/no-date", "f4", 1),
+        ]
+
+    @patch('app.services.scraping.worker.EventBatchWriter')
+    @patch('app.services.scraping.worker.SessionLocal')
+    def test_process_completes_and_fails_tasks(self, mock_session_local, mock_writer_class):
+        """Fetched, unchanged and event-less pages are done, errors go back to the queue"""
+        worker = self.make_worker()
+        writer = mock_writer_class.return_value
+        writer.saved_urls = {"https://a/new", "https://a/unchanged"}
+        writer.added, writer.updated = 1, 0
+
+        scraping_log = worker.process(1, self.make_tasks())
+
+        writer.add.assert_called_once_with({"original_url": "https://a/new", "listing_fingerprint": "f1"})
+        writer.flush.assert_called_once()
+        writer.touch.assert_called_once_with("https://a/unchanged", "f2")
+        self.assertEqual(sorted(worker.frontier.complete.call_args.args[1]), [1, 2, 4])
+        self.assertEqual(worker.frontier.fail.call_args.args[1], [3])
+        self.assertEqual(scraping_log.events_found, 4)
+        self.assertEqual(scraping_log.status, "worker")
+
+    @patch('app.services.scraping.worker.EventBatchWriter')
+    @patch('app.services.scraping.worker.SessionLocal')
+    def test_unsaved_events_are_failed(self, mock_session_local, mock_writer_class):
+        """Pages whose events failed to save or touch go back to the queue"""
+        worker = self.make_worker()
+        writer = mock_writer_class.return_value
+        writer.saved_urls = set()
+        writer.added, writer.updated = 0, 0
+
+        worker.process(1, self.make_tasks())
+
+        self.assertEqual(worker.frontier.complete.call_args.args[1], [4])
+        self.assertEqual(sorted(worker.frontier.fail.call_args.args[1]), [1, 2, 3])
+
+    @patch('app.services.scraping.worker.EventBatchWriter')
+    @patch('app.services.scraping.worker.SessionLocal')
+    def test_changes_are_credited_to_the_run(self, mock_session_local, mock_writer_class):
+        """Worker changes are added to the latest successful run log of the source"""
+        worker = self.make_worker()
+        writer = mock_writer_class.return_value
+        writer.saved_urls = {"https://a/new"}
+        writer.added, writer.updated = 1, 2
+
+        worker.process(1, self.make_tasks())
+
+        stmt = worker.db.execute.call_args.args[0]
+        sql = compile_sql(stmt)
+        self.assertIn("UPDATE scraping_logs", sql)
+        self.assertIn("scraping_logs.status = %(status_1)s", sql)
+        params = stmt.compile(dialect=postgresql.dialect()).params
+        self.assertEqual(params["status_1"], "success")
+        self.assertIn(1, params.values())
+        self.assertIn(2, params.values())
+
+
+if __name__ == '__main__':
+    unittest.main()
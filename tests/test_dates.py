@@ -0,0 +1,110 @@
+import unittest
+import sys
+import os
+from datetime import datetime, time, timezone
+
+# Add parent directory to path to import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.scraping.dates import (
+    clear_date_cache,
+    date_parsing_stats,
+    parse_event_datetimes,
+    parse_iso_datetime,
+)
+
+class TestDateParsing(unittest.TestCase):
+    """Test cases for the shared date/time parser"""
+
+    def setUp(self):
+        clear_date_cache()
+
+    def test_meetup_range_with_timezone(self):
+        """Start and end time with an explicit zone are converted to UTC"""
+        start, end = parse_event_datetimes("Tuesday, May 6, 2025 6:00 PM to 8:30 PM PDT")
+
+        self.assertEqual(start, datetime(2025, 5, 7, 1, 0, tzinfo=timezone.utc))
+        self.assertEqual(end, datetime(2025, 5, 7, 3, 30, tzinfo=timezone.utc))
+
+    def test_local_timezone_follows_dst(self):
+        """Times without a zone are Pacific, with daylight saving by date"""
+        summer, _ = parse_event_datetimes("05/15/2025 10:00 AM")
+        winter, _ = parse_event_datetimes("12/15/2025 10:00 AM")
+
+        self.assertEqual(summer, datetime(2025, 5, 15, 17, 0, tzinfo=timezone.utc))
+        self.assertEqual(winter, datetime(2025, 12, 15, 18, 0, tzinfo=timezone.utc))
+
+    def test_date_only_uses_defaults(self):
+        """Date without time uses the default start and end time"""
+        start, end = parse_event_datetimes("October 27th, 2025", time(9, 0), time(18, 0))
+
+        self.assertEqual(start, datetime(2025, 10, 27, 16, 0, tzinfo=timezone.utc))
+        self.assertEqual(end, datetime(2025, 10, 28, 1, 0, tzinfo=timezone.utc))
+
+    def test_end_after_midnight(self):
+        """End time earlier than start time falls on the next day"""
+        start, end = parse_event_datetimes("6 May 2025 22:00 - 01:00 UTC")
+
+        self.assertEqual(start, datetime(2025, 5, 6, 22, 0, tzinfo=timezone.utc))
+        self.assertEqual(end, datetime(2025, 5, 7, 1, 0, tzinfo=timezone.utc))
+
+    def test_hyphenated_range_is_not_an_offset(self):
+        """A range like 10:00 AM-11:00 AM keeps the local zone instead of reading -11:00 as an offset"""
+        start, end = parse_event_datetimes("May 8, 2025 10:00 AM-11:00 AM")
+        self.assertEqual(start, datetime(2025, 5, 8, 17, 0, tzinfo=timezone.utc))
+        self.assertEqual(end, datetime(2025, 5, 8, 18, 0, tzinfo=timezone.utc))
+
+        start, end = parse_event_datetimes("May 8, 2025 9:00 AM-12:00 PM")
+        self.assertEqual(start, datetime(2025, 5, 8, 16, 0, tzinfo=timezone.utc))
+        self.assertEqual(end, datetime(2025, 5, 8, 19, 0, tzinfo=timezone.utc))
+
+        start, end = parse_event_datetimes("8 May 2025 10:00-11:00")
+        self.assertEqual(start, datetime(2025, 5, 8, 17, 0, tzinfo=timezone.utc))
+        self.assertEqual(end, datetime(2025, 5, 8, 18, 0, tzinfo=timezone.utc))
+
+    def test_explicit_offsets(self):
+        """Offsets after UTC/GMT or right after an ISO time are applied"""
+        expected = datetime(2025, 5, 8, 17, 0, tzinfo=timezone.utc)
+        self.assertEqual(parse_event_datetimes("May 8, 2025 10:00 AM GMT-7")[0], expected)
+        self.assertEqual(parse_event_datetimes("May 8, 2025 22:30 UTC+05:30")[0], expected)
+        self.assertEqual(parse_event_datetimes("2025-05-08 10:00:00-0700")[0], expected)
+
+    def test_iso(self):
+        """ISO 8601 values keep their offset; naive values are Pacific"""
+        self.assertEqual(
+            parse_iso_datetime("2025-05-15T10:00:00-07:00"),
+            datetime(2025, 5, 15, 17, 0, tzinfo=timezone.utc),
+        )
+        self.assertEqual(
+            parse_iso_datetime("2025-05-15T10:00:00"),
+            datetime(2025, 5, 15, 17, 0, tzinfo=timezone.utc),
+        )
+
+    def test_unparsable(self):
+        """Unrecognized text yields no date instead of the current time"""
+        self.assertEqual(parse_event_datetimes("Date to be announced"), (None, None))
+        self.assertEqual(date_parsing_stats()["failures"], 1)
+
+    def test_repeated_failures_are_counted(self):
+        """Every failed call is counted, even when the result comes from the cache"""
+        for _ in range(3):
+            parse_event_datetimes("Date to be announced")
+        parse_iso_datetime("soon")
+        parse_iso_datetime("soon")
+
+        stats = date_parsing_stats()
+        self.assertEqual(stats["failures"], 5)
+        self.assertEqual(stats["hits"], 3)
+
+    def test_cache_stats(self):
+        """Repeated strings are served from the cache"""
+        for _ in range(3):
+            parse_event_datetimes("May 6, 2025 6:00 PM")
+
+        stats = date_parsing_stats()
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hits"], 2)
+        self.assertAlmostEqual(stats["hit_rate"], 2 / 3)
+
+if __name__ == "__main__":
+    unittest.main()
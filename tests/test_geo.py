@@ -0,0 +1,56 @@
+import unittest
+import sys
+import os
+
+from sqlalchemy.dialects import postgresql
+
+# Add parent directory to path to import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.geo import KM_PER_DEGREE, bbox_condition, near_condition, parse_bbox, parse_point, radius_bbox
+from app.models.models import Event
+
+def compile_sql(expr):
+    return str(expr.compile(dialect=postgresql.dialect()))
+
+class TestGeo(unittest.TestCase):
+    """Test cases for radius and bounding-box filters"""
+
+    def test_parse_point(self):
+        """near is 'lat,lon' within coordinate ranges"""
+        self.assertEqual(parse_point("37.77,-122.42"), (37.77, -122.42))
+        for value in ("37.77", "91,0", "0,181", "a,b", "1,2,3"):
+            with self.assertRaises(ValueError):
+                parse_point(value)
+
+    def test_parse_bbox(self):
+        """bbox is 'min_lon,min_lat,max_lon,max_lat' with min <= max"""
+        self.assertEqual(parse_bbox("-122.5,37.7,-122.3,37.8"), (-122.5, 37.7, -122.3, 37.8))
+        for value in ("-122.3,37.7,-122.5,37.8", "-122.5,37.8,-122.3,37.7", "0,0,1", "0,-91,1,1"):
+            with self.assertRaises(ValueError):
+                parse_bbox(value)
+
+    def test_radius_bbox(self):
+        """The box encloses the circle and widens in longitude with latitude"""
+        west, south, east, north = radius_bbox(37.77, -122.42, 10)
+
+        self.assertAlmostEqual(north - 37.77, 10 / KM_PER_DEGREE)
+        self.assertAlmostEqual(37.77 - south, 10 / KM_PER_DEGREE)
+        self.assertGreater(east - west, north - south)
+        self.assertAlmostEqual((west + east) / 2, -122.42)
+
+    def test_radius_bbox_near_pole(self):
+        """Near a pole the circle covers all longitudes"""
+        self.assertEqual(radius_bbox(89.9, 10, 50)[::2], (-180.0, 180.0))
+
+    def test_conditions_use_point_index_expression(self):
+        """Both filters compare point(lon, lat), the indexed expression"""
+        box = compile_sql(bbox_condition(Event.location_lat, Event.location_lon, (-122.5, 37.7, -122.3, 37.8)))
+        near = compile_sql(near_condition(Event.location_lat, Event.location_lon, 37.77, -122.42, 5))
+
+        self.assertIn("point(events.location_lon, events.location_lat) <@ box(", box)
+        self.assertIn("point(events.location_lon, events.location_lat) <@ box(", near)
+        self.assertIn("asin(", near)
+
+if __name__ == "__main__":
+    unittest.main()
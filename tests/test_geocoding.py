@@ -0,0 +1,148 @@
+import unittest
+import sys
+import os
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql import Insert, Select, Update
+
+# Add parent directory to path to import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.scraping.geocoding import (
+    GazetteerGeocoder,
+    GeocodingStage,
+    StubGeocoder,
+    address_candidates,
+    normalize_address,
+)
+
+class FakeGeocodeCache:
+    """In-memory geocode_cache table behind a mocked session"""
+
+    def __init__(self):
+        self.rows = {}
+        self.db = MagicMock()
+        self.db.execute.side_effect = self.execute
+
+    def execute(self, stmt):
+        params = stmt.compile(dialect=postgresql.dialect()).params
+        if isinstance(stmt, Select):
+            keys = next(value for key, value in params.items() if key.startswith("address_key"))
+            return [
+                SimpleNamespace(address_key=key, location_lat=self.rows[key][0], location_lon=self.rows[key][1])
+                for key in keys if key in self.rows
+            ]
+        if isinstance(stmt, Insert):
+            for name, value in params.items():
+                if name.startswith("address_key_m"):
+                    index = name.rsplit("m", 1)[1]
+                    self.rows.setdefault(value, (params[f"location_lat_m{index}"], params[f"location_lon_m{index}"]))
+        return []
+
+def make_row(location, is_virtual=False):
+    return {"location_text": location, "is_virtual": is_virtual, "location_lat": None, "location_lon": None}
+
+class TestAddressNormalization(unittest.TestCase):
+    """Test cases for cache keys of venue strings"""
+
+    def test_normalize_address(self):
+        """Case, punctuation and spacing do not produce new keys"""
+        self.assertEqual(
+            normalize_address("  Computer History Museum ,Mountain View,  CA. "),
+            "computer history museum, mountain view, ca",
+        )
+        self.assertEqual(normalize_address("MOSCONE CENTER"), normalize_address("Moscone  Center!"))
+        self.assertEqual(normalize_address(" , "), "")
+
+    def test_address_candidates(self):
+        """The whole address is tried first, then venue, street and city"""
+        self.assertEqual(
+            address_candidates("computer history museum, 1401 n shoreline blvd, mountain view"),
+            [
+                "computer history museum, 1401 n shoreline blvd, mountain view",
+                "computer history museum",
+                "1401 n shoreline blvd",
+                "mountain view",
+            ],
+        )
+
+class TestGazetteerGeocoder(unittest.TestCase):
+    """Test cases for the offline gazetteer backend"""
+
+    def setUp(self):
+        self.geocoder = GazetteerGeocoder()
+
+    def test_venue_and_city(self):
+        """Known venues resolve exactly, other addresses fall back to the city"""
+        self.assertEqual(
+            self.geocoder.geocode(normalize_address("Computer History Museum, Mountain View, CA")),
+            (37.4143, -122.0774),
+        )
+        self.assertEqual(
+            self.geocoder.geocode(normalize_address("WeWork, 535 Mission St, San Francisco, CA")),
+            (37.7749, -122.4194),
+        )
+
+    def test_unknown(self):
+        """Addresses outside the gazetteer are not found"""
+        self.assertIsNone(self.geocoder.geocode(normalize_address("Somewhere, Nowhere")))
+
+class TestGeocodingStage(unittest.TestCase):
+    """Test cases for the cached geocoding pipeline stage"""
+
+    def setUp(self):
+        self.cache = FakeGeocodeCache()
+        self.geocoder = StubGeocoder({"Computer History Museum": (37.4143, -122.0774)})
+
+    def test_each_address_is_resolved_once(self):
+        """Repeated venues cost one geocoder call, across batches and runs"""
+        stage = GeocodingStage(self.cache.db, self.geocoder)
+        batch = [make_row("Computer History Museum"), make_row("computer history museum.")]
+        stage.apply(batch)
+
+        self.assertEqual(self.geocoder.requests, 1)
+        self.assertEqual([row["location_lat"] for row in batch], [37.4143, 37.4143])
+
+        next_run = GeocodingStage(self.cache.db, self.geocoder)
+        row = make_row("COMPUTER HISTORY MUSEUM")
+        next_run.apply([row])
+
+        self.assertEqual(self.geocoder.requests, 1)
+        self.assertEqual(row["location_lon"], -122.0774)
+        self.assertEqual(next_run.stats(), {"hits": 1, "misses": 0, "failures": 0, "hit_rate": 1.0})
+
+    def test_not_found_is_cached(self):
+        """Unknown venues are remembered and not sent to the geocoder again"""
+        for _ in range(2):
+            row = make_row("Secret Location")
+            GeocodingStage(self.cache.db, self.geocoder).apply([row])
+            self.assertIsNone(row["location_lat"])
+
+        self.assertEqual(self.geocoder.requests, 1)
+        self.assertEqual(self.cache.rows, {"secret location": (None, None)})
+
+    def test_skips_virtual_and_located_events(self):
+        """Online events and events with coordinates are not geocoded"""
+        located = dict(make_row("Computer History Museum"), location_lat=1.0, location_lon=2.0)
+        GeocodingStage(self.cache.db, self.geocoder).apply([make_row("Online", is_virtual=True), located])
+
+        self.assertEqual(self.geocoder.requests, 0)
+        self.cache.db.execute.assert_not_called()
+        self.assertEqual((located["location_lat"], located["location_lon"]), (1.0, 2.0))
+
+    def test_geocoder_errors_are_not_cached(self):
+        """A failing geocoder leaves the address for the next run"""
+        geocoder = MagicMock(name="geocoder")
+        geocoder.name = "http"
+        geocoder.geocode.side_effect = TimeoutError("timed out")
+        stage = GeocodingStage(self.cache.db, geocoder)
+        stage.apply([make_row("Moscone Center")])
+
+        self.assertEqual(self.cache.rows, {})
+        self.assertEqual(stage.stats()["failures"], 1)
+        self.assertFalse(any(isinstance(call.args[0], (Insert, Update)) for call in self.cache.db.execute.call_args_list))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import unittest
+import sys
+import os
+import shutil
+import sqlite3
+import tempfile
+from unittest.mock import patch, MagicMock
+
+# Add parent directory to path to import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.scraping.http_cache import HttpCache
+from app.services.scraping.http_client import HttpClient
+
+def make_response(status_code=200, content=b"", headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.content = content
+    response.encoding = "utf-8"
+    response.headers = headers or {}
+    return response
+
+class TestHttpCache(unittest.TestCase):
+    """Test cases for the on-disk scraper HTTP cache"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = HttpCache(self.directory, max_bytes=10 * 1024 * 1024, source_ttls={"meetup": 3600})
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.directory)
+
+    def test_store_reports_changes_by_body_hash(self):
+        """Storing identical content is reported as unchanged"""
+        url = "https://www.meetup.com/e/1"
+
+        self.assertTrue(self.cache.store(url, b"<html>v1</html>", source="meetup"))
+        self.assertFalse(self.cache.store(url, b"<html>v1</html>", source="meetup"))
+        self.assertTrue(self.cache.store(url, b"<html>v2</html>", source="meetup"))
+
+        entry = self.cache.get(url)
+        self.assertEqual(self.cache.read_body(entry), b"<html>v2</html>")
+
+    def test_per_source_ttl(self):
+        """Freshness depends on the source TTL"""
+        self.cache.store("https://www.meetup.com/e/1", b"a", source="meetup")
+        self.cache.store("https://techcrunch.com/e/1", b"b", source="techcrunch")
+
+        self.assertTrue(self.cache.is_fresh(self.cache.get("https://www.meetup.com/e/1")))
+        self.assertFalse(self.cache.is_fresh(self.cache.get("https://techcrunch.com/e/1")))
+
+    def test_lru_eviction(self):
+        """Least recently used entries are evicted once the size limit is hit"""
+        cache = HttpCache(os.path.join(self.directory, "small"), max_bytes=150)
+        try:
+            cache.store("https://example.com/old", os.urandom(64))
+            cache.store("https://example.com/new", os.urandom(64))
+
+            self.assertIsNone(cache.get("https://example.com/old"))
+            self.assertIsNotNone(cache.get("https://example.com/new"))
+            self.assertLessEqual(cache.total_size(), 150)
+        finally:
+            cache.close()
+
+    def test_reads_rarely_write_the_index(self):
+        """The shared index is in WAL mode and a cache hit refreshes its access time only when it is old"""
+        url = "https://www.meetup.com/e/1"
+        self.cache.store(url, b"<html>v1</html>", source="meetup")
+
+        other = sqlite3.connect(os.path.join(self.directory, "index.sqlite3"), isolation_level=None)
+        try:
+            self.assertEqual(other.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+            accessed_at = lambda: other.execute("SELECT accessed_at FROM entries").fetchone()[0]
+            stored = accessed_at()
+
+            self.assertIsNotNone(self.cache.get(url))
+            self.assertEqual(accessed_at(), stored)
+
+            other.execute("UPDATE entries SET accessed_at = accessed_at - 3600")
+            self.assertIsNotNone(self.cache.get(url))
+            self.assertGreater(accessed_at(), stored - 3600)
+        finally:
+            other.close()
+
+class TestHttpClientConditionalGet(unittest.TestCase):
+    """Test cases for conditional requests in HttpClient"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = HttpCache(self.directory, max_bytes=10 * 1024 * 1024)
+        self.client = HttpClient(cache=self.cache)
+        self.url = "https://www.eventbrite.com/e/42"
+
+    def tearDown(self):
+        self.client.close()
+        shutil.rmtree(self.directory)
+
+    def test_not_modified_returns_cached_body(self):
+        """A 304 is served from the cache and flagged as unchanged"""
+        session = self.client.session_for(self.url)
+        first = make_response(content=b"<html>event</html>", headers={"ETag": '"abc"'})
+
+        with patch.object(session, "get", return_value=first):
+            response = self.client.get(self.url)
+        self.assertFalse(response.unchanged)
+
+        with patch.object(session, "get", return_value=make_response(status_code=304)) as mock_get:
+            response = self.client.get(self.url)
+
+        self.assertEqual(mock_get.call_args.kwargs["headers"]["If-None-Match"], '"abc"')
+        self.assertTrue(response.unchanged)
+        self.assertEqual(response.content, b"<html>event</html>")
+
+    def test_same_body_is_unchanged(self):
+        """A 200 with an identical body is flagged as unchanged"""
+        session = self.client.session_for(self.url)
+
+        with patch.object(session, "get", return_value=make_response(content=b"same")):
+            self.client.get(self.url)
+        with patch.object(session, "get", return_value=make_response(content=b"same")):
+            response = self.client.get(self.url)
+
+        self.assertTrue(response.unchanged)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+import sys
+import os
+from unittest.mock import patch, MagicMock
+
+# Add parent directory to path to import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.scraping.http_client import HttpClient, RETRY_STATUS_CODES
+
+class TestHttpClient(unittest.TestCase):
+    """Test cases for the shared scraper HTTP client"""
+
+    def test_one_session_per_host(self):
+        """Requests to the same host share a pooled session"""
+        client = HttpClient()
+
+        first = client.session_for("https://www.meetup.com/find/events")
+        second = client.session_for("https://www.meetup.com/e/123")
+        other = client.session_for("https://techcrunch.com/events/")
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+
+    def test_retry_policy(self):
+        """Adapters retry 429/5xx with backoff and honour Retry-After"""
+        client = HttpClient(max_retries=2, backoff_factor=0.1)
+        adapter = client.session_for("https://example.com").get_adapter("https://example.com")
+
+        self.assertEqual(adapter.max_retries.total, 2)
+        self.assertEqual(adapter.max_retries.backoff_factor, 0.1)
+        self.assertEqual(set(adapter.max_retries.status_forcelist), set(RETRY_STATUS_CODES))
+        self.assertTrue(adapter.max_retries.respect_retry_after_header)
+
+    def test_default_timeout(self):
+        """A timeout is always passed so a hung socket cannot stall the crawl"""
+        client = HttpClient(connect_timeout=1.5, read_timeout=7.0)
+        session = client.session_for("https://example.com")
+
+        with patch.object(session, "get", return_value=MagicMock()) as mock_get:
+            client.get("https://example.com/page")
+
+        self.assertEqual(mock_get.call_args.kwargs["timeout"], (1.5, 7.0))
+        self.assertIn("gzip", session.headers["Accept-Encoding"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,29 @@
+import unittest
+import sys
+import os
+from datetime import datetime, timezone
+
+# Add parent directory to path to import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.api.pagination import decode_cursor, encode_cursor
+
+class TestCursor(unittest.TestCase):
+    """Test cases for keyset pagination cursors"""
+
+    def test_round_trip(self):
+        """A cursor decodes back to the position it was made from"""
+        start = datetime(2025, 5, 7, 1, 0, tzinfo=timezone.utc)
+        cursor = encode_cursor(start, 42)
+
+        self.assertNotIn("=", cursor)
+        self.assertEqual(decode_cursor(cursor), (start, 42))
+
+    def test_invalid_cursor(self):
+        """Garbage cursors are rejected with ValueError"""
+        for cursor in ("not-a-cursor", encode_cursor(datetime(2025, 5, 7), 1)[:-3], ""):
+            with self.assertRaises(ValueError):
+                decode_cursor(cursor)
+
+if __name__ == '__main__':
+    unittest.main()
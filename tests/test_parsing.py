@@ -0,0 +1,86 @@
+import unittest
+import sys
+import os
+from unittest.mock import patch
+
+from bs4 import BeautifulSoup
+
+# Add parent directory to path to import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.scraping.parsing import SelectorStrainer, parse_html
+from app.services.scraping.registry import available_scrapers
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "pages")
+
+def read_fixture(filename):
+    with open(os.path.join(FIXTURES_DIR, filename), encoding="utf-8") as f:
+        return f.read()
+
+class TestSelectorStrainer(unittest.TestCase):
+    """Test cases for partial HTML parsing"""
+
+    HTML = """
+    <html><head><script type="application/ld+json">{"@type": "Event"}</script><script>var x;</script></head>
+    <body>
+        <nav><a href="/">Home</a></nav>
+        <div class="wrapper"><h1 class="event-title">Title <b>bold</b></h1></div>
+        <div id="when">May 6</div>
+        <p class="other">skip me</p>
+    </body></html>
+    """
+
+    def test_keeps_only_matching_elements(self):
+        """Only selected elements (with their content) end up in the tree"""
+        strainer = SelectorStrainer(['h1.event-title', '#when', 'script[type=application/ld+json]'])
+        soup = parse_html(self.HTML, strainer)
+
+        self.assertEqual(soup.select_one('h1.event-title').text, "Title bold")
+        self.assertEqual(soup.select_one('#when').text, "May 6")
+        self.assertEqual(len(soup.select('script')), 1)
+        self.assertIsNone(soup.select_one('nav'))
+        self.assertIsNone(soup.select_one('.other'))
+
+    def test_rejects_unsupported_selector(self):
+        """Complex selectors are rejected up front"""
+        with self.assertRaises(ValueError):
+            SelectorStrainer(['div > a'])
+
+    @patch('app.services.scraping.parsing.settings')
+    def test_partial_parsing_can_be_disabled(self, mock_settings):
+        """With partial parsing disabled the whole document is parsed"""
+        mock_settings.SCRAPING_PARTIAL_PARSING = False
+        mock_settings.SCRAPING_HTML_PARSER = "html.parser"
+
+        soup = parse_html(self.HTML, SelectorStrainer(['#when']))
+
+        self.assertIsNotNone(soup.select_one('nav'))
+
+class TestExtractorsOnFixtures(unittest.TestCase):
+    """Partial lxml parsing must give the same result as a full html.parser parse"""
+
+    def test_fixture_pages(self):
+        for source_type, scraper_class in available_scrapers().items():
+            scraper = scraper_class.__new__(scraper_class)
+            for kind in ("listing", "detail"):
+                filename = f"{source_type}_{kind}.html"
+                if not os.path.exists(os.path.join(FIXTURES_DIR, filename)):
+                    continue
+                with self.subTest(page=filename):
+                    markup = read_fixture(filename)
+                    strainer = scraper_class.listing_parse_only if kind == "listing" else scraper_class.detail_parse_only
+                    full = BeautifulSoup(markup, "html.parser")
+                    partial = parse_html(markup, strainer)
+
+                    if kind == "listing":
+                        expected = [scraper.extract_card_url(card) for card in scraper.extract_cards(full)]
+                        actual = [scraper.extract_card_url(card) for card in scraper.extract_cards(partial)]
+                        self.assertTrue(expected)
+                    else:
+                        expected = scraper.extract_event(full, "https://example.com/e/1")
+                        actual = scraper.extract_event(partial, "https://example.com/e/1")
+                    self.assertEqual(actual, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
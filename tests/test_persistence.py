@@ -0,0 +1,175 @@
+import unittest
+import sys
+import os
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+# Add parent directory to path to import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.scraping.persistence import EventBatchWriter, content_hash, event_content_hash
+
+def make_event(url, name="Test Event"):
+    return {
+        "name": name,
+        "description": "",
+        "start_datetime_utc": datetime(2025, 5, 10, 9, 0),
+        "end_datetime_utc": datetime(2025, 5, 10, 18, 0),
+        "location_text": "San Francisco",
+        "is_virtual": False,
+        "virtual_url": None,
+        "original_url": url,
+        "organizer": "TechCrunch",
+    }
+
+class TestEventBatchWriter(unittest.TestCase):
+    """Test cases for batched event persistence"""
+
+    def setUp(self):
+        self.db = MagicMock()
+        self.statements = []
+
+        def execute(stmt):
+            self.statements.append(stmt)
+            rows = stmt.compile(dialect=postgresql.dialect()).params
+            count = sum(1 for key in rows if key.startswith("original_url"))
+            # Первая строка пакета новая, остальные уже были в базе
+            return [SimpleNamespace(inserted=(i == 0), changed=True) for i in range(count)]
+
+        self.db.execute.side_effect = execute
+
+    def test_one_statement_per_batch(self):
+        """A batch is written with one INSERT ... ON CONFLICT and one commit"""
+        writer = EventBatchWriter(self.db, source_id=1, batch_size=3)
+
+        for i in range(3):
+            writer.add(make_event(f"https://techcrunch.com/e/{i}"))
+
+        self.assertEqual(len(self.statements), 1)
+        self.assertEqual(self.db.commit.call_count, 1)
+
+        sql = str(self.statements[0].compile(dialect=postgresql.dialect()))
+        self.assertIn("ON CONFLICT (original_url) DO UPDATE", sql)
+        self.assertEqual(writer.added, 1)
+        self.assertEqual(writer.updated, 2)
+
+    def test_duplicate_urls_in_batch(self):
+        """Duplicate URLs within a batch collapse to the latest version"""
+        writer = EventBatchWriter(self.db, source_id=1, batch_size=10)
+
+        writer.add(make_event("https://techcrunch.com/e/1", name="Old"))
+        writer.add(make_event("https://techcrunch.com/e/1", name="New"))
+        writer.flush()
+
+        params = self.statements[0].compile(dialect=postgresql.dialect()).params
+        self.assertIn("New", params.values())
+        self.assertNotIn("Old", params.values())
+
+    def test_failed_batch_falls_back_to_single_rows(self):
+        """A broken row does not prevent the rest of the batch from being saved"""
+        calls = {"count": 0}
+
+        def execute(stmt):
+            calls["count"] += 1
+            if calls["count"] in (1, 2):
+                raise ValueError("bad row")
+            return [SimpleNamespace(inserted=True)]
+
+        self.db.execute.side_effect = execute
+        writer = EventBatchWriter(self.db, source_id=1, batch_size=10)
+
+        writer.add(make_event("https://techcrunch.com/e/1"))
+        writer.add(make_event("https://techcrunch.com/e/2"))
+        writer.flush()
+
+        self.assertEqual(writer.added, 1)
+        self.assertEqual(writer.failed, 1)
+        self.assertEqual(writer.saved_urls, {"https://techcrunch.com/e/2"})
+
+    def test_saved_urls_include_touched_events(self):
+        """Touched events count as saved only when their UPDATE succeeds"""
+        self.db.execute.side_effect = None
+        writer = EventBatchWriter(self.db, source_id=1, batch_size=10)
+
+        writer.touch("https://techcrunch.com/e/1", "abc")
+        writer.flush()
+        self.assertEqual(writer.saved_urls, {"https://techcrunch.com/e/1"})
+
+        self.db.execute.side_effect = ValueError("db down")
+        writer.touch("https://techcrunch.com/e/2", "def")
+        writer.flush()
+        self.assertEqual(writer.saved_urls, {"https://techcrunch.com/e/1"})
+
+    def test_unchanged_content_is_not_rewritten(self):
+        """Rows with a matching content hash keep their fields and updated_at"""
+        self.db.execute.side_effect = lambda stmt: (
+            self.statements.append(stmt) or [SimpleNamespace(inserted=False, changed=False)]
+        )
+        writer = EventBatchWriter(self.db, source_id=1, batch_size=10)
+
+        writer.add(make_event("https://techcrunch.com/e/1"))
+        writer.flush()
+
+        sql = str(self.statements[0].compile(dialect=postgresql.dialect()))
+        self.assertIn("IS DISTINCT FROM excluded.content_hash", sql)
+        params = self.statements[0].compile(dialect=postgresql.dialect()).params
+        self.assertIn(content_hash(make_event("https://techcrunch.com/e/1")), params.values())
+        self.assertEqual(writer.updated, 0)
+        self.assertEqual(writer.unchanged, 1)
+
+    def test_geocoding_before_upsert(self):
+        """Coordinates from the geocoding stage are written with the batch and kept if missing"""
+        geocoding = MagicMock()
+        geocoding.apply.side_effect = lambda rows: [
+            row.update(location_lat=37.4143, location_lon=-122.0774) for row in rows
+        ]
+        writer = EventBatchWriter(self.db, source_id=1, batch_size=10, geocoding=geocoding)
+
+        writer.add(dict(make_event("https://techcrunch.com/e/1"), location_lat=None, location_lon=None))
+        writer.flush()
+
+        geocoding.apply.assert_called_once()
+        compiled = self.statements[0].compile(dialect=postgresql.dialect())
+        self.assertIn(37.4143, compiled.params.values())
+        self.assertIn("coalesce(excluded.location_lat, events.location_lat)", str(compiled))
+
+class TestContentHash(unittest.TestCase):
+    """Test cases for event content fingerprints"""
+
+    def test_ignores_bookkeeping_fields(self):
+        """Scrape time and listing fingerprint do not change the hash"""
+        event = make_event("https://techcrunch.com/e/1")
+        touched = dict(event, last_scraped_at=datetime(2025, 6, 1), listing_fingerprint="abc")
+
+        self.assertEqual(content_hash(event), content_hash(touched))
+
+    def test_changes_with_content(self):
+        """Any content change produces a different hash"""
+        event = make_event("https://techcrunch.com/e/1")
+
+        self.assertNotEqual(content_hash(event), content_hash(dict(event, location_text="Oakland")))
+
+    def test_stored_event_matches_scraped_data(self):
+        """An event loaded from the database hashes like the scraped data, whatever its time zone"""
+        event = dict(
+            make_event("https://techcrunch.com/e/1"),
+            start_datetime_utc=datetime(2025, 5, 10, 16, 0, tzinfo=timezone.utc),
+            end_datetime_utc=datetime(2025, 5, 11, 1, 0, tzinfo=timezone.utc),
+        )
+        pacific = timezone(timedelta(hours=-7))
+        stored = SimpleNamespace(**dict(
+            event,
+            start_datetime_utc=event["start_datetime_utc"].astimezone(pacific),
+            end_datetime_utc=event["end_datetime_utc"].astimezone(pacific),
+        ))
+
+        self.assertEqual(event_content_hash(stored), content_hash(event))
+        stored.end_datetime_utc += timedelta(hours=1)
+        self.assertNotEqual(event_content_hash(stored), content_hash(event))
+
+
+if __name__ == '__main__':
+    unittest.main()
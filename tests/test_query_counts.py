@@ -0,0 +1,144 @@
+import unittest
+import sys
+import os
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Add parent directory to path to import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.api.endpoints import events
+from app.db.session import Base, get_read_db
+from app.models import models
+
+# В SQLite нет массивов и tsvector; эти колонки в тестах не заполняются
+@compiles(ARRAY, "sqlite")
+def compile_array_sqlite(type_, compiler, **kw):
+    return "JSON"
+
+@compiles(TSVECTOR, "sqlite")
+def compile_tsvector_sqlite(type_, compiler, **kw):
+    return "TEXT"
+
+class QueryCounter:
+    """Counts SQL statements sent to the database"""
+
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+class TestQueryCounts(unittest.TestCase):
+    """Number of SQL queries per API request must not depend on the page size"""
+
+    EVENTS = 30
+
+    def setUp(self):
+        self.engine = create_engine(
+            "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        Base.metadata.create_all(bind=self.engine)
+        self.Session = sessionmaker(bind=self.engine, autocommit=False, autoflush=False)
+        self.populate()
+
+        app = FastAPI()
+        app.include_router(events.router, prefix="/api/events")
+
+        def override_get_db():
+            db = self.Session()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_read_db] = override_get_db
+        self.client = TestClient(app)
+        self.counter = QueryCounter(self.engine)
+
+    def tearDown(self):
+        Base.metadata.drop_all(bind=self.engine)
+        self.engine.dispose()
+
+    def populate(self):
+        db = self.Session()
+        sources = [models.Source(name=f"Source {i}", url=f"https://s{i}.example.com", type=f"s{i}") for i in range(3)]
+        db.add_all(sources)
+        db.flush()
+
+        trend = models.Trend(name="AI", score=1.0)
+        db.add(trend)
+        db.flush()
+        self.trend_id = trend.trend_id
+
+        start = datetime(2025, 5, 1, 17, 0)
+        for i in range(self.EVENTS):
+            item = models.Event(
+                source_id=sources[i % 3].source_id,
+                name=f"Event {i}",
+                start_datetime_utc=start + timedelta(hours=i),
+                original_url=f"https://s.example.com/e/{i}",
+            )
+            db.add(item)
+            db.flush()
+            db.add(models.EventAnalytics(event_id=item.event_id, category="AI/ML"))
+            db.add(models.TrendEvent(trend_id=trend.trend_id, event_id=item.event_id, relevance_score=i))
+        db.commit()
+        db.close()
+
+    @contextmanager
+    def assert_queries(self, expected):
+        self.counter.count = 0
+        yield
+        self.assertEqual(self.counter.count, expected)
+
+    def test_event_list(self):
+        """One query for the total and one for the page, including source and analytics"""
+        for page_size in (1, 20):
+            with self.assert_queries(2):
+                response = self.client.get(f"/api/events/events?page_size={page_size}")
+            self.assertEqual(response.status_code, 200)
+            body = response.json()
+            self.assertEqual(len(body["events"]), page_size)
+            self.assertEqual(body["events"][0]["analytics"]["category"], "AI/ML")
+            self.assertIsNotNone(body["events"][0]["source"])
+
+    def test_event_list_cursor_without_total(self):
+        """Cursor pages without a total cost a single query each"""
+        with self.assert_queries(1):
+            first = self.client.get("/api/events/events?page_size=20&include_total=false").json()
+        with self.assert_queries(1):
+            second = self.client.get(
+                f"/api/events/events?page_size=20&include_total=false&cursor={first['next_cursor']}"
+            ).json()
+
+        self.assertIsNone(first["total"])
+        self.assertEqual(len(second["events"]), self.EVENTS - 20)
+        self.assertIsNone(second["next_cursor"])
+        self.assertEqual(second["events"][0]["name"], "Event 20")
+
+    def test_event_detail(self):
+        """An event is loaded with its source and analytics in one query"""
+        with self.assert_queries(1):
+            response = self.client.get("/api/events/events/1")
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNotNone(response.json()["source"])
+
+    def test_trend_events(self):
+        """Trend lookup, events, and one batched load per relationship"""
+        with self.assert_queries(4):
+            response = self.client.get(f"/api/events/analytics/trends/{self.trend_id}/events")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), self.EVENTS)
+
+if __name__ == '__main__':
+    unittest.main()
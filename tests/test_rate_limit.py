@@ -0,0 +1,142 @@
+import unittest
+import sys
+import os
+import tempfile
+from unittest.mock import MagicMock
+
+# Add parent directory to path to import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.scraping.http_client import HttpClient
+from app.services.scraping.rate_limit import (
+    MemoryRateLimitBackend,
+    RateLimiter,
+    SqliteRateLimitBackend,
+    parse_retry_after,
+)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+def make_limiter(backend=None, clock=None, **kwargs):
+    clock = clock or FakeClock()
+    limiter = RateLimiter(
+        backend or MemoryRateLimitBackend(),
+        rate=kwargs.pop("rate", 2.0),
+        burst=kwargs.pop("burst", 2),
+        min_rate=0.1,
+        backoff_factor=0.5,
+        recovery_step=0.25,
+        clock=clock,
+        sleep=clock.sleep,
+    )
+    return limiter, clock
+
+class TestRateLimiter(unittest.TestCase):
+    """Test cases for the per-host token bucket"""
+
+    def test_burst_then_steady_rate(self):
+        """A full bucket allows a burst, after that requests are spaced by 1/rate"""
+        limiter, clock = make_limiter()
+
+        delays = [limiter.wait("https://example.com/e/%d" % i) for i in range(4)]
+
+        self.assertEqual(delays[:2], [0.0, 0.0])
+        self.assertAlmostEqual(delays[2], 0.5)
+        self.assertAlmostEqual(delays[3], 0.5)
+        self.assertAlmostEqual(clock.now, 1001.0)
+
+    def test_hosts_are_independent(self):
+        """Each host has its own bucket"""
+        limiter, _ = make_limiter(burst=1)
+
+        limiter.reserve("https://a.example.com/")
+
+        self.assertEqual(limiter.reserve("https://b.example.com/"), 0.0)
+        self.assertGreater(limiter.reserve("https://a.example.com/"), 0.0)
+
+    def test_configured_host_limits(self):
+        """Per-host limits override the defaults"""
+        limiter, _ = make_limiter(burst=1)
+        limiter.configure("https://slow.example.com", rate=0.5, burst=1)
+
+        limiter.reserve("https://slow.example.com/a")
+
+        self.assertAlmostEqual(limiter.reserve("https://slow.example.com/b"), 2.0)
+
+    def test_penalize_honours_retry_after_and_recovers(self):
+        """429 pauses the host for Retry-After, halves the rate, successes restore it"""
+        limiter, clock = make_limiter(burst=1)
+
+        limiter.penalize("https://example.com/", retry_after=10)
+        delay = limiter.reserve("https://example.com/")
+
+        # пауза 10 с плюс один интервал при сниженной вдвое скорости
+        self.assertAlmostEqual(delay, 10 + 1 / 1.0)
+
+        for _ in range(4):
+            limiter.record_success("https://example.com/")
+        clock.now += 100
+        limiter.reserve("https://example.com/")
+        self.assertAlmostEqual(limiter.reserve("https://example.com/"), 0.5)
+
+    def test_sqlite_backend_shared_between_limiters(self):
+        """Limiters using the same SQLite file share the bucket state"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "limits.sqlite3")
+            clock = FakeClock()
+            first, _ = make_limiter(SqliteRateLimitBackend(path), clock, burst=1)
+            second, _ = make_limiter(SqliteRateLimitBackend(path), clock, burst=1)
+
+            self.assertEqual(first.reserve("https://example.com/"), 0.0)
+            self.assertAlmostEqual(second.reserve("https://example.com/"), 0.5)
+
+            first.close()
+            second.close()
+
+    def test_parse_retry_after(self):
+        """Retry-After is accepted as seconds or an HTTP date"""
+        self.assertEqual(parse_retry_after("30"), 30.0)
+        self.assertEqual(parse_retry_after("Thu, 01 Jan 1970 00:01:00 GMT", now=0), 60.0)
+        self.assertIsNone(parse_retry_after("soon"))
+        self.assertIsNone(parse_retry_after(None))
+
+class TestHttpClientRateLimit(unittest.TestCase):
+    """Test cases for rate limiting in the shared HTTP client"""
+
+    def test_throttled_response_is_retried_after_pause(self):
+        """429 slows the host down and the request is repeated"""
+        limiter, clock = make_limiter()
+        client = HttpClient(max_retries=2, rate_limiter=limiter)
+        session = client.session_for("https://example.com")
+
+        throttled = MagicMock(status_code=429, headers={"Retry-After": "5"})
+        ok = MagicMock(status_code=200, headers={})
+        session.get = MagicMock(side_effect=[throttled, ok])
+
+        response = client.get("https://example.com/events")
+
+        self.assertIs(response, ok)
+        self.assertEqual(session.get.call_count, 2)
+        self.assertGreaterEqual(sum(clock.slept), 5)
+
+    def test_adapter_leaves_throttling_to_limiter(self):
+        """With a limiter urllib3 does not silently retry 429"""
+        limiter, _ = make_limiter()
+        client = HttpClient(rate_limiter=limiter)
+        adapter = client.session_for("https://example.com").get_adapter("https://example.com")
+
+        self.assertNotIn(429, adapter.max_retries.status_forcelist)
+
+
+if __name__ == '__main__':
+    unittest.main()
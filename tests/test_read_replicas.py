@@ -0,0 +1,181 @@
+import unittest
+import sys
+import os
+import asyncio
+from unittest.mock import patch
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+# Add parent directory to path to import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.api.cache import MemoryResponseCache, ResponseCacheMiddleware
+from app.api.read_routing import ReadReplicaMiddleware
+from app.core.config import Settings
+from app.db import session
+from app.db.replicas import PRIMARY, ReplicaRouter
+
+TEST_DATABASE_URI = os.environ.get("TEST_DATABASE_URI")
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def make_router(lags, max_lag=10, check_interval=5):
+    """Router over sqlite engines whose lag is taken from the lags dict"""
+    clock = FakeClock()
+    router = ReplicaRouter(
+        [create_engine(f"sqlite:///replica{i}.db") for i in range(len(lags))], max_lag, check_interval, clock
+    )
+    router.checks = 0
+
+    def replica_lag(index):
+        router.checks += 1
+        return lags[index]
+
+    router.replica_lag = replica_lag
+    return router, clock
+
+class TestReplicaRouter(unittest.TestCase):
+    """Test cases for lag-aware replica selection"""
+
+    def test_round_robin_over_fresh_replicas(self):
+        """Reads are spread over replicas within the allowed lag"""
+        router, _ = make_router({0: 0.0, 1: 2.5, 2: 30.0})
+        self.assertEqual([router.choose() for _ in range(4)], [0, 1, 0, 1])
+
+    def test_fallback_to_primary(self):
+        """Lagging and unreachable replicas are skipped, without replicas the primary is read"""
+        router, _ = make_router({0: 30.0, 1: None})
+        self.assertEqual(router.choose(), PRIMARY)
+        self.assertEqual(ReplicaRouter([], 10, 5).choose(), PRIMARY)
+
+    def test_lag_is_rechecked_periodically(self):
+        """Lag is measured once per check interval and a caught-up replica returns"""
+        lags = {0: 30.0}
+        router, clock = make_router(lags)
+        self.assertEqual(router.choose(), PRIMARY)
+        lags[0] = 1.0
+        clock.now = 4.9
+        self.assertEqual(router.choose(), PRIMARY)
+        self.assertEqual(router.checks, 1)
+
+        clock.now = 5.0
+        self.assertEqual(router.choose(), 0)
+        self.assertEqual(router.checks, 2)
+
+    def test_choose_async(self):
+        """The async variant gives the same choice"""
+        router, _ = make_router({0: 0.0, 1: 0.0})
+        self.assertEqual(asyncio.run(router.choose_async()), 0)
+        self.assertEqual(router.choose(), 1)
+
+    def test_unreachable_replica(self):
+        """A replica that fails the lag query is reported as unavailable"""
+        router = ReplicaRouter([create_engine("sqlite://")], 10, 5)
+        self.assertIsNone(router.replica_lag(0))
+        self.assertEqual(router.choose(), PRIMARY)
+
+    def test_replica_uris_setting(self):
+        """Replica URIs are given as a comma-separated list"""
+        settings = Settings(
+            SQLALCHEMY_DATABASE_URI="postgresql://db/event_pulse",
+            DB_READ_REPLICA_URIS="postgresql://r1/event_pulse, postgresql://r2/event_pulse",
+        )
+        self.assertEqual(settings.DB_READ_REPLICA_URIS, ["postgresql://r1/event_pulse", "postgresql://r2/event_pulse"])
+
+class TestEngineOptions(unittest.TestCase):
+    """Pool settings are passed only to pools that accept them"""
+
+    def test_queue_pools_get_sizes(self):
+        """PostgreSQL engines (sync and asyncpg) get the pool size settings"""
+        for uri in ("postgresql+psycopg2://db/event_pulse", "postgresql+asyncpg://db/event_pulse"):
+            options = session.engine_options(uri)
+            self.assertIn("pool_size", options)
+            self.assertIn("max_overflow", options)
+
+    def test_other_pools_do_not_raise(self):
+        """In-memory sqlite and StaticPool engines are created without pool size arguments"""
+        options = session.engine_options("sqlite://")
+        self.assertNotIn("pool_size", options)
+        create_engine("sqlite://", **options).dispose()
+
+        options = session.engine_options("sqlite://", poolclass=StaticPool)
+        self.assertNotIn("pool_size", options)
+        engine = create_engine("sqlite://", **options)
+        self.assertIsInstance(engine.pool, StaticPool)
+        engine.dispose()
+
+class TestReadReplicaMiddleware(unittest.TestCase):
+    """A GET request reads the data version and the response from one replica"""
+
+    def setUp(self):
+        self.router, _ = make_router({0: 0.0, 1: 0.0})
+        self.replicas = [create_engine(f"sqlite:///replica{i}.db") for i in range(2)]
+        self.seen = []
+
+        def version_provider():
+            self.seen.append(("version", str(session.read_engine().url)))
+            return 1
+
+        app = FastAPI()
+
+        @app.get("/api/events/sources")
+        def sources(db=Depends(session.get_read_db)):
+            self.seen.append(("response", str(db.get_bind().url)))
+            return []
+
+        @app.post("/api/events/sources")
+        def add_source():
+            return {}
+
+        app.add_middleware(ResponseCacheMiddleware, cache=MemoryResponseCache(10), version_provider=version_provider)
+        app.add_middleware(ReadReplicaMiddleware)
+        self.client = TestClient(app)
+
+        patches = [
+            patch("app.api.read_routing.replica_router", self.router),
+            patch.object(session, "replica_engines", self.replicas),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def test_requests_are_pinned_to_one_replica(self):
+        """Cache version and handler share the replica, the next request gets another one"""
+        self.client.get("/api/events/sources")
+        self.client.get("/api/events/sources", params={"page": 2})
+        self.assertEqual(self.seen, [
+            ("version", "sqlite:///replica0.db"),
+            ("response", "sqlite:///replica0.db"),
+            ("version", "sqlite:///replica1.db"),
+            ("response", "sqlite:///replica1.db"),
+        ])
+
+    def test_writes_are_not_routed(self):
+        """Other methods do not pick a replica"""
+        self.client.post("/api/events/sources")
+        self.assertEqual(self.router.checks, 0)
+
+@unittest.skipUnless(TEST_DATABASE_URI, "TEST_DATABASE_URI is not set")
+class TestReplicaLagQuery(unittest.TestCase):
+    """The lag query runs on a real PostgreSQL server"""
+
+    def test_primary_has_no_lag(self):
+        """A server that is not in recovery counts as an up-to-date replica"""
+        engine = create_engine(TEST_DATABASE_URI)
+        try:
+            router = ReplicaRouter([engine], 10, 5)
+            self.assertEqual(router.replica_lag(0), 0.0)
+            self.assertEqual(router.choose(), 0)
+        finally:
+            engine.dispose()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+import unittest
+import sys
+import os
+import tempfile
+
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+# Add parent directory to path to import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.api.cache import (
+    CachedResponse,
+    MemoryResponseCache,
+    ResponseCacheMiddleware,
+    SqliteResponseCache,
+    etag_matches,
+)
+
+class TestResponseCacheMiddleware(unittest.TestCase):
+    """Test cases for versioned response caching with ETag/304"""
+
+    def setUp(self):
+        self.version = 1
+        self.calls = 0
+        self.client = self.make_client(lambda: self.version)
+
+    def make_client(self, version_provider):
+        app = FastAPI()
+
+        @app.get("/api/events/analytics/categories")
+        def categories(start_date: str = "", end_date: str = ""):
+            self.calls += 1
+            return {"categories": [{"name": "AI/ML", "count": self.calls}], "range": [start_date, end_date]}
+
+        @app.get("/api/events/events/{event_id}")
+        def event(event_id: int):
+            self.calls += 1
+            raise HTTPException(status_code=404, detail="Event not found")
+
+        @app.get("/api/events/scraping/logs")
+        def logs():
+            self.calls += 1
+            return {"logs": []}
+
+        app.add_middleware(
+            ResponseCacheMiddleware,
+            cache=MemoryResponseCache(max_entries=2),
+            version_provider=version_provider,
+        )
+        return TestClient(app)
+
+    def test_repeated_request_is_served_from_cache(self):
+        """The endpoint runs once per data version; parameter order does not matter"""
+        first = self.client.get("/api/events/analytics/categories?start_date=a&end_date=b")
+        second = self.client.get("/api/events/analytics/categories?end_date=b&start_date=a")
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(first.json(), second.json())
+        self.assertEqual(first.headers["x-cache"], "MISS")
+        self.assertEqual(second.headers["x-cache"], "HIT")
+        self.assertEqual(first.headers["etag"], second.headers["etag"])
+        self.assertFalse(first.headers["etag"].startswith("W/"))
+        self.assertEqual(second.headers["content-type"], "application/json")
+
+    def test_not_modified(self):
+        """A matching If-None-Match gets 304 without a body"""
+        etag = self.client.get("/api/events/analytics/categories").headers["etag"]
+
+        response = self.client.get("/api/events/analytics/categories", headers={"If-None-Match": etag})
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response.headers["etag"], etag)
+
+    def test_data_version_invalidates(self):
+        """A bumped data version recomputes the response and changes the ETag"""
+        etag = self.client.get("/api/events/analytics/categories").headers["etag"]
+        self.version = 2
+
+        response = self.client.get("/api/events/analytics/categories", headers={"If-None-Match": etag})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.calls, 2)
+        self.assertNotEqual(response.headers["etag"], etag)
+
+    def test_errors_and_other_paths_are_not_cached(self):
+        """Error responses and scraping logs always reach the endpoint"""
+        for _ in range(2):
+            self.assertEqual(self.client.get("/api/events/events/1").status_code, 404)
+            self.assertNotIn("etag", self.client.get("/api/events/scraping/logs").headers)
+
+        self.assertEqual(self.calls, 4)
+
+    def test_version_errors_bypass_cache(self):
+        """If the data version cannot be read, responses are computed directly"""
+        def broken():
+            raise RuntimeError("database is down")
+
+        client = self.make_client(broken)
+
+        for _ in range(2):
+            self.assertEqual(client.get("/api/events/analytics/categories").status_code, 200)
+        self.assertEqual(self.calls, 2)
+
+class TestResponseCacheBackends(unittest.TestCase):
+    """Test cases for response cache storage"""
+
+    def entry(self, version=1):
+        return CachedResponse(version, f'"{version}-abc"', "application/json", b"{}")
+
+    def test_memory_lru_eviction(self):
+        """The least recently read entry is evicted first"""
+        cache = MemoryResponseCache(max_entries=2)
+        cache.set("a", self.entry())
+        cache.set("b", self.entry())
+        cache.get("a")
+        cache.set("c", self.entry())
+
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+
+    def test_sqlite_shared_between_instances(self):
+        """Processes sharing a file see each other's entries"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "responses.sqlite3")
+            writer, reader = SqliteResponseCache(path, max_entries=2), SqliteResponseCache(path, max_entries=2)
+            writer.set("a", self.entry(version=7))
+
+            self.assertEqual(reader.get("a"), self.entry(version=7))
+            for key in ("b", "c"):
+                writer.set(key, self.entry())
+            self.assertIsNone(reader.get("a"))
+
+            writer.close()
+            reader.close()
+
+    def test_etag_matches(self):
+        """If-None-Match lists, weak validators and * are honored"""
+        self.assertTrue(etag_matches('"1-x", "2-y"', '"2-y"'))
+        self.assertTrue(etag_matches('W/"2-y"', '"2-y"'))
+        self.assertTrue(etag_matches("*", '"2-y"'))
+        self.assertFalse(etag_matches('"1-x"', '"2-y"'))
+        self.assertFalse(etag_matches(None, '"2-y"'))
+
+if __name__ == "__main__":
+    unittest.main()
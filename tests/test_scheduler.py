@@ -0,0 +1,118 @@
+import unittest
+import sys
+import os
+from datetime import datetime, timedelta
+from unittest.mock import DEFAULT, patch, MagicMock
+
+# Add parent directory to path to import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.models import ScrapingLog
+from app.services.scheduler import ScrapingScheduler, adaptive_interval
+
+def make_logs(changes_per_run, hours_between, status="success"):
+    """ScrapingLog history from newest to oldest"""
+    now = datetime(2026, 10, 17, 12, 0)
+    return [
+        ScrapingLog(
+            status=status,
+            events_added=changes,
+            events_updated=0,
+            created_at=now - timedelta(hours=hours_between * i),
+        )
+        for i, changes in enumerate(changes_per_run)
+    ]
+
+class TestAdaptiveInterval(unittest.TestCase):
+    """Test cases for the change-rate based polling interval"""
+
+    def interval(self, logs):
+        return adaptive_interval(logs, base_minutes=60, min_minutes=15, max_minutes=1440, target_changes=5)
+
+    def test_not_enough_history(self):
+        """Without history the base interval is used"""
+        self.assertEqual(self.interval([]), 60)
+        self.assertEqual(self.interval(make_logs([10], 1)), 60)
+
+    def test_busy_source_polled_more_often(self):
+        """20 changes per hour -> 5 changes every 15 minutes"""
+        self.assertEqual(self.interval(make_logs([20, 20, 20], 1)), 15)
+
+    def test_quiet_source_polled_less_often(self):
+        """1 change per hour -> 5 hours between runs"""
+        self.assertEqual(self.interval(make_logs([1, 1, 1], 1)), 300)
+
+    def test_unchanged_source_uses_max_interval(self):
+        """A source without changes is polled at the maximum interval"""
+        self.assertEqual(self.interval(make_logs([0, 0, 0], 1)), 1440)
+
+    def test_failed_runs_are_ignored(self):
+        """Only successful runs count toward the change rate"""
+        self.assertEqual(self.interval(make_logs([50, 50, 50], 1, status="error")), 60)
+
+class TestScrapingScheduler(unittest.TestCase):
+    """Test cases for the scraping scheduler"""
+
+    def setUp(self):
+        self.apscheduler = MagicMock()
+        self.scheduler = ScrapingScheduler(self.apscheduler)
+
+    def test_schedule_replaces_source_job(self):
+        """Each source has a single job that never overlaps with itself"""
+        self.scheduler.schedule("meetup", 30)
+
+        kwargs = self.apscheduler.add_job.call_args.kwargs
+        self.assertEqual(kwargs["id"], "scraping:meetup")
+        self.assertTrue(kwargs["replace_existing"])
+        self.assertEqual(kwargs["max_instances"], 1)
+
+    @patch('app.services.scheduler.get_scraper_class')
+    @patch('app.services.scheduler.SessionLocal')
+    def test_overlapping_run_is_skipped(self, mock_session_local, mock_get_scraper_class):
+        """A run that starts while the previous one is in progress is skipped"""
+        db = mock_session_local.return_value
+        db.get_bind.return_value.dialect.name = "sqlite"
+        db.query.return_value.filter.return_value.first.return_value = None
+
+        with self.scheduler._source_lock(db, "meetup") as acquired:
+            self.assertTrue(acquired)
+            self.scheduler.run_source("meetup")
+
+        mock_get_scraper_class.assert_not_called()
+        # следующий запуск все равно назначен
+        self.assertEqual(self.apscheduler.add_job.call_args.kwargs["args"], ["meetup"])
+
+    @patch('app.services.scheduler.get_scraper_class')
+    @patch('app.services.scheduler.SessionLocal')
+    def test_run_source_runs_scraper_and_reschedules(self, mock_session_local, mock_get_scraper_class):
+        """A scheduled run executes the scraper and books the next run"""
+        db = mock_session_local.return_value
+        db.get_bind.return_value.dialect.name = "sqlite"
+        db.query.return_value.filter.return_value.first.return_value = None
+
+        self.scheduler.run_source("meetup")
+
+        mock_get_scraper_class.return_value.return_value.run.assert_called_once()
+        self.apscheduler.add_job.assert_called_once()
+
+    @patch('app.services.scheduler.get_scraper_class')
+    @patch('app.services.scheduler.SessionLocal')
+    def test_no_open_transaction_during_run(self, mock_session_local, mock_get_scraper_class):
+        """The advisory lock session commits before the scraper runs, so it is not idle in transaction"""
+        calls = []
+        db = mock_session_local.return_value
+        db.get_bind.return_value.dialect.name = "postgresql"
+        db.execute.return_value.scalar.return_value = True
+        db.query.return_value.filter.return_value.first.return_value = None
+        db.execute.side_effect = lambda *args, **kwargs: calls.append("execute") or DEFAULT
+        db.query.side_effect = lambda *args: calls.append("query") or DEFAULT
+        db.commit.side_effect = lambda: calls.append("commit")
+        mock_get_scraper_class.return_value.return_value.run.side_effect = lambda: calls.append("run")
+
+        self.scheduler.run_source("meetup")
+
+        self.assertEqual(calls[:5], ["execute", "commit", "query", "commit", "run"])
+
+
+if __name__ == '__main__':
+    unittest.main()
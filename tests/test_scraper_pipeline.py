@@ -0,0 +1,356 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock
+
+import requests
+from sqlalchemy.sql.dml import Update
+
+# Add parent directory to path to import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.scraping.base import BaseScraper, card_fingerprint
+from app.services.scraping.http_cache import HttpCache
+from app.services.scraping.http_client import HttpClient
+from app.services.scraping import registry
+from app.services.scraping.registry import available_scrapers, get_scraper_class, register_scraper
+from app.services.scraping.meetup import MeetupScraper
+
+LISTING_HTML = """
+<html><body>
+    <div class="card"><a href="/e/1">One</a></div>
+    <div class="card"><a href="/e/2">Two</a></div>
+    <div class="card"><a href="/e/1">One again</a></div>
+    <div class="card">no link</div>
+</body></html>
+"""
+
+DETAIL_HTML = """
+<html><body><h1>{title}</h1><p class="where">{where}</p></body></html>
+"""
+
+class FakeScraper(BaseScraper):
+    source_type = "fake"
+    source_name = "Fake"
+    source_url = "https://fake.example.com"
+    base_url = "https://fake.example.com"
+
+    def listing_requests(self):
+        yield f"{self.base_url}/events", None
+
+    def extract_cards(self, soup):
+        return soup.select('.card')
+
+    def extract_card_url(self, card):
+        link = card.select_one('a')
+        return link['href'] if link else None
+
+    def extract_event(self, soup, event_url):
+        from datetime import datetime
+        return {
+            "name": f"  {soup.select_one('h1').text}  ",
+            "description": "",
+            "start_datetime_utc": datetime(2025, 5, 10, 18, 0),
+            "location_text": soup.select_one('.where').text,
+            "original_url": event_url,
+            "organizer": "Fake",
+        }
+
+def make_response(text):
+    response = MagicMock()
+    response.text = text
+    response.content = text.encode("utf-8")
+    response.unchanged = False
+    return response
+
+class TestScraperPipeline(unittest.TestCase):
+    """Test cases for the BaseScraper fetch -> parse -> normalize -> persist pipeline"""
+
+    def setUp(self):
+        self.scraper = FakeScraper()
+        self.scraper.db = MagicMock()
+        self.scraper.http = MagicMock()
+
+        def get(url, **kwargs):
+            if url.endswith("/events"):
+                return make_response(LISTING_HTML)
+            where = "Online" if url.endswith("/2") else "Palo Alto"
+            return make_response(DETAIL_HTML.format(title=url.rsplit("/", 1)[-1], where=where))
+
+        self.scraper.http.get.side_effect = get
+
+    def test_iter_event_urls_dedupes_and_resolves(self):
+        """Card URLs are made absolute and duplicates are dropped"""
+        urls = list(self.scraper.iter_event_urls())
+
+        self.assertEqual(urls, ["https://fake.example.com/e/1", "https://fake.example.com/e/2"])
+
+    def test_iter_events_normalizes(self):
+        """Events are normalized on the way through the pipeline"""
+        events = {event["original_url"]: event for event in self.scraper.iter_events()}
+
+        online = events["https://fake.example.com/e/2"]
+        self.assertTrue(online["is_virtual"])
+        self.assertEqual(online["virtual_url"], online["original_url"])
+        self.assertEqual(online["name"], "2")
+        self.assertIsNotNone(online["end_datetime_utc"])
+        self.assertFalse(events["https://fake.example.com/e/1"]["is_virtual"])
+
+    def test_incremental_mode_skips_known_cards(self):
+        """Known cards with the same fingerprint and a fresh copy are not fetched"""
+        now = datetime.now(timezone.utc)
+        self.scraper.db.query.return_value.filter.return_value = [
+            ("https://fake.example.com/e/1", card_fingerprint({"text": "One"}), now - timedelta(hours=1)),
+            ("https://fake.example.com/e/2", card_fingerprint({"text": "Changed"}), now - timedelta(hours=1)),
+        ]
+
+        urls = list(self.scraper.iter_event_urls())
+
+        self.assertEqual(urls, ["https://fake.example.com/e/2"])
+        self.assertEqual(self.scraper._skipped_urls, {"https://fake.example.com/e/1"})
+
+    def test_incremental_mode_refetches_stale_events(self):
+        """Events older than the staleness threshold are fetched again"""
+        stale = datetime.now(timezone.utc) - timedelta(days=30)
+        self.scraper.db.query.return_value.filter.return_value = [
+            ("https://fake.example.com/e/1", card_fingerprint({"text": "One"}), stale),
+        ]
+
+        urls = list(self.scraper.iter_event_urls())
+
+        self.assertIn("https://fake.example.com/e/1", urls)
+
+    def test_fingerprint_is_attached_to_events(self):
+        """The card fingerprint is saved with the event"""
+        events = {event["original_url"]: event for event in self.scraper.iter_events()}
+
+        self.assertEqual(
+            events["https://fake.example.com/e/1"]["listing_fingerprint"],
+            card_fingerprint({"text": "One"}),
+        )
+
+    @patch('app.services.scraping.base.EventBatchWriter')
+    def test_run_persists_in_batches(self, mock_writer_class):
+        """run() streams events into the batch writer and fills the log counters"""
+        writer = mock_writer_class.return_value
+        writer.added = 1
+        writer.updated = 1
+
+        scraping_log = self.scraper.run()
+
+        self.assertEqual(writer.add.call_count, 2)
+        writer.flush.assert_called_once()
+        self.assertEqual(scraping_log.status, "success")
+        self.assertEqual(scraping_log.events_found, 2)
+        self.assertEqual(scraping_log.events_added, 1)
+        self.assertEqual(scraping_log.events_updated, 1)
+
+class TestCachedEventPages(unittest.TestCase):
+    """Runs over a real HTTP cache with a fake events table"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.client = HttpClient(cache=HttpCache(self.directory, max_bytes=10 * 1024 * 1024))
+        self.scraper = FakeScraper()
+        self.scraper.http = self.client
+        self.scraper.db = MagicMock()
+        self.db_fails = False
+        # original_url -> (listing_fingerprint, last_scraped_at)
+        self.stored = {}
+
+        def execute(stmt, *args):
+            if self.db_fails:
+                raise RuntimeError("database is down")
+            if isinstance(stmt, Update):
+                for params in args[0]:
+                    fingerprint = params["touched_fingerprint"] or self.stored[params["touched_url"]][0]
+                    self.stored[params["touched_url"]] = (fingerprint, datetime.now(timezone.utc))
+                return MagicMock()
+            # The batch upsert returns a row for each of the two events
+            return [SimpleNamespace(inserted=True, changed=True)] * 2
+
+        self.scraper.db.execute.side_effect = execute
+
+        def known_events(*args):
+            result = MagicMock()
+            result.__iter__.return_value = iter([
+                (original_url, fingerprint, last_scraped_at)
+                for original_url, (fingerprint, last_scraped_at) in self.stored.items()
+            ])
+            return result
+
+        self.scraper.db.query.return_value.filter.side_effect = known_events
+
+        def get(url, **kwargs):
+            response = requests.Response()
+            response.status_code = 200
+            response.encoding = "utf-8"
+            if url.endswith("/events"):
+                response._content = LISTING_HTML.encode()
+            else:
+                response._content = DETAIL_HTML.format(title="Event", where="Palo Alto").encode()
+            return response
+
+        patcher = patch.object(self.client.session_for(FakeScraper.base_url), "get", side_effect=get)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.client.close()
+        self.client.cache.close()
+        shutil.rmtree(self.directory)
+
+    @patch('app.services.scraping.base.create_geocoding_stage', return_value=None)
+    def test_failed_flush_is_retried_on_next_run(self, mock_geocoding):
+        """Pages of events that were not saved are parsed and saved again on the next run"""
+        self.db_fails = True
+        scraping_log = self.scraper.run()
+        self.assertEqual(scraping_log.events_added, 0)
+
+        self.db_fails = False
+        scraping_log = self.scraper.run()
+        self.assertEqual(scraping_log.events_added, 2)
+        self.assertEqual(self.scraper._unchanged_urls, set())
+
+        # Pages of saved events are cached now
+        scraping_log = self.scraper.run()
+        self.assertEqual(scraping_log.events_added, 0)
+        self.assertEqual(len(self.scraper._unchanged_urls), 2)
+
+    @patch('app.services.scraping.base.create_geocoding_stage', return_value=None)
+    def test_unchanged_stale_events_are_touched(self, mock_geocoding):
+        """A stale event with an unchanged page gets a new scrape time and is skipped on the next run"""
+        self.scraper.run()
+        fingerprints = dict(self.scraper.iter_cards())
+        stale = datetime.now(timezone.utc) - timedelta(hours=48)
+        self.stored = {event_url: (fingerprint, stale) for event_url, fingerprint in fingerprints.items()}
+
+        self.scraper.run()
+        self.assertEqual(self.scraper._unchanged_urls, set(fingerprints))
+        for event_url, (fingerprint, last_scraped_at) in self.stored.items():
+            self.assertEqual(fingerprint, fingerprints[event_url])
+            self.assertGreater(last_scraped_at, stale)
+
+        scraping_log = self.scraper.run()
+        self.assertEqual(self.scraper._skipped_urls, set(fingerprints))
+        self.assertEqual(self.scraper._unchanged_urls, set())
+        self.assertEqual(scraping_log.events_found, 2)
+
+    def test_page_without_event_is_cached(self):
+        """A parsed page without an event is reported as empty, not failed, and is cached at once"""
+        event_url = f"{FakeScraper.base_url}/e/1"
+        with patch.object(self.scraper, "extract_event", return_value={"name": "No date", "original_url": event_url}):
+            self.assertIsNone(self.scraper.fetch_event(event_url))
+        self.assertEqual(self.scraper._empty_urls, {event_url})
+        self.assertEqual(self.scraper._pending_cache, {})
+
+        self.scraper.fetch_event(event_url)
+        self.assertEqual(self.scraper._unchanged_urls, {event_url})
+
+class PagedScraper(FakeScraper):
+    """Listing pages /events?page=N with cards e/N1, e/N2; page 4 repeats page 3"""
+
+    def listing_requests(self, days_ahead=30):
+        for page in self.listing_pages():
+            yield f"{self.base_url}/events", {"page": page}
+
+    def extract_card_date(self, card):
+        return datetime.fromisoformat(card['data-start'])
+
+def paged_listing(page):
+    page = min(page, 3)
+    start = datetime.now(timezone.utc) + timedelta(days=10 * page)
+    return "".join(
+        f'<div class="card" data-start="{start.isoformat()}"><a href="/e/{page}{i}">{page}{i}</a></div>'
+        for i in (1, 2)
+    )
+
+class TestListingPagination(unittest.TestCase):
+    """Test cases for lazy, early-terminating listing pagination"""
+
+    def setUp(self):
+        self.scraper = PagedScraper()
+        self.scraper.db = MagicMock()
+        self.scraper.db.query.return_value.filter.return_value = []
+        self.scraper.http = MagicMock()
+        self.pages = []
+
+        def get(url, params=None, **kwargs):
+            self.pages.append(params["page"])
+            return make_response(paged_listing(params["page"]))
+
+        self.scraper.http.get.side_effect = get
+
+    def test_pages_are_fetched_lazily(self):
+        """The next page is requested only after the cards of the previous one are consumed"""
+        cards = self.scraper.iter_cards(days_ahead=100)
+
+        self.assertEqual(next(cards)[0], "https://fake.example.com/e/11")
+        self.assertEqual(self.pages, [1])
+
+    def test_stops_on_page_without_new_cards(self):
+        """A page that only repeats known cards ends the listing"""
+        urls = [url for url, _ in self.scraper.iter_cards(days_ahead=100)]
+
+        self.assertEqual(len(urls), 6)
+        self.assertEqual(self.pages, [1, 2, 3, 4])
+
+    def test_stops_past_days_ahead(self):
+        """Cards starting after days_ahead are dropped and end the listing"""
+        urls = [url for url, _ in self.scraper.iter_cards(days_ahead=15)]
+
+        self.assertEqual(urls, ["https://fake.example.com/e/11", "https://fake.example.com/e/12"])
+        self.assertEqual(self.pages, [1, 2])
+
+    @patch('app.services.scraping.base.settings')
+    def test_stops_after_run_of_known_events(self, mock_settings):
+        """A run of known, unchanged events stops the crawl before the next pages"""
+        mock_settings.SCRAPING_INCREMENTAL = True
+        mock_settings.SCRAPING_STALE_AFTER_HOURS = 24
+        mock_settings.SCRAPING_MAX_LISTING_PAGES = 20
+        mock_settings.SCRAPING_KNOWN_RUN_LIMIT = 2
+        now = datetime.now(timezone.utc)
+        self.scraper.db.query.return_value.filter.return_value = [
+            (f"https://fake.example.com/e/{n}", card_fingerprint({"text": n}), now)
+            for n in ("11", "12", "21", "22", "31", "32")
+        ]
+
+        urls = list(self.scraper.iter_event_urls(days_ahead=100))
+
+        self.assertEqual(urls, [])
+        self.assertEqual(len(self.scraper._skipped_urls), 2)
+        self.assertEqual(self.pages, [1])
+
+class TestScraperRegistry(unittest.TestCase):
+    """Test cases for the scraper plugin registry"""
+
+    def test_builtin_scrapers_registered(self):
+        """Built-in sources are available by type"""
+        scrapers = available_scrapers()
+
+        self.assertIs(scrapers["meetup"], MeetupScraper)
+        self.assertIn("eventbrite", scrapers)
+        self.assertIn("techcrunch", scrapers)
+
+    def test_register_custom_scraper(self):
+        """Custom sources can be registered"""
+        # Load the built-in sources first, otherwise restoring the dict would drop them too
+        available_scrapers()
+        with patch.dict(registry._registry):
+            register_scraper(FakeScraper)
+
+            self.assertIs(get_scraper_class("fake"), FakeScraper)
+        self.assertNotIn("fake", available_scrapers())
+
+    def test_unknown_source_type(self):
+        """Unknown source types raise ValueError"""
+        with self.assertRaises(ValueError):
+            get_scraper_class("does-not-exist")
+
+
+if __name__ == '__main__':
+    unittest.main()
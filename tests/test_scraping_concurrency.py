@@ -0,0 +1,65 @@
+import unittest
+import sys
+import os
+import threading
+import time
+
+# Add parent directory to path to import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.scraping.concurrency import fetch_concurrently
+
+class TestFetchConcurrently(unittest.TestCase):
+    """Test cases for concurrent detail-page fetching"""
+
+    def test_returns_result_for_every_url(self):
+        """Every URL is fetched exactly once"""
+        urls = [f"https://example.com/e/{i}" for i in range(10)]
+        results = dict(fetch_concurrently(urls, lambda url: {"original_url": url}, max_workers=4))
+
+        self.assertEqual(set(results), set(urls))
+        for url, data in results.items():
+            self.assertEqual(data["original_url"], url)
+
+    def test_error_is_isolated_per_url(self):
+        """A failing page yields None without affecting the others"""
+        def fetch(url):
+            if url.endswith("/2"):
+                raise ValueError("broken page")
+            return url
+
+        urls = [f"https://example.com/e/{i}" for i in range(4)]
+        results = dict(fetch_concurrently(urls, fetch, max_workers=2))
+
+        self.assertIsNone(results["https://example.com/e/2"])
+        self.assertEqual(results["https://example.com/e/3"], "https://example.com/e/3")
+
+    def test_per_host_limit(self):
+        """No more than per_host_limit requests run against one host at a time"""
+        active = {"current": 0, "peak": 0}
+        lock = threading.Lock()
+
+        def fetch(url):
+            with lock:
+                active["current"] += 1
+                active["peak"] = max(active["peak"], active["current"])
+            time.sleep(0.02)
+            with lock:
+                active["current"] -= 1
+            return url
+
+        urls = [f"https://example.com/e/{i}" for i in range(12)]
+        list(fetch_concurrently(urls, fetch, max_workers=8, per_host_limit=2))
+
+        self.assertLessEqual(active["peak"], 2)
+
+    def test_serial_mode(self):
+        """max_workers=1 preserves the listing order"""
+        urls = [f"https://example.com/e/{i}" for i in range(5)]
+        order = [url for url, _ in fetch_concurrently(urls, lambda url: url, max_workers=1)]
+
+        self.assertEqual(order, urls)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import sys
+import os
+
+from sqlalchemy.dialects import postgresql
+
+# Add parent directory to path to import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.search import prefix_tsquery, search_condition, search_rank
+from app.models.models import Event
+
+def compile_sql(expr):
+    compiled = expr.compile(dialect=postgresql.dialect())
+    return str(compiled), list(compiled.params.values())
+
+class TestEventSearch(unittest.TestCase):
+    """Test cases for the Postgres full-text event search"""
+
+    def test_prefix_tsquery(self):
+        """Every word is matched by prefix and all words are required"""
+        self.assertEqual(prefix_tsquery("Kube builders"), "kube:* & builders:*")
+
+    def test_prefix_tsquery_ignores_operators(self):
+        """tsquery syntax typed by the user cannot break the query"""
+        self.assertEqual(prefix_tsquery("ai & (ml | !web3):*"), "ai:* & ml:* & web3:*")
+        self.assertIsNone(prefix_tsquery(" &|! "))
+
+    def test_condition_uses_indexed_operators(self):
+        """The filter combines the GIN tsvector match with trigram similarity on the name"""
+        sql, params = compile_sql(search_condition(Event.search_vector, Event.name, "kube"))
+
+        self.assertIn("events.search_vector @@ to_tsquery(", sql)
+        self.assertIn("events.name %% ", sql)
+        self.assertEqual(params, ["kube", "english", "kube:*"])
+
+    def test_condition_without_words(self):
+        """Punctuation-only search falls back to trigram matching"""
+        sql, params = compile_sql(search_condition(Event.search_vector, Event.name, "++"))
+
+        self.assertNotIn("to_tsquery", sql)
+        self.assertIn("events.name %% ", sql)
+        self.assertEqual(params, ["++"])
+
+    def test_rank(self):
+        """Relevance adds the text rank and the name similarity"""
+        sql, params = compile_sql(search_rank(Event.search_vector, Event.name, "kube"))
+
+        self.assertIn("ts_rank_cd(events.search_vector, to_tsquery(", sql)
+        self.assertIn("similarity(events.name, ", sql)
+        self.assertEqual(params, ["english", "kube:*", "kube"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+import sys
+import os
+from datetime import datetime, timezone
+
+# Add parent directory to path to import app modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.scraping.structured_data import extract_structured_event, is_complete
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "pages")
+
+def read_fixture(filename):
+    with open(os.path.join(FIXTURES_DIR, filename), "rb") as f:
+        return f.read()
+
+class TestStructuredData(unittest.TestCase):
+    """Test cases for JSON-LD / __NEXT_DATA__ / microdata extraction"""
+
+    def test_json_ld(self):
+        """Eventbrite pages embed a complete JSON-LD event"""
+        url = "https://www.eventbrite.com/e/bay-area-founders-demo-day-tickets-800001"
+        event = extract_structured_event(read_fixture("eventbrite_detail.html"), url)
+
+        self.assertTrue(is_complete(event))
+        self.assertEqual(event["name"], "Bay Area Founders Demo Day")
+        self.assertEqual(event["start_datetime_utc"], datetime(2025, 5, 15, 17, 0, tzinfo=timezone.utc))
+        self.assertEqual(event["organizer"], "Bay Area Founders Club")
+        self.assertEqual(event["location_text"], "Plug and Play Tech Center, 440 N Wolfe Rd, Sunnyvale, CA")
+        self.assertFalse(event["is_virtual"])
+        self.assertEqual(event["original_url"], url)
+
+    def test_next_data(self):
+        """Meetup pages embed the event in __NEXT_DATA__"""
+        event = extract_structured_event(read_fixture("meetup_detail.html"), "https://www.meetup.com/e/1")
+
+        self.assertTrue(is_complete(event))
+        self.assertEqual(event["name"], "Silicon Valley AI Builders: LLM Agents in Production")
+        self.assertEqual(event["end_datetime_utc"], datetime(2025, 5, 7, 3, 30, tzinfo=timezone.utc))
+        self.assertEqual(event["organizer"], "Silicon Valley AI Builders")
+        self.assertTrue(event["location_text"].startswith("Computer History Museum"))
+
+    def test_microdata(self):
+        """schema.org microdata is read from itemprop attributes"""
+        markup = """
+        <div itemscope itemtype="https://schema.org/Event">
+            <h1 itemprop="name">Rust &amp; Systems Night</h1>
+            <meta itemprop="startDate" content="2025-06-03T18:30:00-07:00">
+            <span itemprop="location">Online</span>
+        </div>
+        """
+        event = extract_structured_event(markup, "https://example.com/e/1")
+
+        self.assertTrue(is_complete(event))
+        self.assertEqual(event["name"], "Rust & Systems Night")
+        self.assertEqual(event["start_datetime_utc"], datetime(2025, 6, 4, 1, 30, tzinfo=timezone.utc))
+
+    def test_virtual_location(self):
+        """VirtualLocation marks the event as online"""
+        markup = """<script type="application/ld+json">
+        {"@type": "Event", "name": "Webinar", "startDate": "2025-06-03T10:00:00Z",
+         "location": {"@type": "VirtualLocation", "url": "https://zoom.us/j/1"}}
+        </script>"""
+        event = extract_structured_event(markup, "https://example.com/e/2")
+
+        self.assertTrue(event["is_virtual"])
+        self.assertEqual(event["location_text"], "Online")
+
+    def test_incomplete_and_missing(self):
+        """Incomplete data is returned but not complete; pages without data give None"""
+        partial = extract_structured_event(
+            '<script type="application/ld+json">{"@type": "Event", "name": "No date"}</script>',
+            "https://example.com/e/3",
+        )
+
+        self.assertEqual(partial["name"], "No date")
+        self.assertFalse(is_complete(partial))
+        self.assertIsNone(extract_structured_event(read_fixture("techcrunch_detail.html"), "https://techcrunch.com/e/1"))
+
+    def test_broken_json_is_skipped(self):
+        """Malformed JSON-LD blocks are ignored"""
+        markup = """
+        <script type="application/ld+json">{not json</script>
+        <script type="application/ld+json">{"@type": "Event", "name": "Ok", "startDate": "2025-06-03"}</script>
+        """
+        event = extract_structured_event(markup, "https://example.com/e/4")
+
+        self.assertEqual(event["name"], "Ok")
+
+
+if __name__ == '__main__':
+    unittest.main()